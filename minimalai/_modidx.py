@@ -10,6 +10,9 @@ d = { 'settings': { 'branch': 'develop',
                                  'minimalai.accel.AccelerateCB.backward': ('ddpm_v2.html#acceleratecb.backward', 'minimalai/accel.py'),
                                  'minimalai.accel.AccelerateCB.before_fit': ('ddpm_v2.html#acceleratecb.before_fit', 'minimalai/accel.py'),
                                  'minimalai.accel.MixedPrecision': ('ddpm_v2.html#mixedprecision', 'minimalai/accel.py'),
+                                 'minimalai.accel.MixedPrecision.__init__': ('ddpm_v2.html#mixedprecision.__init__', 'minimalai/accel.py'),
+                                 'minimalai.accel.MixedPrecision._keep_fp32': ( 'ddpm_v2.html#mixedprecision._keep_fp32',
+                                                                                'minimalai/accel.py'),
                                  'minimalai.accel.MixedPrecision.after_loss': ( 'ddpm_v2.html#mixedprecision.after_loss',
                                                                                 'minimalai/accel.py'),
                                  'minimalai.accel.MixedPrecision.backward': ('ddpm_v2.html#mixedprecision.backward', 'minimalai/accel.py'),
@@ -17,7 +20,12 @@ d = { 'settings': { 'branch': 'develop',
                                                                                   'minimalai/accel.py'),
                                  'minimalai.accel.MixedPrecision.before_fit': ( 'ddpm_v2.html#mixedprecision.before_fit',
                                                                                 'minimalai/accel.py'),
-                                 'minimalai.accel.MixedPrecision.step': ('ddpm_v2.html#mixedprecision.step', 'minimalai/accel.py')},
+                                 'minimalai.accel.MixedPrecision.cleanup_batch': ( 'ddpm_v2.html#mixedprecision.cleanup_batch',
+                                                                                   'minimalai/accel.py'),
+                                 'minimalai.accel.MixedPrecision.cleanup_fit': ( 'ddpm_v2.html#mixedprecision.cleanup_fit',
+                                                                                 'minimalai/accel.py'),
+                                 'minimalai.accel.MixedPrecision.step': ('ddpm_v2.html#mixedprecision.step', 'minimalai/accel.py'),
+                                 'minimalai.accel._grad_scaler': ('ddpm_v2.html#_grad_scaler', 'minimalai/accel.py')},
             'minimalai.activations': { 'minimalai.activations.ActivationStatisticsCallback': ( 'minimalai-activations.html#activationstatisticscallback',
                                                                                                'minimalai/activations.py'),
                                        'minimalai.activations.ActivationStatisticsCallback.__init__': ( 'minimalai-activations.html#activationstatisticscallback.__init__',
@@ -87,24 +95,80 @@ d = { 'settings': { 'branch': 'develop',
                                                                                  'minimalai/augment.py'),
                                    'minimalai.augment.RandomErasing.forward': ( 'minimalai-augment.html#randomerasing.forward',
                                                                                 'minimalai/augment.py'),
+                                   'minimalai.augment.TTACallback': ('minimalai-augment.html#ttacallback', 'minimalai/augment.py'),
+                                   'minimalai.augment.TTACallback.__init__': ( 'minimalai-augment.html#ttacallback.__init__',
+                                                                               'minimalai/augment.py'),
+                                   'minimalai.augment.TTACallback.after_predict': ( 'minimalai-augment.html#ttacallback.after_predict',
+                                                                                    'minimalai/augment.py'),
+                                   'minimalai.augment.TTACallback.before_batch': ( 'minimalai-augment.html#ttacallback.before_batch',
+                                                                                   'minimalai/augment.py'),
                                    'minimalai.augment._flops': ('minimalai-augment.html#_flops', 'minimalai/augment.py'),
                                    'minimalai.augment.capture_preds': ('minimalai-augment.html#capture_preds', 'minimalai/augment.py'),
+                                   'minimalai.augment.deterministic_augment': ( 'minimalai-augment.html#deterministic_augment',
+                                                                                'minimalai/augment.py'),
+                                   'minimalai.augment.flip_horizontal': ('minimalai-augment.html#flip_horizontal', 'minimalai/augment.py'),
                                    'minimalai.augment.random_copy': ('minimalai-augment.html#random_copy', 'minimalai/augment.py'),
                                    'minimalai.augment.random_copy1': ('minimalai-augment.html#random_copy1', 'minimalai/augment.py'),
                                    'minimalai.augment.random_erase': ('minimalai-augment.html#random_erase', 'minimalai/augment.py'),
                                    'minimalai.augment.random_erasing': ('minimalai-augment.html#random_erasing', 'minimalai/augment.py'),
                                    'minimalai.augment.show_image_batch': ( 'minimalai-augment.html#show_image_batch',
                                                                            'minimalai/augment.py'),
-                                   'minimalai.augment.summary': ('minimalai-augment.html#summary', 'minimalai/augment.py')},
+                                   'minimalai.augment.summary': ('minimalai-augment.html#summary', 'minimalai/augment.py'),
+                                   'minimalai.augment.tta_views': ('minimalai-augment.html#tta_views', 'minimalai/augment.py')},
+            'minimalai.cache': { 'minimalai.cache.ShardedDataset': ('minimalai-dataset-cache.html#shardeddataset', 'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.__getitem__': ( 'minimalai-dataset-cache.html#shardeddataset.__getitem__',
+                                                                                 'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.__getitems__': ( 'minimalai-dataset-cache.html#shardeddataset.__getitems__',
+                                                                                  'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.__getstate__': ( 'minimalai-dataset-cache.html#shardeddataset.__getstate__',
+                                                                                  'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.__init__': ( 'minimalai-dataset-cache.html#shardeddataset.__init__',
+                                                                              'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.__len__': ( 'minimalai-dataset-cache.html#shardeddataset.__len__',
+                                                                             'minimalai/cache.py'),
+                                 'minimalai.cache.ShardedDataset.shards': ( 'minimalai-dataset-cache.html#shardeddataset.shards',
+                                                                            'minimalai/cache.py'),
+                                 'minimalai.cache._callable_key': ('minimalai-dataset-cache.html#_callable_key', 'minimalai/cache.py'),
+                                 'minimalai.cache._dataset_transform': ( 'minimalai-dataset-cache.html#_dataset_transform',
+                                                                         'minimalai/cache.py'),
+                                 'minimalai.cache._write_split': ('minimalai-dataset-cache.html#_write_split', 'minimalai/cache.py'),
+                                 'minimalai.cache.cache_dataset_dict': ( 'minimalai-dataset-cache.html#cache_dataset_dict',
+                                                                         'minimalai/cache.py'),
+                                 'minimalai.cache.dataset_cache_key': ( 'minimalai-dataset-cache.html#dataset_cache_key',
+                                                                        'minimalai/cache.py'),
+                                 'minimalai.cache.write_shard_cache': ( 'minimalai-dataset-cache.html#write_shard_cache',
+                                                                        'minimalai/cache.py')},
             'minimalai.conv': { 'minimalai.conv.collate_data_on_device': ( 'minimalai-convolutions.html#collate_data_on_device',
                                                                            'minimalai/conv.py'),
                                 'minimalai.conv.conv_layer': ('minimalai-convolutions.html#conv_layer', 'minimalai/conv.py'),
                                 'minimalai.conv.move_data_to_device': ( 'minimalai-convolutions.html#move_data_to_device',
                                                                         'minimalai/conv.py')},
-            'minimalai.datasets': { 'minimalai.datasets.DataLoaders': ( 'minimalai-dataset-visualization.html#dataloaders',
+            'minimalai.datasets': { 'minimalai.datasets.BatchIndexSampler': ( 'minimalai-dataset-visualization.html#batchindexsampler',
+                                                                              'minimalai/datasets.py'),
+                                    'minimalai.datasets.BatchIndexSampler.__init__': ( 'minimalai-dataset-visualization.html#batchindexsampler.__init__',
+                                                                                       'minimalai/datasets.py'),
+                                    'minimalai.datasets.BatchIndexSampler.__iter__': ( 'minimalai-dataset-visualization.html#batchindexsampler.__iter__',
+                                                                                       'minimalai/datasets.py'),
+                                    'minimalai.datasets.BatchIndexSampler.__len__': ( 'minimalai-dataset-visualization.html#batchindexsampler.__len__',
+                                                                                      'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset': ( 'minimalai-dataset-visualization.html#collateddataset',
+                                                                            'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset.__getitem__': ( 'minimalai-dataset-visualization.html#collateddataset.__getitem__',
+                                                                                        'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset.__getitems__': ( 'minimalai-dataset-visualization.html#collateddataset.__getitems__',
+                                                                                         'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset.__init__': ( 'minimalai-dataset-visualization.html#collateddataset.__init__',
+                                                                                     'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset.__len__': ( 'minimalai-dataset-visualization.html#collateddataset.__len__',
+                                                                                    'minimalai/datasets.py'),
+                                    'minimalai.datasets.CollatedDataset.from_dataset': ( 'minimalai-dataset-visualization.html#collateddataset.from_dataset',
+                                                                                         'minimalai/datasets.py'),
+                                    'minimalai.datasets.DataLoaders': ( 'minimalai-dataset-visualization.html#dataloaders',
                                                                         'minimalai/datasets.py'),
                                     'minimalai.datasets.DataLoaders.__init__': ( 'minimalai-dataset-visualization.html#dataloaders.__init__',
                                                                                  'minimalai/datasets.py'),
+                                    'minimalai.datasets.DataLoaders.from_collated_dict': ( 'minimalai-dataset-visualization.html#dataloaders.from_collated_dict',
+                                                                                           'minimalai/datasets.py'),
                                     'minimalai.datasets.DataLoaders.from_dataset_dict': ( 'minimalai-dataset-visualization.html#dataloaders.from_dataset_dict',
                                                                                           'minimalai/datasets.py'),
                                     'minimalai.datasets.apply_inplace_transformation': ( 'minimalai-dataset-visualization.html#apply_inplace_transformation',
@@ -119,7 +183,27 @@ d = { 'settings': { 'branch': 'develop',
                                                                         'minimalai/datasets.py'),
                                     'minimalai.datasets.subplots': ( 'minimalai-dataset-visualization.html#subplots',
                                                                      'minimalai/datasets.py')},
-            'minimalai.diffusion': { 'minimalai.diffusion.DownBlock': ('diffusion-attn-cond.html#downblock', 'minimalai/diffusion.py'),
+            'minimalai.diffusion': { 'minimalai.diffusion.ClassifierFreeGuidance': ( 'diffusion-attn-cond.html#classifierfreeguidance',
+                                                                                     'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ClassifierFreeGuidance.__init__': ( 'diffusion-attn-cond.html#classifierfreeguidance.__init__',
+                                                                                              'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ClassifierFreeGuidance.forward': ( 'diffusion-attn-cond.html#classifierfreeguidance.forward',
+                                                                                             'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.CondEmbUNetModel': ( 'diffusion-attn-cond.html#condembunetmodel',
+                                                                               'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.CondEmbUNetModel.__init__': ( 'diffusion-attn-cond.html#condembunetmodel.__init__',
+                                                                                        'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.CondEmbUNetModel.forward': ( 'diffusion-attn-cond.html#condembunetmodel.forward',
+                                                                                       'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ConditioningCache': ( 'diffusion-attn-cond.html#conditioningcache',
+                                                                                'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ConditioningCache.__init__': ( 'diffusion-attn-cond.html#conditioningcache.__init__',
+                                                                                         'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ConditioningCache.forward': ( 'diffusion-attn-cond.html#conditioningcache.forward',
+                                                                                        'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ConditioningCache.refresh': ( 'diffusion-attn-cond.html#conditioningcache.refresh',
+                                                                                        'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.DownBlock': ('diffusion-attn-cond.html#downblock', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.DownBlock.__init__': ( 'diffusion-attn-cond.html#downblock.__init__',
                                                                                  'minimalai/diffusion.py'),
                                      'minimalai.diffusion.DownBlock.forward': ( 'diffusion-attn-cond.html#downblock.forward',
@@ -135,6 +219,8 @@ d = { 'settings': { 'branch': 'develop',
                                                                                     'minimalai/diffusion.py'),
                                      'minimalai.diffusion.EmbUNetModel.forward': ( 'diffusion-attn-cond.html#embunetmodel.forward',
                                                                                    'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.EmbUNetModel.unet': ( 'diffusion-attn-cond.html#embunetmodel.unet',
+                                                                                'minimalai/diffusion.py'),
                                      'minimalai.diffusion.SelfAttention': ( 'diffusion-attn-cond.html#selfattention',
                                                                             'minimalai/diffusion.py'),
                                      'minimalai.diffusion.SelfAttention.__init__': ( 'diffusion-attn-cond.html#selfattention.__init__',
@@ -150,18 +236,36 @@ d = { 'settings': { 'branch': 'develop',
                                                                                'minimalai/diffusion.py'),
                                      'minimalai.diffusion.UpBlock.forward': ( 'diffusion-attn-cond.html#upblock.forward',
                                                                               'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._denoise': ('diffusion-attn-cond.html#_denoise', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._dpm_coefs': ('diffusion-attn-cond.html#_dpm_coefs', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._dpm_denoise': ( 'diffusion-attn-cond.html#_dpm_denoise',
+                                                                           'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._dpm_tables': ('diffusion-attn-cond.html#_dpm_tables', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._model_device': ( 'diffusion-attn-cond.html#_model_device',
+                                                                            'minimalai/diffusion.py'),
+                                     'minimalai.diffusion._sample_loop': ( 'diffusion-attn-cond.html#_sample_loop',
+                                                                           'minimalai/diffusion.py'),
                                      'minimalai.diffusion.abar': ('diffusion-attn-cond.html#abar', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.collate_ddpm': ( 'diffusion-attn-cond.html#collate_ddpm',
                                                                            'minimalai/diffusion.py'),
                                      'minimalai.diffusion.cond_sample': ('diffusion-attn-cond.html#cond_sample', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.cond_sample_classes': ( 'diffusion-attn-cond.html#cond_sample_classes',
+                                                                                  'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.ddim_schedule': ( 'diffusion-attn-cond.html#ddim_schedule',
+                                                                            'minimalai/diffusion.py'),
                                      'minimalai.diffusion.ddim_step': ('diffusion-attn-cond.html#ddim_step', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.dl_ddpm': ('diffusion-attn-cond.html#dl_ddpm', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.dpm_sample': ('diffusion-attn-cond.html#dpm_sample', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.dpm_schedule': ( 'diffusion-attn-cond.html#dpm_schedule',
+                                                                           'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.fid_vs_nfe': ('diffusion-attn-cond.html#fid_vs_nfe', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.inv_abar': ('diffusion-attn-cond.html#inv_abar', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.lin': ('diffusion-attn-cond.html#lin', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.noisify': ('diffusion-attn-cond.html#noisify', 'minimalai/diffusion.py'),
+                                     'minimalai.diffusion.pack_classes': ( 'diffusion-attn-cond.html#pack_classes',
+                                                                           'minimalai/diffusion.py'),
                                      'minimalai.diffusion.pre_conv': ('diffusion-attn-cond.html#pre_conv', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.sample': ('diffusion-attn-cond.html#sample', 'minimalai/diffusion.py'),
-                                     'minimalai.diffusion.saved': ('diffusion-attn-cond.html#saved', 'minimalai/diffusion.py'),
                                      'minimalai.diffusion.timestep_embedding': ( 'diffusion-attn-cond.html#timestep_embedding',
                                                                                  'minimalai/diffusion.py'),
                                      'minimalai.diffusion.upsample': ('diffusion-attn-cond.html#upsample', 'minimalai/diffusion.py')},
@@ -189,20 +293,84 @@ d = { 'settings': { 'branch': 'develop',
                                       'minimalai.diffusion2.UpBlock.forward': ( 'diffusion-attn-nodownsave.html#upblock.forward',
                                                                                 'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.abar': ('diffusion-attn-nodownsave.html#abar', 'minimalai/diffusion2.py'),
-                                      'minimalai.diffusion2.ddim_step': ( 'diffusion-attn-nodownsave.html#ddim_step',
-                                                                          'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.inv_abar': ( 'diffusion-attn-nodownsave.html#inv_abar',
                                                                          'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.lin': ('diffusion-attn-nodownsave.html#lin', 'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.noisify': ('diffusion-attn-nodownsave.html#noisify', 'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.pre_conv': ( 'diffusion-attn-nodownsave.html#pre_conv',
                                                                          'minimalai/diffusion2.py'),
-                                      'minimalai.diffusion2.sample': ('diffusion-attn-nodownsave.html#sample', 'minimalai/diffusion2.py'),
-                                      'minimalai.diffusion2.saved': ('diffusion-attn-nodownsave.html#saved', 'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.timestep_embedding': ( 'diffusion-attn-nodownsave.html#timestep_embedding',
                                                                                    'minimalai/diffusion2.py'),
                                       'minimalai.diffusion2.upsample': ( 'diffusion-attn-nodownsave.html#upsample',
                                                                          'minimalai/diffusion2.py')},
+            'minimalai.distributed': { 'minimalai.distributed.DistributedCallback': ( 'minimalai-distributed.html#distributedcallback',
+                                                                                      'minimalai/distributed.py'),
+                                       'minimalai.distributed.DistributedCallback.__init__': ( 'minimalai-distributed.html#distributedcallback.__init__',
+                                                                                               'minimalai/distributed.py'),
+                                       'minimalai.distributed.DistributedCallback.after_backward': ( 'minimalai-distributed.html#distributedcallback.after_backward',
+                                                                                                     'minimalai/distributed.py'),
+                                       'minimalai.distributed.DistributedCallback.before_batch': ( 'minimalai-distributed.html#distributedcallback.before_batch',
+                                                                                                   'minimalai/distributed.py'),
+                                       'minimalai.distributed.DistributedCallback.before_fit': ( 'minimalai-distributed.html#distributedcallback.before_fit',
+                                                                                                 'minimalai/distributed.py'),
+                                       'minimalai.distributed.DistributedCallback.cleanup_fit': ( 'minimalai-distributed.html#distributedcallback.cleanup_fit',
+                                                                                                  'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets': ( 'minimalai-distributed.html#gradientbuckets',
+                                                                                  'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets.__init__': ( 'minimalai-distributed.html#gradientbuckets.__init__',
+                                                                                           'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets._grad_ready': ( 'minimalai-distributed.html#gradientbuckets._grad_ready',
+                                                                                              'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets._launch': ( 'minimalai-distributed.html#gradientbuckets._launch',
+                                                                                          'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets._reset': ( 'minimalai-distributed.html#gradientbuckets._reset',
+                                                                                         'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets.remove': ( 'minimalai-distributed.html#gradientbuckets.remove',
+                                                                                         'minimalai/distributed.py'),
+                                       'minimalai.distributed.GradientBuckets.synchronize': ( 'minimalai-distributed.html#gradientbuckets.synchronize',
+                                                                                              'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer': ( 'minimalai-distributed.html#shardedoptimizer',
+                                                                                   'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.__init__': ( 'minimalai-distributed.html#shardedoptimizer.__init__',
+                                                                                            'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer._bind_grads': ( 'minimalai-distributed.html#shardedoptimizer._bind_grads',
+                                                                                               'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.lr': ( 'minimalai-distributed.html#shardedoptimizer.lr',
+                                                                                      'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.param_groups': ( 'minimalai-distributed.html#shardedoptimizer.param_groups',
+                                                                                                'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.state_nbytes': ( 'minimalai-distributed.html#shardedoptimizer.state_nbytes',
+                                                                                                'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.step': ( 'minimalai-distributed.html#shardedoptimizer.step',
+                                                                                        'minimalai/distributed.py'),
+                                       'minimalai.distributed.ShardedOptimizer.zero_grad': ( 'minimalai-distributed.html#shardedoptimizer.zero_grad',
+                                                                                             'minimalai/distributed.py'),
+                                       'minimalai.distributed._free_port': ( 'minimalai-distributed.html#_free_port',
+                                                                             'minimalai/distributed.py'),
+                                       'minimalai.distributed._worker': ('minimalai-distributed.html#_worker', 'minimalai/distributed.py'),
+                                       'minimalai.distributed.broadcast_tensors': ( 'minimalai-distributed.html#broadcast_tensors',
+                                                                                    'minimalai/distributed.py'),
+                                       'minimalai.distributed.distributed_dataloaders': ( 'minimalai-distributed.html#distributed_dataloaders',
+                                                                                          'minimalai/distributed.py'),
+                                       'minimalai.distributed.is_main_process': ( 'minimalai-distributed.html#is_main_process',
+                                                                                  'minimalai/distributed.py'),
+                                       'minimalai.distributed.launch': ('minimalai-distributed.html#launch', 'minimalai/distributed.py')},
+            'minimalai.ema': { 'minimalai.ema.EMACallback': ('minimalai-ema.html#emacallback', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.__init__': ('minimalai-ema.html#emacallback.__init__', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback._tensors': ('minimalai-ema.html#emacallback._tensors', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.after_backward': ( 'minimalai-ema.html#emacallback.after_backward',
+                                                                             'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.after_step': ('minimalai-ema.html#emacallback.after_step', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.before_epoch': ( 'minimalai-ema.html#emacallback.before_epoch',
+                                                                           'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.before_fit': ('minimalai-ema.html#emacallback.before_fit', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.cleanup_epoch': ( 'minimalai-ema.html#emacallback.cleanup_epoch',
+                                                                            'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.cleanup_fit': ('minimalai-ema.html#emacallback.cleanup_fit', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.join': ('minimalai-ema.html#emacallback.join', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.swap': ('minimalai-ema.html#emacallback.swap', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.swapped': ('minimalai-ema.html#emacallback.swapped', 'minimalai/ema.py'),
+                               'minimalai.ema.EMACallback.update': ('minimalai-ema.html#emacallback.update', 'minimalai/ema.py')},
             'minimalai.fid': { 'minimalai.fid.ImageEval': ('fid.html#imageeval', 'minimalai/fid.py'),
                                'minimalai.fid.ImageEval.__init__': ('fid.html#imageeval.__init__', 'minimalai/fid.py'),
                                'minimalai.fid.ImageEval.fid': ('fid.html#imageeval.fid', 'minimalai/fid.py'),
@@ -213,7 +381,55 @@ d = { 'settings': { 'branch': 'develop',
                                'minimalai.fid._calc_stats': ('fid.html#_calc_stats', 'minimalai/fid.py'),
                                'minimalai.fid._sqrtm_newton_schulz': ('fid.html#_sqrtm_newton_schulz', 'minimalai/fid.py'),
                                'minimalai.fid._squared_mmd': ('fid.html#_squared_mmd', 'minimalai/fid.py')},
+            'minimalai.images': { 'minimalai.images.ImageFolderDataset': ( 'minimalai-image-folder.html#imagefolderdataset',
+                                                                           'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__getitem__': ( 'minimalai-image-folder.html#imagefolderdataset.__getitem__',
+                                                                                       'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__getitems__': ( 'minimalai-image-folder.html#imagefolderdataset.__getitems__',
+                                                                                        'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__getstate__': ( 'minimalai-image-folder.html#imagefolderdataset.__getstate__',
+                                                                                        'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__init__': ( 'minimalai-image-folder.html#imagefolderdataset.__init__',
+                                                                                    'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__len__': ( 'minimalai-image-folder.html#imagefolderdataset.__len__',
+                                                                                   'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.__setstate__': ( 'minimalai-image-folder.html#imagefolderdataset.__setstate__',
+                                                                                        'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset._decode': ( 'minimalai-image-folder.html#imagefolderdataset._decode',
+                                                                                   'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset._disk_cache_path': ( 'minimalai-image-folder.html#imagefolderdataset._disk_cache_path',
+                                                                                            'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset._item': ( 'minimalai-image-folder.html#imagefolderdataset._item',
+                                                                                 'minimalai/images.py'),
+                                  'minimalai.images.ImageFolderDataset.load_image': ( 'minimalai-image-folder.html#imagefolderdataset.load_image',
+                                                                                      'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache': ('minimalai-image-folder.html#lrutensorcache', 'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache.__contains__': ( 'minimalai-image-folder.html#lrutensorcache.__contains__',
+                                                                                    'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache.__init__': ( 'minimalai-image-folder.html#lrutensorcache.__init__',
+                                                                                'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache.__len__': ( 'minimalai-image-folder.html#lrutensorcache.__len__',
+                                                                               'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache._nbytes': ( 'minimalai-image-folder.html#lrutensorcache._nbytes',
+                                                                               'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache.get': ( 'minimalai-image-folder.html#lrutensorcache.get',
+                                                                           'minimalai/images.py'),
+                                  'minimalai.images.LRUTensorCache.put': ( 'minimalai-image-folder.html#lrutensorcache.put',
+                                                                           'minimalai/images.py')},
             'minimalai.imports': {},
+            'minimalai.inference': { 'minimalai.inference._can_fold': ('minimalai-inference.html#_can_fold', 'minimalai/inference.py'),
+                                     'minimalai.inference._fold_sequential': ( 'minimalai-inference.html#_fold_sequential',
+                                                                               'minimalai/inference.py'),
+                                     'minimalai.inference.benchmark_latency': ( 'minimalai-inference.html#benchmark_latency',
+                                                                                'minimalai/inference.py'),
+                                     'minimalai.inference.check_equivalence': ( 'minimalai-inference.html#check_equivalence',
+                                                                                'minimalai/inference.py'),
+                                     'minimalai.inference.export_for_inference': ( 'minimalai-inference.html#export_for_inference',
+                                                                                   'minimalai/inference.py'),
+                                     'minimalai.inference.fold_batchnorm': ( 'minimalai-inference.html#fold_batchnorm',
+                                                                             'minimalai/inference.py'),
+                                     'minimalai.inference.fold_conv_bn': ( 'minimalai-inference.html#fold_conv_bn',
+                                                                           'minimalai/inference.py')},
             'minimalai.init': { 'minimalai.init.BatchTransformCallback': ( 'minimalai-initialization.html#batchtransformcallback',
                                                                            'minimalai/init.py'),
                                 'minimalai.init.BatchTransformCallback.__init__': ( 'minimalai-initialization.html#batchtransformcallback.__init__',
@@ -236,6 +452,34 @@ d = { 'settings': { 'branch': 'develop',
                                                                             'minimalai/init.py'),
                                 'minimalai.init.lsuv_init': ('minimalai-initialization.html#lsuv_init', 'minimalai/init.py'),
                                 'minimalai.init.plot_function': ('minimalai-initialization.html#plot_function', 'minimalai/init.py')},
+            'minimalai.lazy': { 'minimalai.lazy.LazyDelegates': ('minimalai-lazy-imports.html#lazydelegates', 'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyDelegates.__call__': ( 'minimalai-lazy-imports.html#lazydelegates.__call__',
+                                                                           'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyDelegates.__get__': ( 'minimalai-lazy-imports.html#lazydelegates.__get__',
+                                                                          'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyDelegates.__getattr__': ( 'minimalai-lazy-imports.html#lazydelegates.__getattr__',
+                                                                              'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyDelegates.__init__': ( 'minimalai-lazy-imports.html#lazydelegates.__init__',
+                                                                           'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyDelegates.__signature__': ( 'minimalai-lazy-imports.html#lazydelegates.__signature__',
+                                                                                'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule': ('minimalai-lazy-imports.html#lazymodule', 'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule.__dir__': ( 'minimalai-lazy-imports.html#lazymodule.__dir__',
+                                                                       'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule.__getattr__': ( 'minimalai-lazy-imports.html#lazymodule.__getattr__',
+                                                                           'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule.__init__': ( 'minimalai-lazy-imports.html#lazymodule.__init__',
+                                                                        'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule.__repr__': ( 'minimalai-lazy-imports.html#lazymodule.__repr__',
+                                                                        'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule.__setattr__': ( 'minimalai-lazy-imports.html#lazymodule.__setattr__',
+                                                                           'minimalai/lazy.py'),
+                                'minimalai.lazy.LazyModule._load': ('minimalai-lazy-imports.html#lazymodule._load', 'minimalai/lazy.py'),
+                                'minimalai.lazy.check_import_time': ('minimalai-lazy-imports.html#check_import_time', 'minimalai/lazy.py'),
+                                'minimalai.lazy.import_time': ('minimalai-lazy-imports.html#import_time', 'minimalai/lazy.py'),
+                                'minimalai.lazy.lazy_callable': ('minimalai-lazy-imports.html#lazy_callable', 'minimalai/lazy.py'),
+                                'minimalai.lazy.lazy_delegates': ('minimalai-lazy-imports.html#lazy_delegates', 'minimalai/lazy.py'),
+                                'minimalai.lazy.lazy_import': ('minimalai-lazy-imports.html#lazy_import', 'minimalai/lazy.py')},
             'minimalai.learner': { 'minimalai.learner.Callback': ('minimalai-learner.html#callback', 'minimalai/learner.py'),
                                    'minimalai.learner.CancelBatchException': ( 'minimalai-learner.html#cancelbatchexception',
                                                                                'minimalai/learner.py'),
@@ -280,8 +524,12 @@ d = { 'settings': { 'branch': 'develop',
                                    'minimalai.learner.MetricsCallback': ('minimalai-learner.html#metricscallback', 'minimalai/learner.py'),
                                    'minimalai.learner.MetricsCallback.__init__': ( 'minimalai-learner.html#metricscallback.__init__',
                                                                                    'minimalai/learner.py'),
+                                   'minimalai.learner.MetricsCallback._compute': ( 'minimalai-learner.html#metricscallback._compute',
+                                                                                   'minimalai/learner.py'),
                                    'minimalai.learner.MetricsCallback._log': ( 'minimalai-learner.html#metricscallback._log',
                                                                                'minimalai/learner.py'),
+                                   'minimalai.learner.MetricsCallback._update': ( 'minimalai-learner.html#metricscallback._update',
+                                                                                  'minimalai/learner.py'),
                                    'minimalai.learner.MetricsCallback.after_batch': ( 'minimalai-learner.html#metricscallback.after_batch',
                                                                                       'minimalai/learner.py'),
                                    'minimalai.learner.MetricsCallback.after_epoch': ( 'minimalai-learner.html#metricscallback.after_epoch',
@@ -345,6 +593,112 @@ d = { 'settings': { 'branch': 'develop',
                                    'minimalai.learner.find_lr': ('minimalai-learner.html#find_lr', 'minimalai/learner.py'),
                                    'minimalai.learner.run_callbacks': ('minimalai-learner.html#run_callbacks', 'minimalai/learner.py'),
                                    'minimalai.learner.to_cpu': ('minimalai-learner.html#to_cpu', 'minimalai/learner.py')},
+            'minimalai.loaders': { 'minimalai.loaders.DeviceDataLoader': ( 'minimalai-dataloaders.html#devicedataloader',
+                                                                           'minimalai/loaders.py'),
+                                   'minimalai.loaders.DeviceDataLoader.__init__': ( 'minimalai-dataloaders.html#devicedataloader.__init__',
+                                                                                    'minimalai/loaders.py'),
+                                   'minimalai.loaders.DeviceDataLoader.__iter__': ( 'minimalai-dataloaders.html#devicedataloader.__iter__',
+                                                                                    'minimalai/loaders.py'),
+                                   'minimalai.loaders.DeviceDataLoader.__len__': ( 'minimalai-dataloaders.html#devicedataloader.__len__',
+                                                                                   'minimalai/loaders.py'),
+                                   'minimalai.loaders.DeviceDataLoaders': ( 'minimalai-dataloaders.html#devicedataloaders',
+                                                                            'minimalai/loaders.py'),
+                                   'minimalai.loaders.DeviceDataLoaders.from_dataset_dict': ( 'minimalai-dataloaders.html#devicedataloaders.from_dataset_dict',
+                                                                                              'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing': ( 'minimalai-dataloaders.html#sharedbatchring',
+                                                                          'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing.__init__': ( 'minimalai-dataloaders.html#sharedbatchring.__init__',
+                                                                                   'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing.acquire': ( 'minimalai-dataloaders.html#sharedbatchring.acquire',
+                                                                                  'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing.batch': ( 'minimalai-dataloaders.html#sharedbatchring.batch',
+                                                                                'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing.release': ( 'minimalai-dataloaders.html#sharedbatchring.release',
+                                                                                  'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedBatchRing.reset': ( 'minimalai-dataloaders.html#sharedbatchring.reset',
+                                                                                'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryCollate': ( 'minimalai-dataloaders.html#sharedmemorycollate',
+                                                                              'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryCollate.__call__': ( 'minimalai-dataloaders.html#sharedmemorycollate.__call__',
+                                                                                       'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryCollate.__init__': ( 'minimalai-dataloaders.html#sharedmemorycollate.__init__',
+                                                                                       'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryDataLoader': ( 'minimalai-dataloaders.html#sharedmemorydataloader',
+                                                                                 'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryDataLoader.__init__': ( 'minimalai-dataloaders.html#sharedmemorydataloader.__init__',
+                                                                                          'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryDataLoader.__iter__': ( 'minimalai-dataloaders.html#sharedmemorydataloader.__iter__',
+                                                                                          'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryDataLoader.__len__': ( 'minimalai-dataloaders.html#sharedmemorydataloader.__len__',
+                                                                                         'minimalai/loaders.py'),
+                                   'minimalai.loaders.SharedMemoryDataLoader._stop': ( 'minimalai-dataloaders.html#sharedmemorydataloader._stop',
+                                                                                       'minimalai/loaders.py'),
+                                   'minimalai.loaders._dataset_tensors': ( 'minimalai-dataloaders.html#_dataset_tensors',
+                                                                           'minimalai/loaders.py'),
+                                   'minimalai.loaders._item_fields': ('minimalai-dataloaders.html#_item_fields', 'minimalai/loaders.py'),
+                                   'minimalai.loaders._load_tuning_cache': ( 'minimalai-dataloaders.html#_load_tuning_cache',
+                                                                             'minimalai/loaders.py'),
+                                   'minimalai.loaders._save_tuning_cache': ( 'minimalai-dataloaders.html#_save_tuning_cache',
+                                                                             'minimalai/loaders.py'),
+                                   'minimalai.loaders._tuning_candidates': ( 'minimalai-dataloaders.html#_tuning_candidates',
+                                                                             'minimalai/loaders.py'),
+                                   'minimalai.loaders.autotune_dataloaders': ( 'minimalai-dataloaders.html#autotune_dataloaders',
+                                                                               'minimalai/loaders.py'),
+                                   'minimalai.loaders.shared_memory_dataloaders': ( 'minimalai-dataloaders.html#shared_memory_dataloaders',
+                                                                                    'minimalai/loaders.py'),
+                                   'minimalai.loaders.time_dataloader': ( 'minimalai-dataloaders.html#time_dataloader',
+                                                                          'minimalai/loaders.py')},
+            'minimalai.prune': { 'minimalai.prune.ChannelStatisticsCallback': ( 'minimalai-prune.html#channelstatisticscallback',
+                                                                                'minimalai/prune.py'),
+                                 'minimalai.prune.ChannelStatisticsCallback.__init__': ( 'minimalai-prune.html#channelstatisticscallback.__init__',
+                                                                                         'minimalai/prune.py'),
+                                 'minimalai.prune.ChannelStatisticsCallback.after_batch': ( 'minimalai-prune.html#channelstatisticscallback.after_batch',
+                                                                                            'minimalai/prune.py'),
+                                 'minimalai.prune.ChannelStatisticsCallback.before_fit': ( 'minimalai-prune.html#channelstatisticscallback.before_fit',
+                                                                                           'minimalai/prune.py'),
+                                 'minimalai.prune.ChannelStatisticsCallback.stats': ( 'minimalai-prune.html#channelstatisticscallback.stats',
+                                                                                      'minimalai/prune.py'),
+                                 'minimalai.prune._conv': ('minimalai-prune.html#_conv', 'minimalai/prune.py'),
+                                 'minimalai.prune._conv_unit': ('minimalai-prune.html#_conv_unit', 'minimalai/prune.py'),
+                                 'minimalai.prune._narrow': ('minimalai-prune.html#_narrow', 'minimalai/prune.py'),
+                                 'minimalai.prune._prune': ('minimalai-prune.html#_prune', 'minimalai/prune.py'),
+                                 'minimalai.prune.append_channel_stats': ( 'minimalai-prune.html#append_channel_stats',
+                                                                           'minimalai/prune.py'),
+                                 'minimalai.prune.channel_statistics': ('minimalai-prune.html#channel_statistics', 'minimalai/prune.py'),
+                                 'minimalai.prune.prunable_pairs': ('minimalai-prune.html#prunable_pairs', 'minimalai/prune.py'),
+                                 'minimalai.prune.prune': ('minimalai-prune.html#prune', 'minimalai/prune.py'),
+                                 'minimalai.prune.prune_channels': ('minimalai-prune.html#prune_channels', 'minimalai/prune.py'),
+                                 'minimalai.prune.prune_model': ('minimalai-prune.html#prune_model', 'minimalai/prune.py'),
+                                 'minimalai.prune.pruning_report': ('minimalai-prune.html#pruning_report', 'minimalai/prune.py'),
+                                 'minimalai.prune.select_channels': ('minimalai-prune.html#select_channels', 'minimalai/prune.py')},
+            'minimalai.quantize': { 'minimalai.quantize.CalibrationCallback': ( 'minimalai-quantize.html#calibrationcallback',
+                                                                                'minimalai/quantize.py'),
+                                    'minimalai.quantize.CalibrationCallback.__init__': ( 'minimalai-quantize.html#calibrationcallback.__init__',
+                                                                                         'minimalai/quantize.py'),
+                                    'minimalai.quantize.CalibrationCallback.after_batch': ( 'minimalai-quantize.html#calibrationcallback.after_batch',
+                                                                                            'minimalai/quantize.py'),
+                                    'minimalai.quantize.CalibrationCallback.before_fit': ( 'minimalai-quantize.html#calibrationcallback.before_fit',
+                                                                                           'minimalai/quantize.py'),
+                                    'minimalai.quantize.CalibrationCallback.ranges': ( 'minimalai-quantize.html#calibrationcallback.ranges',
+                                                                                       'minimalai/quantize.py'),
+                                    'minimalai.quantize._convert': ('minimalai-quantize.html#_convert', 'minimalai/quantize.py'),
+                                    'minimalai.quantize._convert_sequential': ( 'minimalai-quantize.html#_convert_sequential',
+                                                                                'minimalai/quantize.py'),
+                                    'minimalai.quantize._flatten': ('minimalai-quantize.html#_flatten', 'minimalai/quantize.py'),
+                                    'minimalai.quantize._qparams': ('minimalai-quantize.html#_qparams', 'minimalai/quantize.py'),
+                                    'minimalai.quantize._quantize_layer': ( 'minimalai-quantize.html#_quantize_layer',
+                                                                            'minimalai/quantize.py'),
+                                    'minimalai.quantize.calibrate': ('minimalai-quantize.html#calibrate', 'minimalai/quantize.py'),
+                                    'minimalai.quantize.convert_to_int8': ( 'minimalai-quantize.html#convert_to_int8',
+                                                                            'minimalai/quantize.py'),
+                                    'minimalai.quantize.evaluate_accuracy': ( 'minimalai-quantize.html#evaluate_accuracy',
+                                                                              'minimalai/quantize.py'),
+                                    'minimalai.quantize.model_size': ('minimalai-quantize.html#model_size', 'minimalai/quantize.py'),
+                                    'minimalai.quantize.quantization_report': ( 'minimalai-quantize.html#quantization_report',
+                                                                                'minimalai/quantize.py'),
+                                    'minimalai.quantize.quantize_model': ( 'minimalai-quantize.html#quantize_model',
+                                                                           'minimalai/quantize.py'),
+                                    'minimalai.quantize.record_ranges': ('minimalai-quantize.html#record_ranges', 'minimalai/quantize.py')},
             'minimalai.resnet': { 'minimalai.resnet.ResBlock': ('minimalai-resnet.html#resblock', 'minimalai/resnet.py'),
                                    'minimalai.resnet.ResBlock.__init__': ( 'minimalai-resnet.html#resblock.__init__',
                                                                             'minimalai/resnet.py'),
@@ -405,6 +759,33 @@ d = { 'settings': { 'branch': 'develop',
                                'minimalai.sgd.plot_scheduler_learning_rates': ( 'minimalai-accelerate-sgd.html#plot_scheduler_learning_rates',
                                                                                 'minimalai/sgd.py')},
             'minimalai.stability': {},
+            'minimalai.streaming': { 'minimalai.streaming.StreamingDataset': ( 'minimalai-streaming.html#streamingdataset',
+                                                                               'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset.__getstate__': ( 'minimalai-streaming.html#streamingdataset.__getstate__',
+                                                                                            'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset.__init__': ( 'minimalai-streaming.html#streamingdataset.__init__',
+                                                                                        'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset.__iter__': ( 'minimalai-streaming.html#streamingdataset.__iter__',
+                                                                                        'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset.__len__': ( 'minimalai-streaming.html#streamingdataset.__len__',
+                                                                                       'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset._rank': ( 'minimalai-streaming.html#streamingdataset._rank',
+                                                                                     'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset._read': ( 'minimalai-streaming.html#streamingdataset._read',
+                                                                                     'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset._worker_shards': ( 'minimalai-streaming.html#streamingdataset._worker_shards',
+                                                                                              'minimalai/streaming.py'),
+                                     'minimalai.streaming.StreamingDataset.set_epoch': ( 'minimalai-streaming.html#streamingdataset.set_epoch',
+                                                                                         'minimalai/streaming.py'),
+                                     'minimalai.streaming.decode_sample': ( 'minimalai-streaming.html#decode_sample',
+                                                                            'minimalai/streaming.py'),
+                                     'minimalai.streaming.shuffle_buffer': ( 'minimalai-streaming.html#shuffle_buffer',
+                                                                             'minimalai/streaming.py'),
+                                     'minimalai.streaming.stream_dataloaders': ( 'minimalai-streaming.html#stream_dataloaders',
+                                                                                 'minimalai/streaming.py'),
+                                     'minimalai.streaming.tar_samples': ('minimalai-streaming.html#tar_samples', 'minimalai/streaming.py'),
+                                     'minimalai.streaming.write_tar_shards': ( 'minimalai-streaming.html#write_tar_shards',
+                                                                               'minimalai/streaming.py')},
             'minimalai.training': { 'minimalai.training.Dataset': ('minibatch_training.html#dataset', 'minimalai/training.py'),
                                     'minimalai.training.Dataset.__getitem__': ( 'minibatch_training.html#dataset.__getitem__',
                                                                                 'minimalai/training.py'),
@@ -417,4 +798,17 @@ d = { 'settings': { 'branch': 'develop',
                                     'minimalai.training.get_dataloaders': ( 'minibatch_training.html#get_dataloaders',
                                                                             'minimalai/training.py'),
                                     'minimalai.training.report_metrics': ( 'minibatch_training.html#report_metrics',
-                                                                           'minimalai/training.py')}}}
+                                                                           'minimalai/training.py')},
+            'minimalai.transfer': { 'minimalai.transfer.PinnedBufferPool': ( 'minimalai-transfer.html#pinnedbufferpool',
+                                                                             'minimalai/transfer.py'),
+                                    'minimalai.transfer.PinnedBufferPool.__init__': ( 'minimalai-transfer.html#pinnedbufferpool.__init__',
+                                                                                      'minimalai/transfer.py'),
+                                    'minimalai.transfer.PinnedBufferPool.acquire': ( 'minimalai-transfer.html#pinnedbufferpool.acquire',
+                                                                                     'minimalai/transfer.py'),
+                                    'minimalai.transfer.PinnedBufferPool.clear': ( 'minimalai-transfer.html#pinnedbufferpool.clear',
+                                                                                   'minimalai/transfer.py'),
+                                    'minimalai.transfer.PinnedBufferPool.nbytes': ( 'minimalai-transfer.html#pinnedbufferpool.nbytes',
+                                                                                    'minimalai/transfer.py'),
+                                    'minimalai.transfer.to_device': ('minimalai-transfer.html#to_device', 'minimalai/transfer.py'),
+                                    'minimalai.transfer.to_host': ('minimalai-transfer.html#to_host', 'minimalai/transfer.py'),
+                                    'minimalai.transfer.wait': ('minimalai-transfer.html#wait', 'minimalai/transfer.py')}}}
@@ -1,61 +1,101 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/17_DDPM_v2.ipynb.
 
 # %% auto 0
-__all__ = ['MixedPrecision', 'AccelerateCB']
+__all__ = ['norm_types', 'MixedPrecision', 'AccelerateCB']
 
 # %% ../nbs/17_DDPM_v2.ipynb 3
-import pickle,gzip,math,os,time,shutil,torch,random,logging
-import fastcore.all as fc,matplotlib as mpl,numpy as np,matplotlib.pyplot as plt
-from collections.abc import Mapping
-from pathlib import Path
+import math,torch
+import fastcore.all as fc
 from functools import partial
+from torch import nn
 
-from fastcore.foundation import L
-import torchvision.transforms.functional as TF,torch.nn.functional as F
-from torch import tensor,nn,optim
-from torch.utils.data import DataLoader,default_collate
-from torch.nn import init
-from torch.optim import lr_scheduler
-
-from miniai.datasets import *
-from miniai.conv import *
-from miniai.learner import *
-from miniai.activations import *
-from miniai.init import *
-from miniai.sgd import *
-from miniai.resnet import *
-from miniai.augment import *
+from .datasets import *
+from .conv import *
+from .learner import *
+from .lazy import *
 
 # %% ../nbs/17_DDPM_v2.ipynb 41
-class MixedPrecision(TrainCB):
-    order = DeviceCB.order+10
-    
-    def before_fit(self, learn): self.scaler = torch.cuda.amp.GradScaler()
+norm_types = (nn.modules.batchnorm._NormBase, nn.GroupNorm, nn.LayerNorm)
 
-    def before_batch(self, learn):
-        self.autocast = torch.autocast("cuda", dtype=torch.float16)
+def _grad_scaler(device_type):
+    "A `GradScaler` for `device_type`, or None where loss scaling is not available."
+    if hasattr(torch.amp, 'GradScaler'):
+        try: return torch.amp.GradScaler(device_type)
+        except (RuntimeError, ValueError, AssertionError): return None
+    return torch.cuda.amp.GradScaler() if device_type == 'cuda' else None
+
+class MixedPrecision(TrainCallback):
+    """
+    Train under `torch.autocast` on any device, keeping the modules of `fp32_types` in float32.
+
+    By default, CPUs use bfloat16 without loss scaling, and other devices use float16 with a `GradScaler`
+    where one is available. fp16 loss scaling needs a `torch.optim` optimizer.
+    """
+    order = DeviceCallback.order+10
+
+    def __init__(self, num_inputs=1, dtype=None, device_type=None, fp32_types=norm_types):
+        super().__init__(num_inputs=num_inputs)
+        self.dtype,self.device_type,self.fp32_types = dtype,device_type,fp32_types
+        self.autocast,self.restore = None,[]
+
+    def before_fit(self, learner):
+        param = next(learner.model.parameters(), None)
+        self.device = self.device_type or (param.device.type if param is not None else 'cpu')
+        self.amp_dtype = self.dtype or (torch.bfloat16 if self.device == 'cpu' else torch.float16)
+        self.scaler = _grad_scaler(self.device) if self.amp_dtype == torch.float16 else None
+        if self.scaler is not None and not hasattr(learner.optimizer, 'param_groups'):
+            raise TypeError('fp16 loss scaling needs a torch.optim optimizer; use dtype=torch.bfloat16 instead')
+        for m in learner.model.modules():
+            if isinstance(m, self.fp32_types): self._keep_fp32(m)
+
+    def _keep_fp32(self, m):
+        "Compute `m` in float32, outside autocast, and return its output in the precision of its input."
+        forward = m.forward
+        def _forward(x, *args, **kwargs):
+            with torch.autocast(self.device, enabled=False):
+                res = forward(x.float(), *args, **kwargs)
+            return res.to(x.dtype) if torch.is_tensor(res) else res
+        m.forward = _forward
+        self.restore.append(m)
+
+    def before_batch(self, learner):
+        self.autocast = torch.autocast(self.device, dtype=self.amp_dtype)
         self.autocast.__enter__()
 
-    def after_loss(self, learn): self.autocast.__exit__(None, None, None)
-        
-    def backward(self, learn): self.scaler.scale(learn.loss).backward()
+    def after_loss(self, learner):
+        if self.autocast is not None: self.autocast.__exit__(None, None, None)
+        self.autocast = None
+
+    def cleanup_batch(self, learner): self.after_loss(learner)
 
-    def step(self, learn):
-        self.scaler.step(learn.opt)
+    def backward(self, learner):
+        if self.scaler is None: learner.loss.backward()
+        else: self.scaler.scale(learner.loss).backward()
+
+    def step(self, learner):
+        if self.scaler is None: return learner.optimizer.step()
+        self.scaler.step(learner.optimizer)
         self.scaler.update()
 
+    def cleanup_fit(self, learner):
+        # Drop the instance attributes, so the class `forward` is used again
+        for m in self.restore: del m.forward
+        self.restore = []
+
 # %% ../nbs/17_DDPM_v2.ipynb 49
-from accelerate import Accelerator
+# accelerate is only imported once an `AccelerateCB` is created
+Accelerator = lazy_callable('accelerate', 'Accelerator')
 
 # %% ../nbs/17_DDPM_v2.ipynb 50
-class AccelerateCB(TrainCB):
-    order = DeviceCB.order+10
-    def __init__(self, n_inp=1, mixed_precision="fp16"):
-        super().__init__(n_inp=n_inp)
+class AccelerateCB(TrainCallback):
+    order = DeviceCallback.order+10
+    def __init__(self, num_inputs=1, mixed_precision="fp16"):
+        super().__init__(num_inputs=num_inputs)
         self.acc = Accelerator(mixed_precision=mixed_precision)
         
-    def before_fit(self, learn):
-        learn.model,learn.opt,learn.dls.train,learn.dls.valid = self.acc.prepare(
-            learn.model, learn.opt, learn.dls.train, learn.dls.valid)
+    def before_fit(self, learner):
+        dls = learner.data_loaders
+        learner.model,learner.optimizer,dls.train_loader,dls.valid_loader = self.acc.prepare(
+            learner.model, learner.optimizer, dls.train_loader, dls.valid_loader)
 
-    def backward(self, learn): self.acc.backward(learn.loss)
+    def backward(self, learner): self.acc.backward(learner.loss)
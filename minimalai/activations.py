@@ -4,7 +4,6 @@
 from __future__ import annotations
 import random, math
 import numpy as np
-import matplotlib.pyplot as plt
 from functools import partial
 
 import torch
@@ -12,6 +11,9 @@ import fastcore.all as fc
 
 from .datasets import *
 from .learner import *
+from .lazy import *
+
+plt = lazy_import('matplotlib.pyplot')
 
 # %% auto 0
 __all__ = ['set_seed', 'Hook', 'Hooks', 'HooksCallback', 'append_stats', 'get_histogram', 'get_min_percentage',
@@ -2,22 +2,25 @@
 
 # %% auto 0
 __all__ = ['summary', 'show_image_batch', 'CapturePreds', 'capture_preds', 'random_erasing', 'random_erase', 'RandomErasing',
-           'random_copy1', 'random_copy', 'RandomCopy']
+           'random_copy1', 'random_copy', 'RandomCopy', 'deterministic_augment', 'flip_horizontal', 'tta_views', 'TTACallback']
 
 # %% ../nbs/14_minimalai-augment.ipynb 3
 import torch, random
 import fastcore.all as fc
+from functools import partial
 
 from torch import nn
 from torch.nn import init
 
 from .datasets import *
 from .conv import *
+from .transfer import *
 from .learner import *
 from .activations import *
 from .init import *
 from .sgd import *
 from .resnet import *
+from .lazy import *
 
 # %% ../nbs/14_minimalai-augment.ipynb 17
 def _flops(x, h, w):
@@ -77,7 +80,7 @@ def summary(self: Learner):
 
 # %% ../nbs/14_minimalai-augment.ipynb 34
 @fc.patch
-@fc.delegates(show_images)
+@lazy_delegates(lambda: show_images)
 def show_image_batch(self: Learner, max_n=9, callbacks=None, **kwargs):
     """
     Fit the model for one epoch and display a batch of images.
@@ -109,6 +112,7 @@ class CapturePreds(Callback):
         - learner (Learner): The learner object.
         """
         self.all_inps, self.all_preds, self.all_targs = [], [], []
+        self.events = []
 
     def after_batch(self, learner):
         """
@@ -117,9 +121,15 @@ class CapturePreds(Callback):
         Args:
         - learner (Learner): The learner object.
         """
-        self.all_inps.append(to_cpu(learner.batch[0]))
-        self.all_preds.append(to_cpu(learner.predictions))
-        self.all_targs.append(to_cpu(learner.batch[1]))
+        # Non-blocking copies: they are only waited on once, at the end of the fit
+        (inps, preds, targs), event = to_host((learner.batch[0], learner.predictions, learner.batch[1]))
+        if learner.batch[0].device.type == 'cpu':
+            # Batches on the CPU are not copied, and may be overwritten by the next one (e.g. shared-memory slots)
+            inps, targs = inps.clone(), targs.clone()
+        self.all_inps.append(inps)
+        self.all_preds.append(preds)
+        self.all_targs.append(targs)
+        self.events.append(event)
 
     def after_fit(self, learner):
         """
@@ -128,11 +138,12 @@ class CapturePreds(Callback):
         Args:
         - learner (Learner): The learner object.
         """
+        wait(*self.events)
         self.all_preds, self.all_targs, self.all_inps = map(torch.cat, [self.all_preds, self.all_targs, self.all_inps])
 
 # %% ../nbs/14_minimalai-augment.ipynb 42
 @fc.patch
-def capture_preds(self: Learner, callbacks=None, inps=False):
+def capture_preds(self: Learner, callbacks=None, inps=False, tta=None):
     """
     Capture predictions, targets, and optionally inputs during the evaluation.
 
@@ -140,15 +151,22 @@ def capture_preds(self: Learner, callbacks=None, inps=False):
     - self (Learner): The learner instance.
     - callbacks (list or Callback): Additional callbacks to be applied during evaluation.
     - inps (bool): Whether to include inputs in the result.
+    - tta (bool or list, optional): Test-time augmentation. `True` uses `tta_views()`, a list of callables
+      uses those views. Predictions are averaged over all views (default: None, no augmentation).
 
     Returns:
     - tuple: Captured predictions and targets. If `inps` is `True`, also includes captured inputs.
     """
     # Create an instance of CapturePreds callback
     cp = CapturePreds()
+    callbacks = [cp] + fc.L(callbacks)
+
+    # Expand every batch into its augmented views within the same loader pass
+    if tta:
+        callbacks.append(TTACallback(None if tta is True else tta))
     
     # Fit the model for one epoch with the CapturePreds callback and additional callbacks
-    self.fit(1, train=False, callbacks=[cp] + fc.L(callbacks))
+    self.fit(1, train=False, callbacks=callbacks)
     
     # Get the captured predictions and targets
     res = cp.all_preds, cp.all_targs
@@ -185,7 +203,7 @@ def random_erasing(x: torch.Tensor, erase_pct: float, mean: float, std: float, m
     x.clamp_(min_val, max_val)
 
 # %% ../nbs/14_minimalai-augment.ipynb 60
-def random_erase(x: torch.Tensor, erase_pct: float = 0.2, max_erases: int = 4):
+def random_erase(x: torch.Tensor, erase_pct: float = 0.2, max_erases: int = 4, min_erases: int = 0):
     """
     Apply random erasing to the input tensor x.
 
@@ -193,6 +211,7 @@ def random_erase(x: torch.Tensor, erase_pct: float = 0.2, max_erases: int = 4):
     - x (Tensor): Input tensor.
     - erase_pct (float): Percentage of the image area to be erased in each iteration.
     - max_erases (int): Maximum number of random erasing operations to apply.
+    - min_erases (int): Minimum number of random erasing operations to apply (default: 0).
 
     Returns:
     - Tensor: The input tensor with random erasing applied.
@@ -204,7 +223,7 @@ def random_erase(x: torch.Tensor, erase_pct: float = 0.2, max_erases: int = 4):
     max_value = x.max()
 
     # Generate a random number of erasing operations to apply
-    num_erases = random.randint(0, max_erases)
+    num_erases = random.randint(min_erases, max_erases)
 
     # Apply random erasing to the input tensor for the generated number of times
     for _ in range(num_erases):
@@ -265,7 +284,7 @@ def random_copy1(x: torch.Tensor, pct: float):
         x[:, :, start_x2:start_x2 + copy_size_x, start_y2:start_y2 + copy_size_y]
 
 # %% ../nbs/14_minimalai-augment.ipynb 73
-def random_copy(x: torch.Tensor, copy_pct: float = 0.2, max_copies: int = 4):
+def random_copy(x: torch.Tensor, copy_pct: float = 0.2, max_copies: int = 4, min_copies: int = 0):
     """
     Apply random copying to the input tensor x.
 
@@ -273,12 +292,13 @@ def random_copy(x: torch.Tensor, copy_pct: float = 0.2, max_copies: int = 4):
     - x (Tensor): Input tensor.
     - copy_pct (float): Percentage of the image area to be copied in each iteration.
     - max_copies (int): Maximum number of random copying operations to apply.
+    - min_copies (int): Minimum number of random copying operations to apply (default: 0).
 
     Returns:
     - Tensor: The input tensor with random copying applied.
     """
     # Generate a random number of copying operations to apply
-    num_copies = random.randint(0, max_copies)
+    num_copies = random.randint(min_copies, max_copies)
 
     # Apply random copying to the input tensor for the generated number of times
     for _ in range(num_copies):
@@ -313,3 +333,112 @@ class RandomCopy(nn.Module):
         """
         # Apply random copying to the input tensor
         return random_copy(x, self.copy_pct, self.max_copies)
+
+# %% ../nbs/14_minimalai-augment.ipynb 84
+def deterministic_augment(transform, seed=42):
+    """
+    Wrap a random augmentation so that it applies the same augmentation on every call.
+
+    Args:
+    - transform (callable): An in-place augmentation such as `random_erase` or `random_copy`.
+    - seed (int): Seed for the Python and PyTorch random number generators during the call (default: 42).
+
+    Returns:
+    - callable: A function applying `transform` to a copy of its input, leaving the global random state untouched.
+    """
+    def _deterministic_augment(x):
+        # Fork the PyTorch RNG (and the CUDA one, for CUDA inputs) and save the Python RNG state
+        state = random.getstate()
+        devices = [x.device] if x.is_cuda else []
+        try:
+            with torch.random.fork_rng(devices=devices):
+                random.seed(seed)
+                torch.manual_seed(seed)
+                # The augmentations work in place, so apply them to a copy
+                return transform(x.clone())
+        finally:
+            random.setstate(state)
+
+    return _deterministic_augment
+
+# %% ../nbs/14_minimalai-augment.ipynb 85
+def flip_horizontal(x: torch.Tensor):
+    """
+    Flip a batch of images along the width axis.
+
+    Args:
+    - x (Tensor): Input tensor of shape (batch, channels, height, width).
+
+    Returns:
+    - Tensor: The horizontally flipped tensor.
+    """
+    return x.flip(-1)
+
+# %% ../nbs/14_minimalai-augment.ipynb 86
+def tta_views(erase_pct=0.2, max_erases=4, copy_pct=0.2, max_copies=4, seed=42):
+    """
+    Default views for test-time augmentation: the original, a horizontal flip,
+    and deterministic versions of random erasing and random copying.
+
+    Args:
+    - erase_pct (float): Percentage of the image area to be erased in each iteration.
+    - max_erases (int): Maximum number of random erasing operations to apply.
+    - copy_pct (float): Percentage of the image area to be copied in each iteration.
+    - max_copies (int): Maximum number of random copying operations to apply.
+    - seed (int): Seed of the deterministic erase view; the copy view uses `seed + 1`.
+
+    Returns:
+    - list: Callables mapping a batch of inputs to one augmented view of that batch.
+    """
+    # Both views apply at least one operation, so neither can repeat the original input
+    erase = partial(random_erase, erase_pct=erase_pct, max_erases=max_erases, min_erases=1)
+    copy = partial(random_copy, copy_pct=copy_pct, max_copies=max_copies, min_copies=1)
+    return [fc.noop, flip_horizontal, deterministic_augment(erase, seed), deterministic_augment(copy, seed + 1)]
+
+# %% ../nbs/14_minimalai-augment.ipynb 87
+class TTACallback(Callback):
+    """
+    Callback for test-time augmentation.
+
+    Each validation batch is expanded into all of its augmented views, which go through the model in a single
+    batched forward pass. The predictions are then averaged over the views on the batch's device.
+
+    Attributes:
+    - order (int): Runs right after `DeviceCallback`, so the views are built on the target device.
+    """
+    order = DeviceCallback.order + 1
+
+    def __init__(self, views=None):
+        """
+        Initialize a TTACallback object.
+
+        Args:
+        - views (list, optional): Callables mapping a batch of inputs to an augmented view (default: `tta_views()`).
+        """
+        self.views = tta_views() if views is None else list(views)
+
+    def before_batch(self, learner):
+        """
+        Replace the inputs of the batch with the concatenation of all their views.
+
+        Args:
+        - learner (Learner): The learner object.
+        """
+        if learner.training:
+            return
+        self.inputs = learner.batch[0]
+        views = torch.cat([view(self.inputs) for view in self.views])
+        learner.batch = (views, *learner.batch[1:])
+
+    def after_predict(self, learner):
+        """
+        Average the predictions over the views and restore the original inputs of the batch.
+
+        Args:
+        - learner (Learner): The learner object.
+        """
+        if learner.training:
+            return
+        predictions = learner.predictions
+        learner.predictions = predictions.view(len(self.views), -1, *predictions.shape[1:]).mean(0)
+        learner.batch = (self.inputs, *learner.batch[1:])
@@ -0,0 +1,243 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_minimalai-dataset-cache.ipynb.
+
+# %% ../nbs/05_minimalai-dataset-cache.ipynb 3
+from __future__ import annotations
+import os, json, shutil, hashlib, inspect, uuid
+import numpy as np
+from pathlib import Path
+from functools import partial
+
+import torch
+from torch.utils.data import default_collate
+
+from .datasets import *
+
+# %% auto 0
+__all__ = ['default_cache_dir', 'dataset_cache_key', 'write_shard_cache', 'ShardedDataset', 'cache_dataset_dict']
+
+# %% ../nbs/05_minimalai-dataset-cache.ipynb 5
+default_cache_dir = Path.home()/'.cache'/'minimalai'/'datasets'
+
+def _callable_key(function):
+    '''
+    Build a string identifying a (possibly wrapped) transform function.
+
+    The source of the function is used, so editing the transform invalidates the cache. Closures
+    (e.g. the one created by `apply_inplace_transformation`) and partials are followed recursively.
+    '''
+    if isinstance(function, partial):
+        return _callable_key(function.func) + repr(function.args) + repr(sorted(function.keywords.items()))
+    try:
+        key = inspect.getsource(function)
+    except (OSError, TypeError):
+        key = repr(function)
+    for cell in getattr(function, '__closure__', None) or ():
+        value = cell.cell_contents
+        key += _callable_key(value) if callable(value) else repr(value)
+    return key
+
+def _dataset_transform(dataset):
+    '''
+    The transform set on a Hugging Face dataset with `with_transform` or `set_transform`, if any.
+    '''
+    return (getattr(dataset, 'format', None) or {}).get('format_kwargs', {}).get('transform')
+
+def dataset_cache_key(dataset_dict, transform=None):
+    '''
+    Hash a dataset dictionary and a transform into a cache key.
+
+    Transforms already set on the datasets are part of the key, since they do not change their fingerprints.
+
+    Args:
+    - dataset_dict: Dictionary of Hugging Face datasets (e.g. a `DatasetDict`).
+    - transform (optional): The in-place batch transform applied before caching.
+
+    Returns:
+    - str: A short hexadecimal key.
+    '''
+    h = hashlib.sha256()
+    for split, dataset in dataset_dict.items():
+        h.update(split.encode())
+        h.update(str(getattr(dataset, '_fingerprint', None) or len(dataset)).encode())
+        h.update(repr(getattr(dataset, 'features', None)).encode())
+        if _dataset_transform(dataset) is not None:
+            h.update(_callable_key(_dataset_transform(dataset)).encode())
+    if transform is not None:
+        h.update(_callable_key(transform).encode())
+    return h.hexdigest()[:16]
+
+# %% ../nbs/05_minimalai-dataset-cache.ipynb 8
+def _write_split(dataset, path, shard_size, chunk_size):
+    '''
+    Write one split as fixed-dtype `.npy` shards of `shard_size` items per feature, and return its index entry.
+    '''
+    features = list(dataset.features)
+    pending = {feature: [] for feature in features}
+    shard_lengths, num_pending = [], 0
+
+    def _flush(length):
+        # Write the first `length` pending items as a shard, and keep the rest pending
+        nonlocal num_pending
+        for feature in features:
+            data = np.concatenate(pending[feature])
+            np.save(path/f'{feature}-{len(shard_lengths):05d}.npy', data[:length])
+            pending[feature] = [data[length:]]
+        shard_lengths.append(length)
+        num_pending -= length
+
+    for start in range(0, len(dataset), chunk_size):
+        batch = dataset[start:start + chunk_size]
+        for feature in features:
+            value = batch[feature]
+            value = value if isinstance(value, torch.Tensor) else default_collate(value)
+            pending[feature].append(value.numpy())
+        num_pending += len(value)
+        while num_pending >= shard_size:
+            _flush(shard_size)
+    if num_pending:
+        _flush(num_pending)
+
+    if not shard_lengths:
+        # An empty split has no shards, and nothing to infer the dtypes and shapes from
+        return {'length': 0, 'shards': [], 'features': {feature: None for feature in features}}
+    sample = {feature: np.load(path/f'{feature}-00000.npy', mmap_mode='r') for feature in features}
+    return {'length': len(dataset), 'shards': shard_lengths,
+            'features': {f: {'dtype': str(a.dtype), 'shape': list(a.shape[1:])} for f, a in sample.items()}}
+
+def write_shard_cache(dataset_dict, path, shard_size=10_000, chunk_size=1024):
+    '''
+    Convert a dictionary of datasets into `.npy` shards plus an `index.json` file in `path`.
+
+    The cache is written to a temporary directory and atomically renamed into place, so concurrent
+    processes (or `DataLoader` workers) never observe a partially written cache.
+
+    Args:
+    - dataset_dict: Dictionary of datasets, already transformed so that every feature collates to a tensor.
+    - path: Destination directory of the cache.
+    - shard_size: Number of items per shard (default: 10,000).
+    - chunk_size: Number of items read from the dataset at a time (default: 1024).
+
+    Returns:
+    - Path: The cache directory.
+    '''
+    path = Path(path)
+    tmp_path = path.with_name(f'{path.name}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}')
+    tmp_path.mkdir(parents=True)
+    try:
+        index = {}
+        for split, dataset in dataset_dict.items():
+            (tmp_path/split).mkdir()
+            index[split] = _write_split(dataset, tmp_path/split, shard_size, chunk_size)
+        (tmp_path/'index.json').write_text(json.dumps(index, indent=2))
+        os.rename(tmp_path, path)
+    except OSError:
+        # Another process finished writing the same cache first
+        if not (path/'index.json').exists():
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return path
+
+# %% ../nbs/05_minimalai-dataset-cache.ipynb 11
+class ShardedDataset(CollatedDataset):
+    def __init__(self, path, split):
+        '''
+        A dataset reading one split of a shard cache through memory maps.
+
+        The shards are opened lazily in each process, so the dataset can be pickled to `DataLoader`
+        workers. Items and contiguous batches are zero-copy views of the mapped files; shuffled
+        batches are gathered with a single copy per shard.
+
+        Args:
+        - path: Directory of the shard cache (as written by `write_shard_cache`).
+        - split: Name of the split to read (e.g. 'train').
+        '''
+        # The items are read from the shards, not from in-memory tensors
+        super().__init__()
+        self.path, self.split = Path(path), split
+        info = json.loads((self.path/'index.json').read_text())[split]
+        self.features = list(info['features'])
+        # dtype and item shape of each feature (None when the split is empty)
+        self.feature_specs = info['features']
+        self.shard_lengths = info['shards']
+        self.offsets = np.cumsum([0] + self.shard_lengths)
+        self._shards = None
+
+    def __getstate__(self):
+        # Memory maps are reopened by every process that uses the dataset
+        return {**self.__dict__, '_shards': None}
+
+    @property
+    def shards(self):
+        '''List of shards, each a tuple of memory-mapped arrays (one per feature).'''
+        if self._shards is None:
+            # Copy-on-write maps are writable views, so `torch.from_numpy` can share their memory
+            self._shards = [tuple(np.load(self.path/self.split/f'{feature}-{i:05d}.npy', mmap_mode='c')
+                                  for feature in self.features)
+                            for i in range(len(self.shard_lengths))]
+        return self._shards
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __getitem__(self, index):
+        shard = int(np.searchsorted(self.offsets, index, side='right')) - 1
+        return tuple(torch.as_tensor(a[index - self.offsets[shard]]) for a in self.shards[shard])
+
+    def __getitems__(self, indices):
+        '''
+        Gather a whole batch at once (used by `DataLoader` when batching with a batch sampler).
+
+        Args:
+        - indices: Index tensor (or list of indices) of the items in the batch.
+
+        Returns:
+        - tuple: One batched tensor per feature.
+        '''
+        indices = np.asarray(indices, dtype=np.int64)
+        # An empty batch is built from the metadata, as there may be no shard to read
+        if len(indices) == 0:
+            return tuple(torch.from_numpy(np.empty((0, *spec['shape']), dtype=spec['dtype'])) if spec
+                         else torch.empty(0) for spec in self.feature_specs.values())
+        shard_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        local = indices - self.offsets[shard_ids]
+
+        # Contiguous batches within a single shard are zero-copy slices
+        first = shard_ids[0]
+        if (shard_ids == first).all() and (np.diff(local) == 1).all():
+            return tuple(torch.from_numpy(a[local[0]:local[-1] + 1]) for a in self.shards[first])
+
+        batch = tuple(np.empty((len(indices), *a.shape[1:]), dtype=a.dtype) for a in self.shards[first])
+        for shard in np.unique(shard_ids):
+            mask = shard_ids == shard
+            for out, a in zip(batch, self.shards[shard]):
+                out[mask] = a[local[mask]]
+        return tuple(torch.from_numpy(out) for out in batch)
+
+# %% ../nbs/05_minimalai-dataset-cache.ipynb 14
+def cache_dataset_dict(dataset_dict, transform=None, cache_dir=default_cache_dir, **kwargs):
+    '''
+    Return memory-mapped versions of the splits of `dataset_dict`, building the shard cache on first use.
+
+    The cache is keyed by a hash of the datasets and of `transform`, so later runs skip decoding and
+    transforming entirely and read the shards at memory-copy speed.
+
+    Args:
+    - dataset_dict: Dictionary of Hugging Face datasets (e.g. a `DatasetDict`).
+    - transform (optional): In-place batch transform, applied with `apply_inplace_transformation` before caching.
+    - cache_dir: Root directory of the caches (default: `~/.cache/minimalai/datasets`).
+    - **kwargs: Additional keyword arguments for `write_shard_cache`.
+
+    Returns:
+    - dict: A `ShardedDataset` per split, usable with `DataLoaders.from_collated_dict`.
+    '''
+    path = Path(cache_dir)/dataset_cache_key(dataset_dict, transform)
+    if not (path/'index.json').exists():
+        if transform is not None:
+            # `with_transform` would silently replace a transform that is already set
+            assert not any(_dataset_transform(ds) is not None for ds in dataset_dict.values()), \
+                'The datasets already have a transform: pass it as `transform` instead'
+            dataset_dict = dataset_dict.with_transform(apply_inplace_transformation(transform))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_shard_cache(dataset_dict, path, **kwargs)
+    return {split: ShardedDataset(path, split) for split in dataset_dict}
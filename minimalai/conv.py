@@ -8,10 +8,10 @@ import torch
 from torch import nn
 
 from torch.utils.data import default_collate
-from typing import Mapping
 
 from .training import *
 from .datasets import *
+from .transfer import *
 
 # %% ../nbs/07_minimalai-convolutions.ipynb 78
 def conv_layer(input_channels, output_channels, kernel_size=3, stride=2, apply_activation=True):
@@ -47,21 +47,17 @@ def move_data_to_device(data, device=default_device):
     """
     Move input data tensors or nested collections of tensors to the specified device.
 
+    Copies from the CPU to a CUDA device are non-blocking (see `to_device`); they are queued on the
+    current stream, so the kernels that use the data are ordered after them.
+
     Args:
-    - data (torch.Tensor or Mapping or Iterable): Input data tensors or nested collections of tensors.
+    - data (torch.Tensor or Mapping or Iterable): Input data tensors or arbitrarily nested collections of tensors.
     - device (str): Target device to move the data to (default: determined based on availability).
 
     Returns:
     - torch.Tensor or Mapping or Iterable: Data tensors or nested collections of tensors moved to the specified device.
     """
-    # If input is a single tensor, move it to the specified device
-    if isinstance(data, torch.Tensor):
-        return data.to(device)
-    # If input is a mapping (e.g., dictionary), move each value to the specified device
-    if isinstance(data, Mapping):
-        return {key: value.to(device) for key, value in data.items()}
-    # If input is an iterable (e.g., list), recursively move each element to the specified device
-    return type(data)(move_data_to_device(item, device) for item in data)
+    return to_device(data, device)[0]
 
 def collate_data_on_device(batch, device=default_device):
     """
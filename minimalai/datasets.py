@@ -4,18 +4,22 @@
 from __future__ import annotations
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 from operator import itemgetter
 from itertools import zip_longest
 
 import fastcore.all as fc
 
-from torch.utils.data import default_collate
+import torch
+from torch.utils.data import DataLoader, default_collate
 
 from .training import *
+from .lazy import *
+
+plt = lazy_import('matplotlib.pyplot')
 
 # %% auto 0
-__all__ = ['apply_inplace_transformation', 'collate_dict', 'show_image', 'subplots', 'get_grid', 'show_images', 'DataLoaders']
+__all__ = ['apply_inplace_transformation', 'collate_dict', 'show_image', 'subplots', 'get_grid', 'show_images', 'DataLoaders',
+           'CollatedDataset', 'BatchIndexSampler']
 
 # %% ../nbs/05_minimalai-dataset-visualization.ipynb 27
 def apply_inplace_transformation(transform_function):
@@ -80,7 +84,7 @@ def collate_dict(dataset):
 
 
 # %% ../nbs/05_minimalai-dataset-visualization.ipynb 43
-@fc.delegates(plt.Axes.imshow)
+@lazy_delegates(lambda: plt.Axes.imshow)
 def show_image(image, ax=None, figsize=None, title=None, noframe=True, **kwargs):
     '''
     Show a PIL or PyTorch image on `ax`.
@@ -125,7 +129,7 @@ def show_image(image, ax=None, figsize=None, title=None, noframe=True, **kwargs)
     return ax
 
 # %% ../nbs/05_minimalai-dataset-visualization.ipynb 47
-@fc.delegates(plt.subplots, keep=True)
+@lazy_delegates(lambda: plt.subplots, keep=True)
 def subplots(
     nrows: int = 1,          # Number of rows in the grid of subplots
     ncols: int = 1,          # Number of columns in the grid of subplots
@@ -168,7 +172,7 @@ def subplots(
     return fig, ax
 
 # %% ../nbs/05_minimalai-dataset-visualization.ipynb 50
-@fc.delegates(subplots)
+@lazy_delegates(lambda: subplots)
 def get_grid(
     n: int,                  # Number of axes
     nrows: int = None,       # Number of rows in the grid (default: int(np.sqrt(n)))
@@ -218,7 +222,7 @@ def get_grid(
     return fig, axs
 
 # %% ../nbs/05_minimalai-dataset-visualization.ipynb 52
-@fc.delegates(subplots)
+@lazy_delegates(lambda: subplots)
 def show_images(
     ims: list,             # List of images to show
     nrows: int | None = None,  # Number of rows in the grid (default: None)
@@ -275,3 +279,111 @@ class DataLoaders:
         # Get train and valid dataloaders from the datasets using `get_dataloaders`
         # Return a new instance of DataLoaders with train and valid dataloaders
         return cls(*get_dataloaders(*dataset_dict.values(), batch_size=batch_size, collate_fn=collate_f, **kwargs))
+
+    @classmethod
+    def from_collated_dict(cls, dataset_dict, batch_size, **kwargs):
+        '''
+        Create a DataLoaders object whose batches are gathered from pre-collated tensors.
+
+        Each split is materialized once into a `CollatedDataset`, and batches are produced by a
+        `BatchIndexSampler`, so a whole batch is a single indexing operation with no per-item collation.
+
+        Args:
+        - cls: Class reference.
+        - dataset_dict: Dictionary of datasets with keys 'train' and 'valid' (Hugging Face datasets or `CollatedDataset`s).
+        - batch_size: Batch size for the training dataloader (the validation one uses twice that).
+        - **kwargs: Additional keyword arguments for dataloaders.
+
+        Returns:
+        - DataLoaders: DataLoaders object with train and valid dataloaders.
+        '''
+        # Materialize the splits into contiguous tensors once
+        train_ds, valid_ds = [ds if isinstance(ds, CollatedDataset) else CollatedDataset.from_dataset(ds)
+                              for ds in list(dataset_dict.values())[:2]]
+
+        # Batches are already collated by `CollatedDataset.__getitems__`, so the collate function is a no-op
+        return cls(DataLoader(train_ds, batch_sampler=BatchIndexSampler(len(train_ds), batch_size, shuffle=True),
+                              collate_fn=fc.noop, **kwargs),
+                   DataLoader(valid_ds, batch_sampler=BatchIndexSampler(len(valid_ds), batch_size*2),
+                              collate_fn=fc.noop, **kwargs))
+
+# %% ../nbs/05_minimalai-dataset-visualization.ipynb 60
+class CollatedDataset:
+    def __init__(self, *tensors):
+        '''
+        Initialize a dataset backed by contiguous tensors, one per feature.
+
+        Args:
+        - *tensors: Tensors sharing the same first (item) dimension.
+        '''
+        assert all(len(t) == len(tensors[0]) for t in tensors), 'All tensors must have the same length'
+        self.tensors = tensors
+
+    @classmethod
+    def from_dataset(cls, dataset, chunk_size=1024):
+        '''
+        Materialize the features of a Hugging Face dataset into contiguous tensors.
+
+        The dataset is read in slices of `chunk_size` items, so transforms set with `with_transform`
+        (e.g. `apply_inplace_transformation`) are applied batch-wise, once.
+
+        Args:
+        - dataset: A Hugging Face dataset whose transformed features can be collated into tensors.
+        - chunk_size: Number of items read per slice (default: 1024).
+
+        Returns:
+        - CollatedDataset: The materialized dataset, with tensors in the order of `dataset.features`.
+        '''
+        features = list(dataset.features)
+        chunks = {feature: [] for feature in features}
+        for start in range(0, len(dataset), chunk_size):
+            batch = dataset[start:start + chunk_size]
+            for feature in features:
+                value = batch[feature]
+                chunks[feature].append(value if isinstance(value, torch.Tensor) else default_collate(value))
+        return cls(*(torch.cat(chunks[feature]) for feature in features))
+
+    def __len__(self):
+        return len(self.tensors[0])
+
+    def __getitem__(self, index):
+        return tuple(t[index] for t in self.tensors)
+
+    def __getitems__(self, indices):
+        '''
+        Gather a whole batch at once (used by `DataLoader` when batching with a batch sampler).
+
+        Args:
+        - indices: Index tensor (or list of indices) of the items in the batch.
+
+        Returns:
+        - tuple: One batched tensor per feature.
+        '''
+        indices = torch.as_tensor(indices)
+        return tuple(t[indices] for t in self.tensors)
+
+# %% ../nbs/05_minimalai-dataset-visualization.ipynb 61
+class BatchIndexSampler:
+    def __init__(self, num_items, batch_size, shuffle=False, drop_last=False):
+        '''
+        Batch sampler yielding one index tensor per batch.
+
+        Args:
+        - num_items: Number of items in the dataset.
+        - batch_size: Number of items per batch.
+        - shuffle: Whether to draw a new random permutation every epoch (default: False).
+        - drop_last: Whether to drop the last incomplete batch (default: False).
+        '''
+        fc.store_attr()
+
+    def __len__(self):
+        if self.drop_last:
+            return self.num_items // self.batch_size
+        return math.ceil(self.num_items / self.batch_size)
+
+    def __iter__(self):
+        indices = torch.randperm(self.num_items) if self.shuffle else torch.arange(self.num_items)
+        batches = indices.split(self.batch_size)
+        if self.drop_last and self.num_items % self.batch_size:
+            batches = batches[:-1]
+        return iter(batches)
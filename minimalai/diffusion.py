@@ -2,14 +2,17 @@
 
 # %% auto 0
 __all__ = ['abar', 'inv_abar', 'noisify', 'collate_ddpm', 'dl_ddpm', 'timestep_embedding', 'pre_conv', 'upsample', 'lin',
-           'SelfAttention', 'SelfAttention2D', 'EmbResBlock', 'saved', 'DownBlock', 'UpBlock', 'EmbUNetModel',
-           'ddim_step', 'sample', 'cond_sample']
+           'SelfAttention', 'SelfAttention2D', 'EmbResBlock', 'DownBlock', 'UpBlock', 'EmbUNetModel',
+           'CondEmbUNetModel', 'ClassifierFreeGuidance', 'ConditioningCache', 'ddim_step', 'ddim_schedule', 'sample',
+           'cond_sample', 'pack_classes', 'cond_sample_classes', 'dpm_schedule', 'dpm_sample', 'fid_vs_nfe']
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 3
-from miniai.imports import *
+from .imports import *
+from .lazy import *
+import inspect
+from functools import lru_cache
 
-from einops import rearrange
-from fastprogress import progress_bar
+progress_bar = lazy_callable('fastprogress', 'progress_bar')
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 6
 def abar(t): return (t*math.pi/2).cos()**2
@@ -55,7 +58,7 @@ def lin(ni, nf, act=nn.SiLU, norm=None, bias=True):
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 15
 class SelfAttention(nn.Module):
-    def __init__(self, ni, attn_chans, transpose=True):
+    def __init__(self, ni, attn_chans, transpose=True, q_chunk=None):
         super().__init__()
         self.nheads = ni//attn_chans
         self.scale = math.sqrt(ni/self.nheads)
@@ -63,17 +66,22 @@ class SelfAttention(nn.Module):
         self.qkv = nn.Linear(ni, ni*3)
         self.proj = nn.Linear(ni, ni)
         self.t = transpose
+        # Queries per chunk, to bound the memory of the attention scores (None for a single call)
+        self.q_chunk = q_chunk
     
     def forward(self, x):
         n,c,s = x.shape
         if self.t: x = x.transpose(1, 2)
         x = self.norm(x)
         x = self.qkv(x)
-        x = rearrange(x, 'n s (h d) -> (n h) s d', h=self.nheads)
-        q,k,v = torch.chunk(x, 3, dim=-1)
-        s = (q@k.transpose(1,2))/self.scale
-        x = s.softmax(dim=-1)@v
-        x = rearrange(x, '(n h) s d -> n s (h d)', h=self.nheads)
+        # Each head's features are its q, k and v in turn, so they are split with views instead of copies
+        q,k,v = x.view(n, -1, self.nheads, 3, c//self.nheads).permute(3, 0, 2, 1, 4)
+        if self.q_chunk is None: x = F.scaled_dot_product_attention(q, k, v)
+        else:
+            x = q.new_empty(q.shape)
+            for i in range(0, q.shape[2], self.q_chunk):
+                x[:, :, i:i+self.q_chunk] = F.scaled_dot_product_attention(q[:, :, i:i+self.q_chunk], k, v)
+        x = x.transpose(1, 2).reshape(n, -1, c)
         x = self.proj(x)
         if self.t: x = x.transpose(1, 2)
         return x
@@ -86,7 +94,7 @@ class SelfAttention2D(SelfAttention):
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 17
 class EmbResBlock(nn.Module):
-    def __init__(self, n_emb, ni, nf=None, ks=3, act=nn.SiLU, norm=nn.BatchNorm2d, attn_chans=0):
+    def __init__(self, n_emb, ni, nf=None, ks=3, act=nn.SiLU, norm=nn.BatchNorm2d, attn_chans=0, q_chunk=None):
         super().__init__()
         if nf is None: nf = ni
         self.emb_proj = nn.Linear(n_emb, nf*2)
@@ -94,52 +102,46 @@ class EmbResBlock(nn.Module):
         self.conv2 = pre_conv(nf, nf, ks, act=act, norm=norm)
         self.idconv = fc.noop if ni==nf else nn.Conv2d(ni, nf, 1)
         self.attn = False
-        if attn_chans: self.attn = SelfAttention2D(nf, attn_chans)
+        if attn_chans: self.attn = SelfAttention2D(nf, attn_chans, q_chunk=q_chunk)
 
     def forward(self, x, t):
         inp = x
         x = self.conv1(x)
-        emb = self.emb_proj(F.silu(t))[:, :, None, None]
-        scale,shift = torch.chunk(emb, 2, dim=1)
+        # `t` is the embedding, or the projections of all blocks precomputed by a `ConditioningCache`
+        emb = t[self] if isinstance(t, dict) else self.emb_proj(F.silu(t))
+        scale,shift = torch.chunk(emb[:, :, None, None], 2, dim=1)
         x = x*(1+scale) + shift
         x = self.conv2(x)
         x = x + self.idconv(inp)
         if self.attn: x = x + self.attn(x)
         return x
 
-# %% ../nbs/28_diffusion-attn-cond.ipynb 18
-def saved(m, blk):
-    m_ = m.forward
-
-    @wraps(m.forward)
-    def _f(*args, **kwargs):
-        res = m_(*args, **kwargs)
-        blk.saved.append(res)
-        return res
-
-    m.forward = _f
-    return m
-
 # %% ../nbs/28_diffusion-attn-cond.ipynb 19
 class DownBlock(nn.Module):
-    def __init__(self, n_emb, ni, nf, add_down=True, num_layers=1, attn_chans=0):
+    def __init__(self, n_emb, ni, nf, add_down=True, num_layers=1, attn_chans=0, q_chunk=None):
         super().__init__()
-        self.resnets = nn.ModuleList([saved(EmbResBlock(n_emb, ni if i==0 else nf, nf, attn_chans=attn_chans), self)
+        self.add_down = add_down
+        self.resnets = nn.ModuleList([EmbResBlock(n_emb, ni if i==0 else nf, nf, attn_chans=attn_chans, q_chunk=q_chunk)
                                       for i in range(num_layers)])
-        self.down = saved(nn.Conv2d(nf, nf, 3, stride=2, padding=1), self) if add_down else nn.Identity()
+        self.down = nn.Conv2d(nf, nf, 3, stride=2, padding=1) if add_down else nn.Identity()
 
     def forward(self, x, t):
-        self.saved = []
-        for resnet in self.resnets: x = resnet(x, t)
+        # The skip connections are returned rather than kept on the module, so the model is reentrant
+        skips = []
+        for resnet in self.resnets:
+            x = resnet(x, t)
+            skips.append(x)
         x = self.down(x)
-        return x
+        if self.add_down: skips.append(x)
+        return x, skips
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 20
 class UpBlock(nn.Module):
-    def __init__(self, n_emb, ni, prev_nf, nf, add_up=True, num_layers=2, attn_chans=0):
+    def __init__(self, n_emb, ni, prev_nf, nf, add_up=True, num_layers=2, attn_chans=0, q_chunk=None):
         super().__init__()
         self.resnets = nn.ModuleList(
-            [EmbResBlock(n_emb, (prev_nf if i==0 else nf)+(ni if (i==num_layers-1) else nf), nf, attn_chans=attn_chans)
+            [EmbResBlock(n_emb, (prev_nf if i==0 else nf)+(ni if (i==num_layers-1) else nf), nf, attn_chans=attn_chans,
+                         q_chunk=q_chunk)
             for i in range(num_layers)])
         self.up = upsample(nf) if add_up else nn.Identity()
 
@@ -149,7 +151,8 @@ class UpBlock(nn.Module):
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 21
 class EmbUNetModel(nn.Module):
-    def __init__( self, in_channels=3, out_channels=3, nfs=(224,448,672,896), num_layers=1, attn_chans=8, attn_start=1):
+    def __init__( self, in_channels=3, out_channels=3, nfs=(224,448,672,896), num_layers=1, attn_chans=8, attn_start=1,
+                 q_chunk=None):
         super().__init__()
         self.conv_in = nn.Conv2d(in_channels, nfs[0], kernel_size=3, padding=1)
         self.n_temb = nf = nfs[0]
@@ -162,7 +165,7 @@ class EmbUNetModel(nn.Module):
             ni = nf
             nf = nfs[i]
             self.downs.append(DownBlock(n_emb, ni, nf, add_down=i!=n-1, num_layers=num_layers,
-                                        attn_chans=0 if i<attn_start else attn_chans))
+                                        attn_chans=0 if i<attn_start else attn_chans, q_chunk=q_chunk))
         self.mid_block = EmbResBlock(n_emb, nfs[-1])
 
         rev_nfs = list(reversed(nfs))
@@ -173,59 +176,245 @@ class EmbUNetModel(nn.Module):
             nf = rev_nfs[i]
             ni = rev_nfs[min(i+1, len(nfs)-1)]
             self.ups.append(UpBlock(n_emb, ni, prev_nf, nf, add_up=i!=n-1, num_layers=num_layers+1,
-                                    attn_chans=0 if i>=n-attn_start else attn_chans))
+                                    attn_chans=0 if i>=n-attn_start else attn_chans, q_chunk=q_chunk))
         self.conv_out = pre_conv(nfs[0], out_channels, act=nn.SiLU, norm=nn.BatchNorm2d, bias=False)
 
     def forward(self, inp):
         x,t = inp
         temb = timestep_embedding(t, self.n_temb)
-        emb = self.emb_mlp(temb)
+        return self.unet(x, self.emb_mlp(temb))
+
+    def unet(self, x, emb):
         x = self.conv_in(x)
-        saved = [x]
-        for block in self.downs: x = block(x, emb)
-        saved += [p for o in self.downs for p in o.saved]
+        skips = [x]
+        for block in self.downs:
+            # The skips extend the list directly: a local name would keep those of the last block alive
+            x, skips[len(skips):] = block(x, emb)
         x = self.mid_block(x, emb)
-        for block in self.ups: x = block(x, emb, saved)
+        # Each up block pops the skips it uses, so they are freed as soon as they are consumed
+        for block in self.ups: x = block(x, emb, skips)
         return self.conv_out(x)
 
+# %% ../nbs/28_diffusion-attn-cond.ipynb 23
+class CondEmbUNetModel(EmbUNetModel):
+    def __init__(self, n_classes, in_channels=3, out_channels=3, nfs=(224,448,672,896), num_layers=1, attn_chans=8,
+                 attn_start=1, p_uncond=0.1, q_chunk=None):
+        super().__init__(in_channels, out_channels, nfs, num_layers, attn_chans, attn_start, q_chunk)
+        self.n_classes,self.p_uncond = n_classes,p_uncond
+        # Class `n_classes` is the null token, used for unconditional predictions
+        self.cond_emb = nn.Embedding(n_classes+1, self.n_temb*4)
+
+    def forward(self, inp):
+        x,t,c = inp
+        if self.training and self.p_uncond:
+            c = torch.where(torch.rand(c.shape, device=c.device)<self.p_uncond, self.n_classes, c)
+        temb = timestep_embedding(t, self.n_temb)
+        return self.unet(x, self.emb_mlp(temb) + self.cond_emb(c))
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 24
+class ClassifierFreeGuidance(nn.Module):
+    def __init__(self, model, guidance=3., null_class=None):
+        super().__init__()
+        self.model,self.guidance = model,guidance
+        self.null_class = model.n_classes if null_class is None else null_class
+
+    def forward(self, inp):
+        # The conditional and unconditional halves go through the model as one batch
+        x,t,c = inp
+        x2 = torch.cat([x, x])
+        t2 = t if t.numel()==1 else torch.cat([t, t])
+        c2 = torch.cat([c, torch.full_like(c, self.null_class)])
+        cond,uncond = self.model((x2, t2, c2)).chunk(2)
+        return uncond + self.guidance*(cond-uncond)
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 25
+class ConditioningCache(nn.Module):
+    def __init__(self, model, ts):
+        super().__init__()
+        self.model = model
+        self.n_classes = getattr(model, 'n_classes', None)
+        self.blocks = [m for m in model.modules() if isinstance(m, EmbResBlock)]
+        self.sizes = [b.emb_proj.out_features for b in self.blocks]
+        self.register_buffer('ts', None, persistent=False)
+        self.register_buffer('table', None, persistent=False)
+        self.refresh(ts)
+
+    @torch.no_grad()
+    def refresh(self, ts=None):
+        # Recompute the tables, e.g. after the weights changed
+        if ts is not None: self.ts = ts.float().to(_model_device(self.model))
+        training = self.model.training
+        self.model.eval()
+        emb = self.model.emb_mlp(timestep_embedding(self.ts, self.model.n_temb))[:, None]
+        # Conditional models get one row per class (and the null token)
+        if hasattr(self.model, 'cond_emb'): emb = emb + self.model.cond_emb.weight[None]
+        # All the `emb_proj` layers as one matmul: (steps, classes, sum of their outputs)
+        w = torch.cat([b.emb_proj.weight for b in self.blocks])
+        bias = torch.cat([b.emb_proj.bias for b in self.blocks])
+        self.table = F.linear(F.silu(emb), w, bias)
+        self.model.train(training)
+
+    def forward(self, inp):
+        x,t,*cond = inp
+        # Rows of the timesteps, found on the device (no host sync)
+        idx = (self.ts[None] - t.reshape(-1, 1)).abs().argmin(1)
+        rows = self.table[idx, cond[0]] if cond and self.n_classes is not None else self.table[idx, 0]
+        return self.model.unet(x, dict(zip(self.blocks, rows.split(self.sizes, dim=1))))
+
 # %% ../nbs/28_diffusion-attn-cond.ipynb 28
-def ddim_step(x_t, noise, abar_t, abar_t1, bbar_t, bbar_t1, eta, sig, clamp=True):
+def ddim_step(x_t, noise, abar_t, abar_t1, bbar_t, bbar_t1, eta, sig, clamp=True, generator=None, z=None):
     sig = ((bbar_t1/bbar_t).sqrt() * (1-abar_t/abar_t1).sqrt()) * eta
     x_0_hat = ((x_t-(1-abar_t).sqrt()*noise) / abar_t.sqrt())
     if clamp: x_0_hat = x_0_hat.clamp(-1,1)
-    if bbar_t1<=sig**2+0.01: sig=0.  # set to zero if very small or NaN
+    # set to zero if very small or NaN, masking on the device instead of branching on the host
+    sig = torch.where((bbar_t1<=sig**2+0.01) | sig.isnan(), 0., sig)
     x_t = abar_t1.sqrt()*x_0_hat + (bbar_t1-sig**2).sqrt()*noise
-    x_t += sig * torch.randn(x_t.shape).to(x_t)
+    if z is None: z = torch.randn(x_t.shape, device=x_t.device, dtype=x_t.dtype, generator=generator)
+    x_t += sig * z
     return x_0_hat,x_t
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 29
+@lru_cache(maxsize=32)
+def ddim_schedule(steps, device=None):
+    # Cached, so the tables are computed once per number of steps and device (they must not be modified)
+    ts = torch.linspace(1-1/steps, 0, steps, device=device)
+    abar_t = abar(ts)
+    # `abar` of the next (smaller) timestep, with 1 after the last one
+    abar_t1 = torch.cat([abar_t[1:], abar_t.new_ones(1)])
+    return ts, abar_t, abar_t1
+
+def _model_device(model):
+    return next(iter(model.parameters()), torch.empty(0)).device
+
+def _denoise(f, model, x_t, t, abar_t, abar_t1, eta, sig, clamp, z, *cond):
+    noise = model((x_t, t, *cond))
+    kwargs = {} if z is None else dict(z=z)
+    return f(x_t, noise, abar_t, abar_t1, 1-abar_t, 1-abar_t1, eta, sig, clamp=clamp, **kwargs)
+
 @torch.no_grad()
-def sample(f, model, sz, steps, eta=1., clamp=True):
+def _sample_loop(f, model, x_t, steps, eta, clamp, every, generator, compile, *cond):
     model.eval()
-    ts = torch.linspace(1-1/steps,0,steps)
-    x_t = torch.randn(sz).cuda()
-    preds = []
-    for i,t in enumerate(progress_bar(ts)):
-        t = t[None].cuda()
-        abar_t = abar(t)
-        noise = model((x_t, t))
-        abar_t1 = abar(t-1/steps) if t>=1/steps else torch.tensor(1)
-        x_0_hat,x_t = f(x_t, noise, abar_t, abar_t1, 1-abar_t, 1-abar_t1, eta, 1-((i+1)/100), clamp=clamp)
-        preds.append(x_0_hat.float().cpu())
-    return preds
+    ts, abar_ts, abar_t1s = ddim_schedule(steps, x_t.device)
+    sigs = 1-torch.arange(1, steps+1, device=x_t.device)/100
+    # Every per-step value is a tensor, so a compiled step is traced once and reused for all steps
+    step = torch.compile(_denoise) if compile else _denoise
+    # The noise of each step is drawn into one buffer, outside the (compiled) step.
+    # Steps without a `z` argument (the original `f` signature) draw their own noise instead
+    z = torch.empty_like(x_t) if 'z' in inspect.signature(f).parameters else None
+    traj = None
+    if every:
+        # Every `every`-th prediction, counting back from the last one, goes to a preallocated host buffer
+        n_saved = (steps-1)//every + 1
+        traj = torch.empty((n_saved, *x_t.shape), pin_memory=x_t.is_cuda)
+    for i in progress_bar(range(steps)):
+        if z is not None: torch.randn(x_t.shape, generator=generator, out=z)
+        x_0_hat,x_t = step(f, model, x_t, ts[i:i+1], abar_ts[i], abar_t1s[i], eta, sigs[i], clamp, z, *cond)
+        if every and (steps-1-i)%every==0: traj[n_saved-1-(steps-1-i)//every].copy_(x_0_hat, non_blocking=True)
+    if every:
+        if x_t.is_cuda: torch.cuda.current_stream(x_t.device).synchronize()
+        return traj
+    return x_0_hat.float()
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 30
+def sample(f, model, sz, steps, eta=1., clamp=True, device=None, every=None, generator=None, compile=False):
+    x_t = torch.randn(sz, device=device or _model_device(model), generator=generator)
+    return _sample_loop(f, model, x_t, steps, eta, clamp, every, generator, compile)
 
 # %% ../nbs/28_diffusion-attn-cond.ipynb 43
+def cond_sample(c, f, model, sz, steps, eta=1., clamp=True, device=None, every=None, generator=None, compile=False,
+                guidance=None):
+    if guidance is not None: model = ClassifierFreeGuidance(model, guidance)
+    x_t = torch.randn(sz, device=device or _model_device(model), generator=generator)
+    # `c` is one class for the whole batch, or one class per sample
+    c = torch.as_tensor(c, dtype=torch.int32, device=x_t.device).expand(sz[0])
+    return _sample_loop(f, model, x_t, steps, eta, clamp, every, generator, compile, c)
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 44
+def pack_classes(counts, bs):
+    # `counts` maps each class to its number of samples (or is a list of them), packed into batches of `bs` classes
+    if not isinstance(counts, dict): counts = dict(enumerate(counts))
+    cs = torch.cat([torch.full((n,), c, dtype=torch.int32) for c,n in counts.items()])
+    return list(cs.split(bs))
+
+def cond_sample_classes(counts, f, model, sz, steps, bs=64, **kwargs):
+    # Samples for many classes in full batches; `sz` is the shape of one image. Returns the images and their classes
+    imgs,labels = [],[]
+    for c in progress_bar(pack_classes(counts, bs)):
+        imgs.append(cond_sample(c, f, model, (len(c), *sz), steps, **kwargs).cpu())
+        labels.append(c)
+    return torch.cat(imgs, dim=-len(sz)-1), torch.cat(labels)
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 46
+def dpm_schedule(steps, t_max=0.99, t_min=0.01):
+    # Timesteps uniform in log-SNR λ=log(α/σ), with α²=abar(t) and σ²=1-abar(t), so abar=sigmoid(2λ)
+    lam = lambda t: (abar(t)/(1-abar(t))).log()/2
+    lams = torch.linspace(lam(tensor(t_max, dtype=torch.float64)), lam(tensor(t_min, dtype=torch.float64)), steps,
+                          dtype=torch.float64)
+    abars = torch.sigmoid(2*lams)
+    return inv_abar(abars), abars.sqrt(), (1-abars).sqrt(), lams
+
+def _dpm_coefs(lams, alphas, sigmas, order, lower_order_final):
+    # Each DPM-Solver++ update is x_{i+1} = c0*x_i + c1*D_i + c2*D_{i-1} + c3*D_{i-2}, D being the x_0 predictions
+    coefs = torch.zeros(len(lams)-1, 4, dtype=torch.float64)
+    for i in range(len(lams)-1):
+        h,a = lams[i+1]-lams[i], alphas[i+1]
+        e = torch.expm1(-h)
+        k = min(order, i+1, len(lams)-1-i if lower_order_final else order)
+        m = torch.tensor([-a*e, 0., 0.], dtype=torch.float64)
+        if k==2:
+            r0 = (lams[i]-lams[i-1])/h
+            m += -a*e/(2*r0) * torch.tensor([1., -1., 0.], dtype=torch.float64)
+        elif k==3:
+            r0,r1 = (lams[i]-lams[i-1])/h, (lams[i-1]-lams[i-2])/h
+            d1_0 = torch.tensor([1/r0, -1/r0, 0.], dtype=torch.float64)
+            u = torch.tensor([1/r0, -1/r0-1/r1, 1/r1], dtype=torch.float64)
+            d1,d2 = d1_0 + r0/(r0+r1)*u, u/(r0+r1)
+            m += a*(e/h+1)*d1 - a*((e+h)/h**2-0.5)*d2
+        coefs[i,0],coefs[i,1:] = sigmas[i+1]/sigmas[i], m
+    return coefs
+
+@lru_cache(maxsize=32)
+def _dpm_tables(steps, order, lower_order_final, t_max, t_min, device):
+    ts, alphas, sigmas, lams = dpm_schedule(steps, t_max, t_min)
+    coefs = _dpm_coefs(lams, alphas, sigmas, order, lower_order_final)
+    return [o.float().to(device) for o in (ts, alphas, sigmas, coefs)]
+
+def _dpm_denoise(model, x_t, t, alpha, sigma, clamp, *cond):
+    x_0 = (x_t - sigma*model((x_t, t, *cond))) / alpha
+    return x_0.clamp(-1,1) if clamp else x_0
+
 @torch.no_grad()
-def cond_sample(c, f, model, sz, steps, eta=1.):
-    ts = torch.linspace(1-1/steps,0,steps)
-    x_t = torch.randn(sz).cuda()
-    c = x_t.new_full((sz[0],), c, dtype=torch.int32)
-    preds = []
-    for i,t in enumerate(progress_bar(ts)):
-        t = t[None].cuda()
-        abar_t = abar(t)
-        noise = model((x_t, t, c))
-        abar_t1 = abar(t-1/steps) if t>=1/steps else torch.tensor(1)
-        x_0_hat,x_t = f(x_t, noise, abar_t, abar_t1, 1-abar_t, 1-abar_t1, eta, 1-((i+1)/100))
-        preds.append(x_0_hat.float().cpu())
-    return preds
+def dpm_sample(model, sz, steps, order=2, clamp=True, device=None, generator=None, c=None, lower_order_final=True,
+               t_max=0.99, t_min=0.01, compile=False, guidance=None):
+    # DPM-Solver++ 2M (`order=2`) or 3M (`order=3`) on the cosine schedule, with `steps` model evaluations
+    if guidance is not None: model = ClassifierFreeGuidance(model, guidance)
+    model.eval()
+    device = device or _model_device(model)
+    ts, alphas, sigmas, coefs = _dpm_tables(steps, order, lower_order_final, t_max, t_min, torch.device(device))
+    x_t = torch.randn(sz, device=device, generator=generator)
+    cond = () if c is None else (torch.as_tensor(c, dtype=torch.int32, device=device).expand(sz[0]),)
+    denoise = torch.compile(_dpm_denoise) if compile else _dpm_denoise
+    hist = []
+    for i in progress_bar(range(steps)):
+        x_0 = denoise(model, x_t, ts[i:i+1], alphas[i], sigmas[i], clamp, *cond)
+        # The last model evaluation is at `t_min`, whose x_0 prediction is the output
+        if i==steps-1: break
+        hist = [x_0] + hist[:2]
+        x_t = coefs[i,0]*x_t + sum(coefs[i,j+1]*d for j,d in enumerate(hist))
+    return x_0.float()
+
+# %% ../nbs/28_diffusion-attn-cond.ipynb 48
+def fid_vs_nfe(model, image_eval, sz, nfes=(5,10,20,50), samplers=None, tfm=fc.noop, seed=42):
+    # FID (from an `fid.ImageEval`) of the images of each sampler, for each number of function evaluations (NFE)
+    if samplers is None: samplers = {
+        'ddim': lambda model, sz, steps, **kw: sample(ddim_step, model, sz, steps, eta=0., **kw),
+        'dpm++2m': partial(dpm_sample, order=2),
+        'dpm++3m': partial(dpm_sample, order=3)}
+    device = _model_device(model)
+    res = {}
+    for name,sampler in samplers.items():
+        res[name] = []
+        for nfe in nfes:
+            g = torch.Generator(device).manual_seed(seed)
+            res[name].append((nfe, image_eval.fid(tfm(sampler(model, sz, nfe, generator=g)))))
+    return res
@@ -1,15 +1,12 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/28_diffusion-attn-nodownsave.ipynb.
 
 # %% auto 0
-__all__ = ['abar', 'inv_abar', 'noisify', 'timestep_embedding', 'pre_conv', 'upsample', 'lin', 'EmbResBlock', 'saved',
-           'DownBlock', 'UpBlock', 'EmbUNetModel', 'ddim_step', 'sample']
+__all__ = ['abar', 'inv_abar', 'noisify', 'timestep_embedding', 'pre_conv', 'upsample', 'lin', 'EmbResBlock', 'DownBlock',
+           'UpBlock', 'EmbUNetModel', 'ddim_step', 'ddim_schedule', 'sample']
 
 # %% ../nbs/28_diffusion-attn-nodownsave.ipynb 3
 from .imports import *
 
-from einops import rearrange
-from fastprogress import progress_bar
-
 # %% ../nbs/28_diffusion-attn-nodownsave.ipynb 6
 def abar(t): return (t*math.pi/2).cos()**2
 def inv_abar(x): return x.sqrt().acos()*2/math.pi
@@ -68,32 +65,21 @@ class EmbResBlock(nn.Module):
         x = self.conv2(x)
         return x + self.idconv(inp)
 
-# %% ../nbs/28_diffusion-attn-nodownsave.ipynb 16
-def saved(m, blk):
-    m_ = m.forward
-
-    @wraps(m.forward)
-    def _f(*args, **kwargs):
-        res = m_(*args, **kwargs)
-        blk.saved.append(res)
-        return res
-
-    m.forward = _f
-    return m
-
 # %% ../nbs/28_diffusion-attn-nodownsave.ipynb 17
 class DownBlock(nn.Module):
     def __init__(self, n_emb, ni, nf, add_down=True, num_layers=1):
         super().__init__()
-        self.resnets = nn.ModuleList([saved(EmbResBlock(n_emb, ni if i==0 else nf, nf), self)
+        self.resnets = nn.ModuleList([EmbResBlock(n_emb, ni if i==0 else nf, nf)
                                       for i in range(num_layers)])
         self.down = nn.Conv2d(nf, nf, 3, stride=2, padding=1) if add_down else nn.Identity()
 
     def forward(self, x, t):
-        self.saved = []
-        for resnet in self.resnets: x = resnet(x, t)
-        x = self.down(x)
-        return x
+        # The skip connections are returned rather than kept on the module, so the model is reentrant
+        skips = []
+        for resnet in self.resnets:
+            x = resnet(x, t)
+            skips.append(x)
+        return self.down(x), skips
 
 # %% ../nbs/28_diffusion-attn-nodownsave.ipynb 18
 class UpBlock(nn.Module):
@@ -140,35 +126,15 @@ class EmbUNetModel(nn.Module):
         temb = timestep_embedding(t, self.n_temb)
         emb = self.emb_mlp(temb)
         x = self.conv_in(x)
-        saved = [x]
-        for block in self.downs: x = block(x, emb)
-        saved += [p for o in self.downs for p in o.saved]
+        skips = [x]
+        for block in self.downs:
+            # The skips extend the list directly: a local name would keep those of the last block alive
+            x, skips[len(skips):] = block(x, emb)
         x = self.mid_block(x, emb)
-        for block in self.ups: x = block(x, emb, saved)
+        # Each up block pops the skips it uses, so they are freed as soon as they are consumed
+        for block in self.ups: x = block(x, emb, skips)
         return self.conv_out(x)
 
 # %% ../nbs/28_diffusion-attn-nodownsave.ipynb 26
-def ddim_step(x_t, noise, abar_t, abar_t1, bbar_t, bbar_t1, eta, sig, clamp=True):
-    sig = ((bbar_t1/bbar_t).sqrt() * (1-abar_t/abar_t1).sqrt()) * eta
-    x_0_hat = ((x_t-(1-abar_t).sqrt()*noise) / abar_t.sqrt())
-    if clamp: x_0_hat = x_0_hat.clamp(-1,1)
-    if bbar_t1<=sig**2+0.01: sig=0.  # set to zero if very small or NaN
-    x_t = abar_t1.sqrt()*x_0_hat + (bbar_t1-sig**2).sqrt()*noise
-    x_t += sig * torch.randn(x_t.shape).to(x_t)
-    return x_0_hat,x_t
-
-# %% ../nbs/28_diffusion-attn-nodownsave.ipynb 27
-@torch.no_grad()
-def sample(f, model, sz, steps, eta=1., clamp=True):
-    model.eval()
-    ts = torch.linspace(1-1/steps,0,steps)
-    x_t = torch.randn(sz).cuda()
-    preds = []
-    for i,t in enumerate(progress_bar(ts)):
-        t = t[None].cuda()
-        abar_t = abar(t)
-        noise = model((x_t, t))
-        abar_t1 = abar(t-1/steps) if t>=1/steps else torch.tensor(1)
-        x_0_hat,x_t = f(x_t, noise, abar_t, abar_t1, 1-abar_t, 1-abar_t1, eta, 1-((i+1)/100), clamp=clamp)
-        preds.append(x_0_hat.float().cpu())
-    return preds
+# The sampler is shared with the attention UNet of `minimalai.diffusion`, so the two never drift apart
+from .diffusion import ddim_step, ddim_schedule, sample
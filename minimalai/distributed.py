@@ -0,0 +1,367 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/19_minimalai-distributed.ipynb.
+
+# %% ../nbs/19_minimalai-distributed.ipynb 3
+from __future__ import annotations
+import os, socket
+from collections import defaultdict
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.utils.data import DataLoader
+from torch.utils.data.distributed import DistributedSampler
+
+from .datasets import *
+from .conv import *
+from .learner import *
+from .sgd import *
+
+# %% auto 0
+__all__ = ['is_main_process', 'broadcast_tensors', 'GradientBuckets', 'DistributedCallback', 'distributed_dataloaders',
+           'launch', 'ShardedOptimizer']
+
+# %% ../nbs/19_minimalai-distributed.ipynb 5
+def is_main_process():
+    '''
+    Whether this process is rank 0 (or training is not distributed), e.g. to only add a `ProgressCallback` there.
+    '''
+    return not (dist.is_available() and dist.is_initialized()) or dist.get_rank() == 0
+
+def broadcast_tensors(tensors, src=0, process_group=None):
+    '''
+    Overwrite `tensors` in place with their values on rank `src`, with one broadcast per dtype and device.
+
+    Args:
+    - tensors: Iterable of tensors (e.g. the parameters and buffers of a model).
+    - src (int): Rank whose values are broadcast (default: 0).
+    - process_group (optional): Process group of the broadcast (default: the whole world).
+    '''
+    groups = defaultdict(list)
+    for tensor in tensors:
+        groups[tensor.dtype, tensor.device].append(tensor)
+    for group in groups.values():
+        flat = torch.cat([t.detach().reshape(-1) for t in group])
+        dist.broadcast(flat, src, group=process_group)
+        offset = 0
+        for t in group:
+            t.detach().copy_(flat[offset:offset + t.numel()].view_as(t))
+            offset += t.numel()
+
+# %% ../nbs/19_minimalai-distributed.ipynb 8
+class GradientBuckets:
+    def __init__(self, model, bucket_size_mb=25, process_group=None):
+        '''
+        Average the gradients of `model` across processes, overlapping the all-reduce with the backward pass.
+
+        The parameters are grouped into buckets of about `bucket_size_mb` MB, in reverse order, which is
+        roughly the order in which their gradients are computed. As soon as every gradient of a bucket has
+        been accumulated, the bucket is flattened and its all-reduce is launched asynchronously, while
+        autograd keeps computing the gradients of the earlier layers.
+
+        Every process must compute gradients for the same parameters, in the same order.
+
+        Args:
+        - model (nn.Module): The model whose gradients are averaged.
+        - bucket_size_mb (float): Size of a bucket, in MB (default: 25).
+        - process_group (optional): Process group of the all-reduces (default: the whole world).
+        '''
+        self.process_group = process_group
+        self.buckets, bucket_bytes = [], 0
+        for param in reversed([p for p in model.parameters() if p.requires_grad]):
+            size = param.numel() * param.element_size()
+            last = self.buckets[-1] if self.buckets else None
+            if last is None or bucket_bytes + size > bucket_size_mb * 2**20 or \
+               (last[0].dtype, last[0].device) != (param.dtype, param.device):
+                self.buckets.append([])
+                bucket_bytes = 0
+            self.buckets[-1].append(param)
+            bucket_bytes += size
+        self._bucket_ids = {param: i for i, bucket in enumerate(self.buckets) for param in bucket}
+        self._buffers = [torch.empty(sum(p.numel() for p in bucket), dtype=bucket[0].dtype, device=bucket[0].device)
+                         for bucket in self.buckets]
+        self._reset()
+        self._handles = [p.register_post_accumulate_grad_hook(self._grad_ready) for p in self._bucket_ids]
+
+    def _reset(self):
+        self._num_ready = [0] * len(self.buckets)
+        self._works = [None] * len(self.buckets)
+
+    def _grad_ready(self, param):
+        i = self._bucket_ids[param]
+        self._num_ready[i] += 1
+        if self._num_ready[i] == len(self.buckets[i]):
+            self._launch(i)
+
+    def _launch(self, i):
+        buffer, offset = self._buffers[i], 0
+        for param in self.buckets[i]:
+            n = param.numel()
+            if param.grad is None:
+                buffer[offset:offset + n].zero_()
+            else:
+                buffer[offset:offset + n].copy_(param.grad.reshape(-1))
+            offset += n
+        self._works[i] = dist.all_reduce(buffer, group=self.process_group, async_op=True)
+
+    def synchronize(self):
+        '''
+        Wait for the all-reduces of the last backward pass and write the averaged gradients back.
+        '''
+        world_size = dist.get_world_size(self.process_group)
+        for i, work in enumerate(self._works):
+            # Buckets holding parameters without gradient are reduced now, in the same order on every process
+            if work is None:
+                self._launch(i)
+        for buffer, bucket, work in zip(self._buffers, self.buckets, self._works):
+            work.wait()
+            buffer.div_(world_size)
+            offset = 0
+            for param in bucket:
+                grad = buffer[offset:offset + param.numel()].view_as(param)
+                if param.grad is None:
+                    param.grad = grad.clone()
+                else:
+                    param.grad.copy_(grad)
+                offset += param.numel()
+        self._reset()
+
+    def remove(self):
+        '''
+        Remove the gradient hooks from the model.
+        '''
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+
+# %% ../nbs/19_minimalai-distributed.ipynb 11
+class DistributedCallback(Callback):
+    order = DeviceCallback.order + 1
+
+    def __init__(self, bucket_size_mb=25, broadcast_buffers=True, process_group=None):
+        '''
+        Callback training the model data-parallel across the processes of `torch.distributed`.
+
+        At the start of the fit, every process receives the weights of rank 0. The gradients are then
+        averaged across processes with `GradientBuckets` before each optimizer step, so every process
+        takes the same step. The `Learner` tells the samplers (e.g. the `DistributedSampler`s of
+        `distributed_dataloaders`) the epoch, so each epoch is shuffled differently.
+
+        Args:
+        - bucket_size_mb (float): Size of the gradient buckets, in MB (default: 25).
+        - broadcast_buffers (bool): Whether to copy the buffers of rank 0 (e.g. BatchNorm statistics) to the
+          other processes before each training batch (default: True).
+        - process_group (optional): Process group of the collectives (default: the whole world).
+        '''
+        self.bucket_size_mb, self.broadcast_buffers, self.process_group = bucket_size_mb, broadcast_buffers, process_group
+        self.buckets = None
+
+    def before_fit(self, learner):
+        '''
+        Synchronize the initial weights and install the gradient hooks.
+
+        Args:
+        - learner (Learner): The learner object.
+        '''
+        broadcast_tensors(list(learner.model.parameters()) + list(learner.model.buffers()), process_group=self.process_group)
+        self.buckets = GradientBuckets(learner.model, self.bucket_size_mb, self.process_group)
+
+    def before_batch(self, learner):
+        '''
+        Copy the buffers of rank 0 to every process before a training batch.
+
+        Args:
+        - learner (Learner): The learner object.
+        '''
+        buffers = list(learner.model.buffers())
+        if self.broadcast_buffers and learner.training and buffers:
+            broadcast_tensors(buffers, process_group=self.process_group)
+
+    def after_backward(self, learner):
+        '''
+        Wait for the gradients to be averaged across processes, before the optimizer step.
+
+        Args:
+        - learner (Learner): The learner object.
+        '''
+        self.buckets.synchronize()
+
+    def cleanup_fit(self, learner):
+        '''
+        Remove the gradient hooks.
+
+        Args:
+        - learner (Learner): The learner object.
+        '''
+        if self.buckets is not None:
+            self.buckets.remove()
+            self.buckets = None
+
+# %% ../nbs/19_minimalai-distributed.ipynb 14
+def distributed_dataloaders(dataset_dict, batch_size, collate_fn=None, seed=0, drop_last=False, **kwargs):
+    '''
+    Create DataLoaders giving each process its own share of the datasets, through `DistributedSampler`s.
+
+    The validation sampler pads its share with repeated items when the dataset does not divide evenly
+    between the processes, so the reduced metrics can count a few items twice.
+
+    Args:
+    - dataset_dict: Dictionary of datasets with keys 'train' and 'valid'.
+    - batch_size: Batch size of each process for the training dataloader (the validation one uses twice that).
+    - collate_fn (optional): Collate function (default: `collate_dict` for Hugging Face datasets, else `default_collate`).
+    - seed (int): Seed of the training shuffle, which must be the same on every process (default: 0).
+    - drop_last (bool): Whether to drop the tail of the training set that does not divide evenly (default: False).
+    - **kwargs: Additional keyword arguments for the dataloaders.
+
+    Returns:
+    - DataLoaders: DataLoaders object with train and valid dataloaders.
+    '''
+    train_ds, valid_ds = list(dataset_dict.values())[:2]
+    if collate_fn is None and hasattr(train_ds, 'features'):
+        collate_fn = collate_dict(train_ds)
+    train_sampler = DistributedSampler(train_ds, shuffle=True, seed=seed, drop_last=drop_last)
+    valid_sampler = DistributedSampler(valid_ds, shuffle=False)
+    return DataLoaders(DataLoader(train_ds, batch_size, sampler=train_sampler, collate_fn=collate_fn, **kwargs),
+                       DataLoader(valid_ds, batch_size*2, sampler=valid_sampler, collate_fn=collate_fn, **kwargs))
+
+# %% ../nbs/19_minimalai-distributed.ipynb 17
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _worker(rank, function, num_processes, backend, port, num_threads, args):
+    os.environ.update(MASTER_ADDR='127.0.0.1', MASTER_PORT=str(port))
+    torch.set_num_threads(num_threads)
+    dist.init_process_group(backend, rank=rank, world_size=num_processes)
+    try:
+        function(rank, num_processes, *args)
+    finally:
+        dist.destroy_process_group()
+
+def launch(function, num_processes, *args, backend='gloo', num_threads=None):
+    '''
+    Run `function(rank, num_processes, *args)` in `num_processes` local processes joined in a process group.
+
+    Each process gets an equal share of the CPU cores for its intra-op threads. `function` must be
+    defined at the top level of a module (not in a notebook cell), so the spawned processes can import it.
+
+    Args:
+    - function: The function to run, typically creating `distributed_dataloaders`, a `Learner` with a
+      `DistributedCallback`, and fitting it.
+    - num_processes (int): Number of processes.
+    - *args: Additional arguments for `function`.
+    - backend (str): Backend of `torch.distributed` (default: 'gloo', which runs on CPU).
+    - num_threads (int, optional): Threads per process (default: the CPU cores divided between the processes).
+    '''
+    num_threads = num_threads or max(1, (os.cpu_count() or 1) // num_processes)
+    mp.spawn(_worker, args=(function, num_processes, backend, _free_port(), num_threads, args), nprocs=num_processes)
+
+# %% ../nbs/19_minimalai-distributed.ipynb 21
+class ShardedOptimizer:
+    def __init__(self, parameters, learning_rate, optimizer_function=Adam, process_group=None, **kwargs):
+        '''
+        Optimizer whose state is sharded across the processes of `torch.distributed` (as in ZeRO stage 1).
+
+        The parameters and their gradients are moved (per dtype and device) into flat buffers, which they
+        become views of, and each buffer is split into N equal slices, one per process. Each process runs
+        `optimizer_function` on its slice alone, so the optimizer state (e.g. the moments of `Adam`) takes
+        about 1/N of the memory, and nothing else is copied: the slices are views of the buffers. At each step,
+        every process updates its slice with the (already averaged) gradients, then the slices are all-gathered
+        straight into the parameters. The optimizers of `minimalai.sgd` and `torch.optim` work elementwise, so
+        the result is the same as without sharding. Use it with a `DistributedCallback`, e.g.
+        `optimizer_function=partial(ShardedOptimizer, optimizer_function=RMSProp)`.
+
+        Args:
+        - parameters (iterable): Iterable of parameters to optimize.
+        - learning_rate (float): The learning rate.
+        - optimizer_function: Optimizer applied to the slice of this process, from `minimalai.sgd` or
+          `torch.optim` (default: `Adam`).
+        - process_group (optional): Process group sharing the optimizer (default: the whole world).
+        - **kwargs: Additional keyword arguments for `optimizer_function`.
+        '''
+        self.params = list(parameters)
+        self.process_group = process_group
+        world_size, rank = dist.get_world_size(process_group), dist.get_rank(process_group)
+        groups = defaultdict(list)
+        for param in self.params:
+            groups[param.dtype, param.device].append(param)
+        self.groups = []
+        with torch.no_grad():
+            for (dtype, device), params in groups.items():
+                # Slices are padded to the same size, as all_gather needs equal sizes
+                shard_size = -(-sum(p.numel() for p in params) // world_size)
+                flat = torch.zeros(shard_size * world_size, dtype=dtype, device=device)
+                flat_grad = torch.zeros_like(flat)
+                grads, offset = [], 0
+                for param in params:
+                    view = flat[offset:offset + param.numel()].view_as(param)
+                    view.copy_(param)
+                    param.data = view
+                    grads.append(flat_grad[offset:offset + param.numel()].view_as(param))
+                    if param.grad is not None:
+                        grads[-1].copy_(param.grad)
+                    param.grad = grads[-1]
+                    offset += param.numel()
+                slices = list(flat.chunk(world_size))
+                shard = slices[rank]
+                shard.grad = flat_grad.chunk(world_size)[rank]
+                self.groups.append({'params': params, 'grads': grads, 'shard': shard, 'slices': slices,
+                                    'padding': flat.numel() - offset})
+        self.optimizer = optimizer_function([g['shard'] for g in self.groups], learning_rate, **kwargs)
+
+    @property
+    def lr(self):
+        '''The learning rate of the optimizer.'''
+        return self.optimizer.lr if hasattr(self.optimizer, 'lr') else self.param_groups[0]['lr']
+
+    @lr.setter
+    def lr(self, value):
+        if hasattr(self.optimizer, 'lr'):
+            self.optimizer.lr = value
+        for group in getattr(self.optimizer, 'param_groups', []):
+            group['lr'] = value
+
+    @property
+    def param_groups(self):
+        '''Parameter groups of a `torch.optim` optimizer (used by the learning rate schedulers).'''
+        return self.optimizer.param_groups
+
+    def _bind_grads(self, group):
+        # Gradients that were replaced (or set to None) since the last step are moved back into the flat buffer
+        for param, grad in zip(group['params'], group['grads']):
+            if param.grad is None:
+                grad.zero_()
+            elif param.grad.data_ptr() != grad.data_ptr():
+                grad.copy_(param.grad)
+            param.grad = grad
+
+    def step(self):
+        '''
+        Update the slice of this process, then all-gather the slices into the parameters.
+        '''
+        with torch.no_grad():
+            for group in self.groups:
+                self._bind_grads(group)
+            self.optimizer.step()
+            for group in self.groups:
+                # The parameters are views of the outputs; the slice of this process, one of them, is sent from a copy
+                dist.all_gather(group['slices'], group['shard'].clone(), group=self.process_group)
+
+    def zero_grad(self):
+        '''Clears the gradients of all parameters (every process receives the gradients of every parameter).'''
+        # The gradients are views of the flat buffers, so they are zeroed in place (views cannot be detached in place)
+        for param in self.params:
+            if param.grad is not None:
+                param.grad.zero_()
+
+    def state_nbytes(self):
+        '''
+        Size in bytes of the memory held by this process on top of the parameters and gradients of the model:
+        the optimizer state of its slice, and the padding of the flat buffers.
+        '''
+        shards = [g['shard'] for g in self.groups]
+        tensors = [v for shard in shards for v in vars(shard).values() if isinstance(v, torch.Tensor)]
+        for state in getattr(self.optimizer, 'state', {}).values():
+            tensors += [v for v in state.values() if isinstance(v, torch.Tensor)]
+        padding = sum(2 * g['padding'] * g['shard'].element_size() for g in self.groups)
+        return sum(t.numel() * t.element_size() for t in tensors) + padding
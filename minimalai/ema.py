@@ -0,0 +1,168 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/17_minimalai-ema.ipynb.
+
+# %% ../nbs/17_minimalai-ema.ipynb 3
+from __future__ import annotations
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import torch
+
+from .learner import *
+
+# %% auto 0
+__all__ = ['EMACallback']
+
+# %% ../nbs/17_minimalai-ema.ipynb 5
+class EMACallback(Callback):
+    order = DeviceCallback.order + 1
+
+    def __init__(self, decay=0.999, every=1, buffers=True, background=False, validate=True):
+        '''
+        Callback keeping an exponential moving average (EMA) of the model weights during training.
+
+        The shadow weights are views into one flat tensor per dtype and device, and are updated by a single
+        multi-tensor `torch._foreach_lerp_` call every `every` optimizer steps (with the decay adjusted, so the
+        averaging horizon does not depend on `every`). The update can run in the background, on a side CUDA
+        stream or (on the CPU) a worker thread; it is joined before the next optimizer step modifies the weights.
+
+        The EMA weights are swapped into the model by exchanging tensor storages, without copying, during
+        validation (if `validate`) and inside `with ema.swapped():`, e.g. to sample from a diffusion model.
+
+        Args:
+        - decay (float): Decay of the average per optimizer step (default: 0.999).
+        - every (int): Number of optimizer steps between updates (default: 1).
+        - buffers (bool): Whether to also average the floating point buffers, e.g. BatchNorm statistics (default: True).
+        - background (bool): Whether to update the average on a side stream or thread (default: False).
+        - validate (bool): Whether to validate with the EMA weights (default: True).
+        '''
+        self.decay, self.every, self.buffers, self.background, self.validate = decay, every, buffers, background, validate
+        self.model, self.is_swapped = None, False
+        self._pending, self._executor, self._stream = None, None, None
+
+    def _tensors(self, model):
+        tensors = list(model.parameters())
+        if self.buffers:
+            tensors += [b for b in model.buffers() if b.is_floating_point()]
+        return tensors
+
+    def before_fit(self, learner):
+        '''
+        Create the shadow weights from the current weights (or keep them, if this callback was already fitted on the model).
+
+        Args:
+        - learner (Learner): The learner object.
+        '''
+        if self.model is learner.model:
+            return
+        self.model, self.num_steps = learner.model, 0
+        self.weights = self._tensors(learner.model)
+        self.num_params = len(list(learner.model.parameters()))
+        groups = defaultdict(list)
+        for i, w in enumerate(self.weights):
+            groups[w.dtype, w.device].append(i)
+        self.shadow = [None] * len(self.weights)
+        self.flat = []
+        for (dtype, device), ids in groups.items():
+            flat = torch.cat([self.weights[i].detach().reshape(-1) for i in ids])
+            self.flat.append(flat)
+            offset = 0
+            for i in ids:
+                n = self.weights[i].numel()
+                self.shadow[i] = flat[offset:offset + n].view_as(self.weights[i])
+                offset += n
+
+    def update(self):
+        '''
+        Move the shadow weights towards the current weights, in one fused multi-tensor operation.
+        '''
+        weight = 1 - self.decay ** self.every
+        weights = [w.detach() for w in self.weights]
+        if not self.background or not weights:
+            torch._foreach_lerp_(self.shadow, weights, weight)
+            return
+        # Buffers are modified by the next forward pass, so only the parameters are averaged in the background
+        n = self.num_params
+        if n < len(weights):
+            torch._foreach_lerp_(self.shadow[n:], weights[n:], weight)
+        device = weights[0].device
+        if device.type == 'cuda':
+            # The side stream waits for the optimizer step, and the next step waits for the side stream (in `join`)
+            self._stream = self._stream or torch.cuda.Stream(device)
+            self._stream.wait_stream(torch.cuda.current_stream(device))
+            with torch.cuda.stream(self._stream):
+                torch._foreach_lerp_(self.shadow[:n], weights[:n], weight)
+            self._pending = self._stream
+        else:
+            self._executor = self._executor or ThreadPoolExecutor(1)
+            self._pending = self._executor.submit(torch._foreach_lerp_, self.shadow[:n], weights[:n], weight)
+
+    def join(self):
+        '''
+        Wait for a background update to finish reading the weights.
+        '''
+        if self._pending is None:
+            return
+        if isinstance(self._pending, torch.cuda.Stream):
+            torch.cuda.current_stream(self._pending.device).wait_stream(self._pending)
+        else:
+            self._pending.result()
+        self._pending = None
+
+    def after_backward(self, learner):
+        '''
+        Join the background update before the optimizer step modifies the weights.
+        '''
+        self.join()
+
+    def after_step(self, learner):
+        '''
+        Update the average every `every` optimizer steps.
+        '''
+        self.num_steps += 1
+        if self.num_steps % self.every == 0:
+            self.update()
+
+    def swap(self):
+        '''
+        Exchange the model weights and the EMA weights, by swapping their storages (no copy).
+        '''
+        self.join()
+        with torch.no_grad():
+            for w, s in zip(self.weights, self.shadow):
+                w.data, s.data = s.data, w.data
+        self.is_swapped = not self.is_swapped
+
+    @contextmanager
+    def swapped(self):
+        '''
+        Context manager using the EMA weights in the model, e.g. for sampling, then restoring the training weights.
+        '''
+        if self.is_swapped:
+            yield self.model
+            return
+        self.swap()
+        try:
+            yield self.model
+        finally:
+            self.swap()
+
+    def before_epoch(self, learner):
+        '''
+        Swap in the EMA weights for validation.
+        '''
+        if self.validate and not learner.training and not self.is_swapped:
+            self.swap()
+
+    def cleanup_epoch(self, learner):
+        '''
+        Restore the training weights after validation.
+        '''
+        if self.is_swapped:
+            self.swap()
+
+    def cleanup_fit(self, learner):
+        '''
+        Wait for the last update.
+        '''
+        self.join()
@@ -4,34 +4,17 @@
 __all__ = ['ImageEval']
 
 # %% ../nbs/18_fid.ipynb 2
-import pickle,gzip,math,os,time,shutil,torch,random
-import fastcore.all as fc,matplotlib as mpl,numpy as np,matplotlib.pyplot as plt
-from collections.abc import Mapping
-from pathlib import Path
-from operator import attrgetter,itemgetter
-from functools import partial
-from copy import copy
-from contextlib import contextmanager
-from scipy import linalg
+import math,torch
+import fastcore.all as fc
+from torch import tensor
 
-from fastcore.foundation import L
-import torchvision.transforms.functional as TF,torch.nn.functional as F
-from torch import tensor,nn,optim
-from torch.utils.data import DataLoader,default_collate
-from torch.nn import init
-from torch.optim import lr_scheduler
-from torcheval.metrics import MulticlassAccuracy
-from datasets import load_dataset,load_dataset_builder
+from .datasets import *
+from .learner import *
+from .augment import *
+from .lazy import *
 
-from miniai.datasets import *
-from miniai.conv import *
-from miniai.learner import *
-from miniai.activations import *
-from miniai.init import *
-from miniai.sgd import *
-from miniai.resnet import *
-from miniai.augment import *
-from miniai.accel import *
+# scipy is only imported when a FID is first computed
+linalg = lazy_import('scipy.linalg')
 
 # %% ../nbs/18_fid.ipynb 27
 def _sqrtm_newton_schulz(mat, num_iters=100):
@@ -83,12 +66,12 @@ def _calc_kid(x, y, maxs=50):
 # %% ../nbs/18_fid.ipynb 35
 class ImageEval:
     def __init__(self, model, dls, cbs=None):
-        self.learn = TrainLearner(model, dls, loss_func=fc.noop, cbs=cbs, opt_func=None)
+        self.learn = TrainLearner(model, dls, loss_function=fc.noop, callbacks=cbs, optimizer_function=None)
         self.feats = self.learn.capture_preds()[0].float().cpu().squeeze()
         self.stats = _calc_stats(self.feats)
 
     def get_feats(self, samp):
-        self.learn.dls = DataLoaders([],[(samp, tensor([0]))])
+        self.learn.data_loaders = DataLoaders([],[(samp, tensor([0]))])
         return self.learn.capture_preds()[0].float().cpu().squeeze()
 
     def fid(self, samp): return _calc_fid(*self.stats, *_calc_stats(self.get_feats(samp)))
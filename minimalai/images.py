@@ -0,0 +1,171 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_minimalai-image-folder.ipynb.
+
+# %% ../nbs/05_minimalai-image-folder.ipynb 3
+from __future__ import annotations
+import os, hashlib, threading
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import torchvision.transforms.functional as TF
+from torchvision.io import read_image, ImageReadMode
+
+# %% auto 0
+__all__ = ['image_extensions', 'LRUTensorCache', 'ImageFolderDataset']
+
+# %% ../nbs/05_minimalai-image-folder.ipynb 5
+class LRUTensorCache:
+    def __init__(self, max_bytes):
+        '''
+        A thread-safe least-recently-used cache of tensors, bounded by their total size in bytes.
+
+        Args:
+        - max_bytes (int): Byte budget of the cache. The least recently used tensors are evicted beyond it.
+        '''
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        '''
+        Return the tensor cached under `key` (marking it as recently used), or None.
+        '''
+        with self._lock:
+            tensor = self._items.get(key)
+            if tensor is not None:
+                self._items.move_to_end(key)
+            return tensor
+
+    def put(self, key, tensor):
+        '''
+        Cache `tensor` under `key`, evicting the least recently used tensors to stay within the budget.
+        '''
+        size = self._nbytes(tensor)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._nbytes(self._items.pop(key))
+            while self._items and self.nbytes + size > self.max_bytes:
+                self.nbytes -= self._nbytes(self._items.popitem(last=False)[1])
+            self._items[key] = tensor
+            self.nbytes += size
+
+    @staticmethod
+    def _nbytes(tensor):
+        return tensor.numel() * tensor.element_size()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+# %% ../nbs/05_minimalai-image-folder.ipynb 8
+image_extensions = ('.jpg', '.jpeg', '.png')
+
+class ImageFolderDataset:
+    def __init__(self, path, size=None, mode=ImageReadMode.RGB, transform=None, cache_bytes=2**30, disk_cache=None,
+                 num_threads=8, extensions=image_extensions):
+        '''
+        A dataset of the images in the class subfolders of `path`, with cached decoding.
+
+        Decoded and resized images are kept as uint8 tensors in an in-process `LRUTensorCache`, and optionally
+        saved to `disk_cache`, so only the first epoch pays for decoding JPEG/PNG files. Each `DataLoader`
+        worker holds its own in-process cache, so use `persistent_workers=True` to keep them across epochs.
+        Batches requested through `__getitems__` are decoded by a thread pool.
+
+        Args:
+        - path: Root folder, with one subfolder of images per class.
+        - size (optional): Size the images are resized to (int or (height, width)), needed to batch images of different sizes.
+        - mode: `ImageReadMode` used to decode the images (default: RGB).
+        - transform (optional): Function applied to a copy of the cached uint8 image on every access (e.g. augmentation).
+        - cache_bytes: Byte budget of the in-process cache (default: 1 GiB).
+        - disk_cache (optional): Folder storing the preprocessed tensors across runs.
+        - num_threads: Number of decoding threads (default: 8).
+        - extensions: File extensions of the images (default: `image_extensions`).
+        '''
+        self.path = Path(path)
+        self.files = sorted(f for f in self.path.rglob('*') if f.suffix.lower() in extensions)
+        self.classes = sorted({f.parent.name for f in self.files})
+        class_ids = {c: i for i, c in enumerate(self.classes)}
+        self.labels = [class_ids[f.parent.name] for f in self.files]
+        self.size, self.mode, self.transform = size, mode, transform
+        self.cache_bytes, self.num_threads = cache_bytes, num_threads
+        self.disk_cache = Path(disk_cache) if disk_cache is not None else None
+        self.cache = LRUTensorCache(cache_bytes)
+        self._pool, self._pool_pid = None, None
+
+    def __getstate__(self):
+        # Every worker process starts with its own empty cache and thread pool
+        return {**self.__dict__, 'cache': None, '_pool': None}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache = LRUTensorCache(self.cache_bytes)
+
+    def __len__(self):
+        return len(self.files)
+
+    def _disk_cache_path(self, index):
+        file = self.files[index]
+        stat = file.stat()
+        key = hashlib.sha1(f'{file}:{stat.st_mtime_ns}:{stat.st_size}:{self.size}:{self.mode}'.encode()).hexdigest()
+        return self.disk_cache/key[:2]/f'{key}.pt'
+
+    def _decode(self, index):
+        image = read_image(str(self.files[index]), self.mode)
+        if self.size is not None:
+            image = TF.resize(image, self.size, antialias=True)
+        return image
+
+    def load_image(self, index):
+        '''
+        Return the decoded and resized uint8 image at `index`, from the in-process cache, the disk cache, or the file.
+
+        The tensor is the cached one: copy it before modifying it.
+        '''
+        image = self.cache.get(index)
+        if image is not None:
+            return image
+        if self.disk_cache is None:
+            image = self._decode(index)
+        else:
+            cache_path = self._disk_cache_path(index)
+            if cache_path.exists():
+                image = torch.load(cache_path)
+            else:
+                image = self._decode(index)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}-{threading.get_ident()}')
+                torch.save(image, tmp_path)
+                os.replace(tmp_path, cache_path)
+        self.cache.put(index, image)
+        return image
+
+    def _item(self, index, image):
+        if self.transform is not None:
+            # Augmentations such as `random_erase` work in place, and must not alter the cached image
+            image = self.transform(image.clone())
+        return image, self.labels[index]
+
+    def __getitem__(self, index):
+        return self._item(index, self.load_image(index))
+
+    def __getitems__(self, indices):
+        '''
+        Load a whole batch, decoding the images that are not cached in a thread pool.
+
+        Args:
+        - indices: Indices of the items in the batch.
+
+        Returns:
+        - list: (image, label) tuples, ready for `default_collate`.
+        '''
+        # Forked `DataLoader` workers inherit the pool object but not its threads, so create one per process
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool, self._pool_pid = ThreadPoolExecutor(self.num_threads), os.getpid()
+        indices = [int(i) for i in indices]
+        return [self._item(i, image) for i, image in zip(indices, self._pool.map(self.load_image, indices))]
@@ -1,27 +1,31 @@
-import torch, random, datasets, math, fastcore.all as fc, numpy as np, matplotlib as mpl, matplotlib.pyplot as plt
-import torchvision.transforms as T
-import torchvision.transforms.functional as TF,torch.nn.functional as F
+import torch, random, math, fastcore.all as fc, numpy as np
+import torch.nn.functional as F
 
 from torch.utils.data import DataLoader,default_collate
 from pathlib import Path
 from torch import nn,tensor
 from torch.nn import init
 from fastcore.foundation import L
-from datasets import load_dataset
 from operator import itemgetter,attrgetter
 from functools import partial,wraps
 from torch.optim import lr_scheduler
 from torch import optim
-from torchvision.io import read_image,ImageReadMode
 
-from miniai.datasets import *
-from miniai.conv import *
-from miniai.learner import *
-from miniai.activations import *
-from miniai.init import *
-from miniai.sgd import *
-from miniai.resnet import *
-from miniai.augment import *
-from miniai.accel import *
-from miniai.training import *
+from .lazy import *
 
+# torchvision, Hugging Face datasets and matplotlib take seconds to import, so they are only loaded on first use
+T, TF = lazy_import('torchvision.transforms'), lazy_import('torchvision.transforms.functional')
+datasets, mpl, plt = lazy_import('datasets'), lazy_import('matplotlib'), lazy_import('matplotlib.pyplot')
+load_dataset = lazy_callable('datasets', 'load_dataset')
+read_image = lazy_callable('torchvision.io', 'read_image')
+
+from .datasets import *
+from .conv import *
+from .learner import *
+from .activations import *
+from .init import *
+from .sgd import *
+from .resnet import *
+from .augment import *
+from .accel import *
+from .training import *
@@ -0,0 +1,158 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/20_minimalai-inference.ipynb.
+
+# %% ../nbs/20_minimalai-inference.ipynb 3
+from __future__ import annotations
+import time, statistics
+from copy import deepcopy
+
+import torch
+from torch import nn
+
+# %% auto 0
+__all__ = ['fold_conv_bn', 'fold_batchnorm', 'check_equivalence', 'benchmark_latency', 'export_for_inference']
+
+# %% ../nbs/20_minimalai-inference.ipynb 5
+_conv_types = (nn.Conv1d, nn.Conv2d, nn.Conv3d, nn.Linear)
+_bn_types = (nn.BatchNorm1d, nn.BatchNorm2d, nn.BatchNorm3d)
+
+def fold_conv_bn(conv, bn):
+    '''
+    Return a copy of `conv` whose weights and bias include the (evaluation mode) BatchNorm `bn` that follows it.
+
+    Args:
+    - conv (nn.Conv1d, nn.Conv2d, nn.Conv3d or nn.Linear): The layer feeding `bn`.
+    - bn (nn.BatchNorm1d, nn.BatchNorm2d or nn.BatchNorm3d): The BatchNorm layer, with running statistics.
+
+    Returns:
+    - nn.Module: The folded layer, with a bias.
+    '''
+    with torch.no_grad():
+        scale = (bn.running_var + bn.eps).rsqrt()
+        if bn.affine:
+            scale = scale * bn.weight
+        bias = conv.bias if conv.bias is not None else torch.zeros_like(bn.running_mean)
+        bias = (bias - bn.running_mean) * scale
+        if bn.affine:
+            bias = bias + bn.bias
+        folded = deepcopy(conv)
+        folded.weight.copy_(conv.weight * scale.reshape(-1, *([1] * (conv.weight.dim() - 1))))
+        folded.bias = nn.Parameter(bias.to(conv.weight.dtype))
+    return folded
+
+def _can_fold(layer, bn):
+    if not (isinstance(layer, _conv_types) and isinstance(bn, _bn_types)):
+        return False
+    out_features = layer.out_features if isinstance(layer, nn.Linear) else layer.out_channels
+    return bn.track_running_stats and bn.running_mean is not None and out_features == bn.num_features
+
+# %% ../nbs/20_minimalai-inference.ipynb 7
+def _fold_sequential(seq):
+    layers = []
+    for layer in seq:
+        if isinstance(layer, nn.Identity):
+            continue
+        if layers and _can_fold(layers[-1], layer):
+            layers[-1] = fold_conv_bn(layers[-1], layer)
+        else:
+            layers.append(layer)
+    if not layers:
+        return nn.Identity()
+    # A single layer is used directly, to save a level of module calls
+    return layers[0] if len(layers) == 1 else nn.Sequential(*layers)
+
+def fold_batchnorm(model):
+    '''
+    Fold every BatchNorm that directly follows a convolution (or linear layer) in an `nn.Sequential` into it.
+
+    The BatchNorm layers are removed, `nn.Identity` layers are dropped, and sequences left with a single
+    layer are replaced by that layer. This covers `init.conv_layer`, `init.get_model` and the convolutions
+    inside `resnet.ResBlock`. `model` itself is left unchanged.
+
+    Args:
+    - model (nn.Module): The trained model.
+
+    Returns:
+    - nn.Module: An equivalent model in evaluation mode.
+    '''
+    model = deepcopy(model).eval()
+
+    def _fold(module):
+        for name, child in module.named_children():
+            _fold(child)
+            if isinstance(child, nn.Sequential):
+                setattr(module, name, _fold_sequential(child))
+
+    _fold(model)
+    return _fold_sequential(model) if isinstance(model, nn.Sequential) else model
+
+# %% ../nbs/20_minimalai-inference.ipynb 10
+def check_equivalence(model, exported, inputs, atol=1e-4, rtol=1e-4):
+    '''
+    Check that `exported` computes the same outputs as `model` (in evaluation mode) on `inputs`.
+
+    Args:
+    - model (nn.Module): The reference model.
+    - exported (nn.Module): The model to check.
+    - inputs (torch.Tensor): A batch of inputs.
+    - atol, rtol (float): Absolute and relative tolerances (default: 1e-4).
+
+    Returns:
+    - float: The largest absolute difference between the outputs.
+    '''
+    training = model.training
+    model.eval()
+    try:
+        with torch.inference_mode():
+            expected, actual = model(inputs), exported(inputs)
+    finally:
+        model.train(training)
+    difference = (expected.float() - actual.float()).abs().max().item()
+    if not torch.allclose(expected.float(), actual.float(), atol=atol, rtol=rtol):
+        raise AssertionError(f'The exported model differs from the original by up to {difference:.3g}')
+    return difference
+
+def benchmark_latency(model, inputs, warmup=5, runs=20):
+    '''
+    Measure the median time of a forward pass of `model` on `inputs`, in inference mode.
+
+    Args:
+    - model (nn.Module): The model, in evaluation mode.
+    - inputs (torch.Tensor): A batch of inputs, on the device of the model.
+    - warmup (int): Number of untimed forward passes first (default: 5).
+    - runs (int): Number of timed forward passes (default: 20).
+
+    Returns:
+    - float: Median latency in seconds.
+    '''
+    def _sync():
+        if inputs.device.type == 'cuda':
+            torch.cuda.synchronize(inputs.device)
+
+    times = []
+    with torch.inference_mode():
+        for i in range(warmup + runs):
+            _sync()
+            start = time.perf_counter()
+            model(inputs)
+            _sync()
+            if i >= warmup:
+                times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+# %% ../nbs/20_minimalai-inference.ipynb 13
+def export_for_inference(model, example_inputs=None, atol=1e-4, rtol=1e-4):
+    '''
+    Build an inference version of `model` with `fold_batchnorm`, checked against the original on `example_inputs`.
+
+    Args:
+    - model (nn.Module): The trained model.
+    - example_inputs (torch.Tensor, optional): A batch of inputs for `check_equivalence`.
+    - atol, rtol (float): Tolerances of the check (default: 1e-4).
+
+    Returns:
+    - nn.Module: The exported model, in evaluation mode.
+    '''
+    exported = fold_batchnorm(model)
+    if example_inputs is not None:
+        check_equivalence(model, exported, example_inputs, atol=atol, rtol=rtol)
+    return exported
@@ -7,8 +7,6 @@ __all__ = ['clean_ipython_history', 'clean_traceback', 'clean_memory', 'BatchTra
 # %% ../nbs/11_minimalai-initialization.ipynb 3
 import pickle, gzip, math, os, time, shutil
 import numpy as np
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import sys,gc,traceback
 from collections.abc import Mapping
 from pathlib import Path
@@ -18,19 +16,19 @@ from copy import copy
 from contextlib import contextmanager
 
 import torch
-import torchvision.transforms.functional as TF
 import torch.nn.functional as F
 from torch import tensor, nn, optim
 from torch.utils.data import DataLoader, default_collate
 from torch.nn import init
-from torcheval.metrics import MulticlassAccuracy
-from datasets import load_dataset, load_dataset_builder
 
 import fastcore.all as fc
 from .datasets import *
 from .conv import *
 from .learner import *
 from .activations import *
+from .lazy import *
+
+mpl, plt = lazy_import('matplotlib'), lazy_import('matplotlib.pyplot')
 
 # %% ../nbs/11_minimalai-initialization.ipynb 14
 def clean_ipython_history():
@@ -0,0 +1,177 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_minimalai-lazy-imports.ipynb.
+
+# %% ../nbs/05_minimalai-lazy-imports.ipynb 3
+from __future__ import annotations
+import os, sys, types, inspect, functools, importlib, subprocess, threading
+import fastcore.all as fc
+
+# %% auto 0
+__all__ = ['LazyModule', 'lazy_import', 'lazy_callable', 'LazyDelegates', 'lazy_delegates', 'import_time', 'check_import_time']
+
+# %% ../nbs/05_minimalai-lazy-imports.ipynb 5
+class LazyModule:
+    def __init__(self, name):
+        '''
+        A stand-in for a module that is only imported when one of its attributes is first accessed.
+
+        Args:
+        - name (str): Full name of the module (e.g. 'matplotlib.pyplot').
+        '''
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        '''
+        Import the module (once) and return it.
+        '''
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self.__dict__['_module'] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    '''
+    Return the module `name` if it is already imported, else a `LazyModule` importing it on first use.
+
+    Args:
+    - name (str): Full name of the module.
+
+    Returns:
+    - module or LazyModule: The module, or its lazy stand-in.
+    '''
+    return sys.modules.get(name) or LazyModule(name)
+
+# %% ../nbs/05_minimalai-lazy-imports.ipynb 7
+def lazy_callable(module, name):
+    '''
+    Return a function calling `module.name`, importing `module` on the first call.
+
+    This replaces `from module import name` for functions and classes that are only called or
+    instantiated (e.g. `progress_bar` or `load_dataset`), not used with `isinstance` or subclassed.
+
+    Args:
+    - module (str): Full name of the module.
+    - name (str): Name of the function or class in the module.
+
+    Returns:
+    - function: The lazy wrapper.
+    '''
+    def _call(*args, **kwargs):
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+    _call.__name__ = _call.__qualname__ = name
+    _call.__doc__ = f'Lazy wrapper of `{module}.{name}`, imported on the first call.'
+    return _call
+
+# %% ../nbs/05_minimalai-lazy-imports.ipynb 8
+class LazyDelegates:
+    def __init__(self, function, to, keep=False):
+        '''
+        Wrap `function` so that, as with `fc.delegates`, its signature lists the arguments of `to()` in place
+        of `**kwargs`. The signature is only built when first requested, so `to` can live in a module that
+        is not imported yet (e.g. `lambda: plt.subplots`).
+
+        Args:
+        - function (function): The function taking `**kwargs`.
+        - to (function): Function without arguments returning the delegatee.
+        - keep (bool): Whether to keep `**kwargs` in the signature (default: False).
+        '''
+        functools.update_wrapper(self, function)
+        self._to, self._keep, self._signature = to, keep, None
+
+    def __call__(self, *args, **kwargs):
+        return self.__wrapped__(*args, **kwargs)
+
+    def __get__(self, instance, owner=None):
+        # Behave like a function when set on a class (e.g. with `fc.patch`)
+        return self if instance is None else types.MethodType(self, instance)
+
+    def __getattr__(self, attr):
+        # Other function attributes (`__code__`, `__defaults__`...) are those of the wrapped function
+        try:
+            function = self.__dict__['__wrapped__']
+        except KeyError:
+            raise AttributeError(attr) from None
+        return getattr(function, attr)
+
+    @property
+    def __signature__(self):
+        if self._signature is None:
+            try:
+                to = self._to()
+            # Without the optional dependency, the function keeps its own signature
+            except ImportError:
+                return inspect.signature(self.__wrapped__)
+            self._signature = inspect.signature(fc.delegates(to, keep=self._keep)(self.__wrapped__))
+        return self._signature
+
+def lazy_delegates(to, keep=False):
+    '''
+    Lazy version of `fc.delegates`, which does not import the delegatee when the function is defined.
+
+    Args:
+    - to (function): Function without arguments returning the delegatee.
+    - keep (bool): Whether to keep `**kwargs` in the signature (default: False).
+
+    Returns:
+    - function: Decorator returning a `LazyDelegates`.
+    '''
+    return lambda function: LazyDelegates(function, to, keep)
+
+# %% ../nbs/05_minimalai-lazy-imports.ipynb 10
+def import_time(module, runs=3):
+    '''
+    Measure the time taken to import `module` in fresh interpreters.
+
+    Args:
+    - module (str): Full name of the module.
+    - runs (int): Number of interpreters started; the fastest run is kept (default: 3).
+
+    Returns:
+    - float: Import time in seconds.
+    '''
+    code = f'import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)'
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=os.environ.copy())
+        if result.returncode:
+            raise ImportError(f'Importing {module} failed:\n{result.stderr}')
+        times.append(float(result.stdout.split()[-1]))
+    return min(times)
+
+def check_import_time(module='minimalai.learner', budget=1.0, baseline='torch', runs=3):
+    '''
+    Fail if importing `module` takes more than `budget` seconds on top of importing `baseline`.
+
+    The time of the baseline (by default torch, which every module needs) is subtracted, so the
+    budget measures the cost of the package itself and is comparable across machines.
+
+    Args:
+    - module (str): Module to time (default: 'minimalai.learner').
+    - budget (float): Allowed import time in seconds, beyond the baseline (default: 1.0).
+    - baseline (str, optional): Module whose import time is subtracted (default: 'torch'; None to time everything).
+    - runs (int): Number of interpreters started per measurement (default: 3).
+
+    Returns:
+    - float: The measured import time beyond the baseline, in seconds.
+    '''
+    elapsed = import_time(module, runs)
+    if baseline is not None:
+        elapsed -= import_time(baseline, runs)
+    if elapsed > budget:
+        raise AssertionError(f'Importing {module} takes {elapsed:.2f}s beyond {baseline}, over the budget of {budget:.2f}s')
+    return elapsed
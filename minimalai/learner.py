@@ -7,7 +7,6 @@ __all__ = ['CancelFitException', 'CancelBatchException', 'CancelEpochException',
 
 # %% ../nbs/09_minimalai-learner.ipynb 2
 import math
-import matplotlib.pyplot as plt
 import fastcore.all as fc
 from collections.abc import Mapping
 from operator import attrgetter
@@ -15,12 +14,17 @@ from functools import partial
 from copy import copy
 
 import torch
+import torch.distributed as dist
 from torch import optim
 import torch.nn.functional as F
 
 from .conv import *
+from .transfer import *
+from .lazy import *
 
-from fastprogress import progress_bar,master_bar
+# Plotting, progress bars and metrics are only imported once used
+plt = lazy_import('matplotlib.pyplot')
+progress_bar, master_bar = lazy_callable('fastprogress', 'progress_bar'), lazy_callable('fastprogress', 'master_bar')
 
 # %% ../nbs/09_minimalai-learner.ipynb 17
 class CancelFitException(Exception): pass
@@ -84,29 +88,24 @@ class SingleBatchCallback(Callback):
         raise CancelFitException()
 
 # %% ../nbs/09_minimalai-learner.ipynb 34
-from torcheval.metrics import MulticlassAccuracy, Mean
+MulticlassAccuracy, Mean = lazy_callable('torcheval.metrics', 'MulticlassAccuracy'), lazy_callable('torcheval.metrics', 'Mean')
+sync_and_compute = lazy_callable('torcheval.metrics.toolkit', 'sync_and_compute')
+# Lazy since minimalai.distributed imports this module
+is_main_process = lazy_callable('minimalai.distributed', 'is_main_process')
 
 # %% ../nbs/09_minimalai-learner.ipynb 37
 def to_cpu(x):
     """
-    Move tensor(s) to CPU and convert to float if dtype is torch.float16.
+    Move tensor(s) to CPU and convert to float if dtype is torch.float16 or torch.bfloat16.
 
     Args:
-    - x (tensor or Mapping or list or tuple): Input tensor(s) or data structure containing tensors.
+    - x (tensor or Mapping or list or tuple): Input tensor(s) or arbitrarily nested data structure containing tensors.
 
     Returns:
-    - result (tensor or Mapping or list or tuple): Tensor(s) moved to CPU and converted to float if necessary.
+    - result (tensor or Mapping or list or tuple): Tensor(s) moved to CPU and converted to float if necessary,
+      in containers of the same types.
     """
-    if isinstance(x, Mapping):  # Handle mapping (e.g., dictionary)
-        return {key: to_cpu(value) for key, value in x.items()}
-    if isinstance(x, list):  # Handle list
-        return [to_cpu(item) for item in x]
-    if isinstance(x, tuple):  # Handle tuple
-        return tuple(to_cpu(list(x)))
-    result = x.detach().cpu()  # Move tensor to CPU
-    if result.dtype == torch.float16:  # Convert to float if dtype is torch.float16
-        return result.float()
-    return result
+    return to_host(x, non_blocking=False)[0]
 
 # %% ../nbs/09_minimalai-learner.ipynb 38
 class MetricsCallback(Callback):
@@ -143,10 +142,25 @@ class MetricsCallback(Callback):
     def before_epoch(self, learner):
         """Reset all tracked metrics before the start of each epoch."""
         [metric.reset() for metric in self.all_metrics.values()]
+        self._pending = None
+
+    def _compute(self, metric):
+        """
+        Compute a metric, merging its state across all processes when training is distributed.
+
+        This is a collective call that every rank must make; only rank 0 receives the merged value (None elsewhere).
+        """
+        if dist.is_available() and dist.is_initialized() and dist.get_world_size() > 1:
+            return sync_and_compute(metric)
+        return metric.compute()
 
     def after_epoch(self, learner):
-        """Compute and log the values of all tracked metrics after each epoch."""
-        log = {name: f'{metric.compute():.3f}' for name, metric in self.all_metrics.items()}
+        """Compute and log the values of all tracked metrics after each epoch (only on rank 0 when distributed)."""
+        self._update()
+        values = {name: self._compute(metric) for name, metric in self.all_metrics.items()}
+        if not is_main_process():
+            return
+        log = {name: f'{value:.3f}' for name, value in values.items()}
         log['epoch'] = learner.epoch
         log['train'] = 'train' if learner.model.training else 'eval'
         self._log(log)
@@ -158,10 +172,24 @@ class MetricsCallback(Callback):
         Args:
         - learner (Learner): The learner object representing the training process.
         """
-        x, y, *_ = to_cpu(learner.batch)
+        x, y, *_ = learner.batch
+        # The copies to the CPU are queued now and consumed after the next batch, so the GPU never waits for the host
+        self._update()
+        self._pending = to_host((learner.predictions, y, learner.loss)), len(x)
+        # Without pending copies the tensors may be the batch's own, which the loader can overwrite: use them now
+        if self._pending[0][1] is None:
+            self._update()
+
+    def _update(self):
+        """Update the tracked metrics with the pending batch, once its copies to the CPU have completed."""
+        if self._pending is None:
+            return
+        ((predictions, y, loss), event), num_items = self._pending
+        self._pending = None
+        wait(event)
         for metric in self.metrics.values():
-            metric.update(to_cpu(learner.predictions), y)
-        self.loss.update(to_cpu(learner.loss), weight=len(x))
+            metric.update(predictions, y)
+        self.loss.update(loss, weight=num_items)
 
 # %% ../nbs/09_minimalai-learner.ipynb 39
 class DeviceCallback(Callback):
@@ -192,12 +220,13 @@ class DeviceCallback(Callback):
 
     def before_batch(self, learner):
         """
-        Move the data batch to the specified device before each batch processing.
+        Move the data batch to the specified device before each batch processing, with non-blocking copies.
 
         Args:
         - learner (Learner): The learner object representing the training process.
         """
-        learner.batch = move_data_to_device(learner.batch, device=self.device)
+        # The copies are queued on the current stream, ahead of the forward pass that reads them
+        learner.batch, _ = to_device(learner.batch, self.device)
 
 # %% ../nbs/09_minimalai-learner.ipynb 43
 class TrainCallback(Callback):
@@ -472,6 +501,10 @@ class Learner:
         """
         self.model.train(is_training)
         self.data_loader = self.data_loaders.train_loader if is_training else self.data_loaders.valid_loader
+        # Samplers and datasets with a `set_epoch` method (e.g. `StreamingDataset`) shuffle each epoch differently
+        for o in (getattr(self.data_loader, 'sampler', None), getattr(self.data_loader, 'dataset', None)):
+            if hasattr(o, 'set_epoch'):
+                o.set_epoch(self.epoch)
         self._one_epoch()
 
     @WithCallbacks('fit')
@@ -0,0 +1,387 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_minimalai-dataloaders.ipynb.
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 3
+from __future__ import annotations
+import os, json, math, time, socket, hashlib
+from pathlib import Path
+from itertools import islice
+from collections.abc import Mapping
+
+import torch
+import torch.multiprocessing as mp
+from torch.utils.data import DataLoader, default_collate
+
+from .training import *
+from .datasets import *
+from .conv import *
+from .cache import dataset_cache_key, _callable_key
+
+# %% auto 0
+__all__ = ['default_tuning_cache', 'time_dataloader', 'autotune_dataloaders', 'DeviceDataLoader', 'DeviceDataLoaders',
+           'SharedBatchRing', 'SharedMemoryCollate', 'SharedMemoryDataLoader', 'shared_memory_dataloaders']
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 5
+def time_dataloader(dataloader, num_batches=200, num_epochs=2, device=None):
+    '''
+    Measure the throughput of a dataloader, in items per second.
+
+    The batches are spread over `num_epochs` passes, so worker startup costs (and the benefit of
+    `persistent_workers`) are part of the measurement.
+
+    Args:
+    - dataloader: The dataloader to time.
+    - num_batches: Total number of batches to load (default: 200).
+    - num_epochs: Number of passes the batches are spread over (default: 2).
+    - device (optional): If given, each batch is also moved to this device, as `DeviceCallback` would.
+
+    Returns:
+    - float: Number of items loaded per second.
+    '''
+    num_items = 0
+    start = time.perf_counter()
+    for _ in range(num_epochs):
+        for batch in islice(dataloader, max(num_batches // num_epochs, 1)):
+            if device is not None:
+                batch = move_data_to_device(batch, device)
+            num_items += len(batch[0])
+    if device is not None and torch.device(device).type == 'cuda':
+        torch.cuda.synchronize()
+    return num_items / (time.perf_counter() - start)
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 8
+default_tuning_cache = Path.home()/'.cache'/'minimalai'/'dataloaders.json'
+
+def _load_tuning_cache(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_tuning_cache(path, key, config):
+    # Re-read before writing, so concurrent runs tuning other datasets are not lost
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cache = _load_tuning_cache(path)
+    cache.setdefault(socket.gethostname(), {})[key] = config
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}')
+    tmp_path.write_text(json.dumps(cache, indent=2))
+    os.replace(tmp_path, path)
+
+def _tuning_candidates(name, config, max_workers, pin_memory):
+    '''
+    Candidate values for one setting of the `DataLoader`, given the settings chosen so far.
+    '''
+    if name == 'num_workers':
+        return sorted({0, *(2**i for i in range(max_workers.bit_length()) if 2**i <= max_workers), max_workers})
+    if config['num_workers'] == 0:
+        return []  # `persistent_workers` and `prefetch_factor` require worker processes
+    if name == 'persistent_workers':
+        return [False, True]
+    if name == 'prefetch_factor':
+        return [2, 4, 8]
+    if name == 'pin_memory':
+        return [False, True] if pin_memory else []
+
+def autotune_dataloaders(dataset_dict, batch_size, collate_fn=None, valid_batch_sizes=None, max_workers=None,
+                         num_batches=200, device=default_device, cache_path=default_tuning_cache, force=False):
+    '''
+    Find the fastest `DataLoader` settings for a dataset on the current machine and return the matching DataLoaders.
+
+    The settings are tuned one at a time (`num_workers`, then `prefetch_factor`, `persistent_workers` and
+    `pin_memory`) by timing `num_batches` training batches with `time_dataloader`, after which the validation
+    batch size is picked from `valid_batch_sizes`. The result is cached per host, keyed by the datasets, the
+    collate function and the batch size, so later runs on the same machine skip the search.
+
+    Args:
+    - dataset_dict: Dictionary of datasets with keys 'train' and 'valid'.
+    - batch_size: Batch size for the training dataloader.
+    - collate_fn (optional): Collate function (default: `collate_dict` for Hugging Face datasets, else `default_collate`).
+    - valid_batch_sizes (optional): Candidate validation batch sizes (default: 1, 2 and 4 times `batch_size`).
+    - max_workers (optional): Largest number of workers to try (default: number of CPUs).
+    - num_batches: Number of batches timed per candidate (default: 200).
+    - device: Device batches are moved to while timing, so that `pin_memory` is measured (default: `default_device`).
+    - cache_path: JSON file storing the tuned settings (default: `~/.cache/minimalai/dataloaders.json`).
+    - force: Whether to ignore cached settings and tune again (default: False).
+
+    Returns:
+    - DataLoaders: DataLoaders object with train and valid dataloaders built with the fastest settings.
+    '''
+    train_ds, valid_ds = list(dataset_dict.values())[:2]
+    if collate_fn is None:
+        collate_fn = collate_dict(train_ds) if hasattr(train_ds, 'features') else default_collate
+    if valid_batch_sizes is None:
+        valid_batch_sizes = [batch_size, batch_size*2, batch_size*4]
+    max_workers = max_workers or os.cpu_count() or 1
+    pin_memory = torch.device(device).type == 'cuda'
+
+    # The settings only carry over to the same kind of datasets, with the same transforms and collate function
+    dataset_type = type(train_ds)
+    key = '-'.join([f'{dataset_type.__module__}.{dataset_type.__qualname__}',
+                    dataset_cache_key({'train': train_ds, 'valid': valid_ds}),
+                    hashlib.sha256(_callable_key(collate_fn).encode()).hexdigest()[:16], str(batch_size)])
+    config = _load_tuning_cache(cache_path).get(socket.gethostname(), {}).get(key)
+
+    if config is None or force:
+        config = {'num_workers': 0}
+        for name in ('num_workers', 'prefetch_factor', 'persistent_workers', 'pin_memory'):
+            timings = {}
+            for value in _tuning_candidates(name, config, max_workers, pin_memory):
+                dataloader = DataLoader(train_ds, batch_size=batch_size, shuffle=True, collate_fn=collate_fn,
+                                        **{**config, name: value})
+                timings[value] = time_dataloader(dataloader, num_batches, device=device)
+                del dataloader
+            if timings:
+                config[name] = max(timings, key=timings.get)
+
+        timings = {}
+        for valid_batch_size in valid_batch_sizes:
+            dataloader = DataLoader(valid_ds, batch_size=valid_batch_size, collate_fn=collate_fn, **config)
+            timings[valid_batch_size] = time_dataloader(dataloader, max(num_batches * batch_size // valid_batch_size, 1),
+                                                        device=device)
+            del dataloader
+        config['valid_batch_size'] = max(timings, key=timings.get)
+        _save_tuning_cache(cache_path, key, config)
+
+    config = dict(config)
+    valid_batch_size = config.pop('valid_batch_size')
+    return DataLoaders(DataLoader(train_ds, batch_size=batch_size, shuffle=True, collate_fn=collate_fn, **config),
+                       DataLoader(valid_ds, batch_size=valid_batch_size, collate_fn=collate_fn, **config))
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 12
+class DeviceDataLoader:
+    def __init__(self, *tensors, batch_size, shuffle=False, drop_last=False, device=default_device):
+        '''
+        A dataloader over tensors that live on `device`, for datasets small enough to fit in device memory.
+
+        The tensors are uploaded once. Each epoch is shuffled with `torch.randperm` on the device and batches
+        are yielded by indexing, so there are no workers, no collation and no host-to-device copies.
+
+        Args:
+        - *tensors: Tensors sharing the same first (item) dimension, e.g. inputs and targets.
+        - batch_size: Number of items per batch.
+        - shuffle: Whether to shuffle the items every epoch (default: False).
+        - drop_last: Whether to drop the last incomplete batch (default: False).
+        - device: The device holding the tensors (default: `default_device`).
+        '''
+        self.tensors = tuple(t.to(device) for t in tensors)
+        self.batch_size, self.shuffle, self.drop_last, self.device = batch_size, shuffle, drop_last, device
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.tensors[0]) // self.batch_size
+        return math.ceil(len(self.tensors[0]) / self.batch_size)
+
+    def __iter__(self):
+        num_items = len(self.tensors[0])
+        indices = torch.randperm(num_items, device=self.tensors[0].device) if self.shuffle else None
+        for i in range(len(self)):
+            start = i * self.batch_size
+            if indices is None:
+                yield tuple(t[start:start + self.batch_size] for t in self.tensors)
+            else:
+                batch_indices = indices[start:start + self.batch_size]
+                yield tuple(t[batch_indices] for t in self.tensors)
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 13
+def _dataset_tensors(dataset):
+    '''
+    Return all the items of a dataset as one tensor per feature.
+    '''
+    if isinstance(dataset, CollatedDataset):
+        return dataset.__getitems__(torch.arange(len(dataset)))
+    if isinstance(dataset, Dataset):
+        return tuple(torch.as_tensor(t) for t in (dataset.input_data, dataset.target_data))
+    # `torch.utils.data.TensorDataset` already holds one tensor per field
+    if isinstance(getattr(dataset, 'tensors', None), (tuple, list)):
+        return tuple(dataset.tensors)
+    if not hasattr(dataset, 'features'):
+        raise TypeError(f'Cannot load a {type(dataset).__name__} on the device: expected a Hugging Face dataset, '
+                        'a CollatedDataset, a Dataset or a TensorDataset')
+    return CollatedDataset.from_dataset(dataset).tensors
+
+class DeviceDataLoaders(DataLoaders):
+    @classmethod
+    def from_dataset_dict(cls, dataset_dict, batch_size, device=default_device, **kwargs):
+        '''
+        Create a DeviceDataLoaders object by uploading the train and valid splits to `device` once.
+
+        Batches are tuples of tensors already on `device`, in the same format as the batches of
+        `DataLoaders.from_dataset_dict`, so they work unchanged with `TrainCallback` and `DeviceCallback`.
+
+        Args:
+        - cls: Class reference.
+        - dataset_dict: Dictionary of datasets with keys 'train' and 'valid' (Hugging Face datasets,
+          `CollatedDataset`s, `Dataset`s or `TensorDataset`s).
+        - batch_size: Batch size for the training dataloader (the validation one uses twice that).
+        - device: The device to keep the data on (default: `default_device`).
+        - **kwargs: Additional keyword arguments for `DeviceDataLoader`.
+
+        Returns:
+        - DeviceDataLoaders: DeviceDataLoaders object with train and valid dataloaders.
+        '''
+        train_tensors, valid_tensors = [_dataset_tensors(ds) for ds in list(dataset_dict.values())[:2]]
+        return cls(DeviceDataLoader(*train_tensors, batch_size=batch_size, shuffle=True, device=device, **kwargs),
+                   DeviceDataLoader(*valid_tensors, batch_size=batch_size*2, device=device, **kwargs))
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 17
+def _item_fields(item, features=None):
+    '''
+    The fields of a dataset item as a tuple, picking `features` (or all values) from dict items.
+    '''
+    if isinstance(item, Mapping):
+        return tuple(item[f] for f in features) if features else tuple(item.values())
+    return tuple(item)
+
+class SharedBatchRing:
+    def __init__(self, num_slots, batch_size, item, features=None, multiprocessing_context=None):
+        '''
+        A ring of preallocated batches in shared memory, with a queue of free slots shared between processes.
+
+        Args:
+        - num_slots: Number of batches in the ring.
+        - batch_size: Maximum number of items per batch.
+        - item: A dataset item, used to infer the shape and dtype of every field.
+        - features (optional): Keys picked from dict items, in order.
+        - multiprocessing_context (optional): Multiprocessing context of the `DataLoader` workers.
+        '''
+        fields = [torch.as_tensor(field) for field in _item_fields(item, features)]
+        self.slots = [tuple(torch.empty((batch_size, *f.shape), dtype=f.dtype).share_memory_() for f in fields)
+                      for _ in range(num_slots)]
+        self.features = features
+        if multiprocessing_context is None or isinstance(multiprocessing_context, str):
+            multiprocessing_context = mp.get_context(multiprocessing_context)
+        self.multiprocessing_context = multiprocessing_context
+        self.reset()
+
+    def reset(self):
+        '''
+        Mark every slot as free, with a new queue.
+
+        Only call this once no worker uses the ring: a worker terminated while waiting on the old queue may
+        have left its lock held, so the queue is rebuilt rather than drained.
+        '''
+        self.free_slots = self.multiprocessing_context.Queue()
+        for slot in range(len(self.slots)):
+            self.free_slots.put(slot)
+
+    def acquire(self):
+        '''Wait for a free slot and return its index.'''
+        return self.free_slots.get()
+
+    def release(self, slot):
+        '''Return a slot to the ring, so that a worker can collate the next batch into it.'''
+        self.free_slots.put(slot)
+
+    def batch(self, slot, num_items):
+        '''The first `num_items` items of a slot, as a tuple of tensors sharing its memory.'''
+        return tuple(t[:num_items] for t in self.slots[slot])
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 18
+class SharedMemoryCollate:
+    def __init__(self, ring):
+        '''
+        Collate function writing each batch directly into a free slot of a `SharedBatchRing`.
+
+        Args:
+        - ring (SharedBatchRing): The ring holding the batches.
+        '''
+        self.ring = ring
+
+    def __call__(self, items):
+        '''
+        Collate `items` into a free slot.
+
+        Returns:
+        - tuple: The slot index and the number of items, which is all that is sent back to the main process.
+        '''
+        slot = self.ring.acquire()
+        fields = zip(*(_item_fields(item, self.ring.features) for item in items))
+        for values, out in zip(fields, self.ring.slots[slot]):
+            out = out[:len(items)]
+            if isinstance(values[0], torch.Tensor):
+                torch.stack(values, out=out)
+            else:
+                out.copy_(torch.as_tensor(values))
+        return slot, len(items)
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 19
+class SharedMemoryDataLoader:
+    def __init__(self, dataset, batch_size, shuffle=False, num_workers=2, prefetch_factor=2, num_slots=None, features=None,
+                 **kwargs):
+        '''
+        A dataloader whose workers collate batches into a ring of preallocated shared-memory slots.
+
+        Workers send back only slot indices instead of pickled tensors, and no batch is allocated after
+        construction. A batch stays valid until the next one is requested, that is, until the `Learner` has
+        finished its step: its slot is then returned to the ring. Copy any part of a batch you keep longer.
+
+        When an iteration stops early, its workers are shut down and all the slots, including those of the
+        batches already queued, are returned to the ring. Workers are therefore never persistent.
+
+        Args:
+        - dataset: The dataset to load.
+        - batch_size: Number of items per batch.
+        - shuffle: Whether to shuffle the items every epoch (default: False).
+        - num_workers: Number of `DataLoader` workers (default: 2).
+        - prefetch_factor: Number of batches loaded in advance by each worker (default: 2).
+        - num_slots (optional): Number of slots in the ring (default: enough for all prefetched batches, plus 2).
+        - features (optional): Keys picked from dict items, in order (e.g. the features of a Hugging Face dataset).
+        - **kwargs: Additional keyword arguments for `DataLoader` (except `persistent_workers`).
+        '''
+        assert not kwargs.get('persistent_workers'), 'persistent workers would keep slots of abandoned iterations'
+        in_flight = num_workers * prefetch_factor if num_workers else 1
+        if num_slots is None:
+            num_slots = in_flight + 2
+        # One slot is held by the batch being used, the others may all be waiting in the worker queues
+        assert num_slots > in_flight, f'num_slots must be larger than num_workers*prefetch_factor ({in_flight})'
+        self.ring = SharedBatchRing(num_slots, batch_size, dataset[0], features, kwargs.get('multiprocessing_context'))
+        if num_workers:
+            kwargs['prefetch_factor'] = prefetch_factor
+        self.dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, num_workers=num_workers,
+                                     collate_fn=SharedMemoryCollate(self.ring), **kwargs)
+        self._iterator = None
+
+    def __len__(self):
+        return len(self.dataloader)
+
+    def _stop(self):
+        '''
+        Shut down the workers of the current iteration, if any, and return all the slots to the ring.
+        '''
+        iterator, self._iterator = self._iterator, None
+        # Workers still waiting for a slot are terminated, so none of them holds a slot afterwards
+        if hasattr(iterator, '_shutdown_workers'):
+            iterator._shutdown_workers()
+        self.ring.reset()
+
+    def __iter__(self):
+        # An iteration that was abandoned without being closed still has workers holding slots
+        self._stop()
+        self._iterator = iterator = iter(self.dataloader)
+        try:
+            for slot, num_items in iterator:
+                yield self.ring.batch(slot, num_items)
+                self.ring.release(slot)
+        finally:
+            # Slots taken by workers for batches that will never be consumed are reclaimed here
+            if self._iterator is iterator:
+                self._stop()
+
+# %% ../nbs/05_minimalai-dataloaders.ipynb 20
+def shared_memory_dataloaders(dataset_dict, batch_size, **kwargs):
+    '''
+    Create DataLoaders whose batches are transported through shared-memory rings.
+
+    Args:
+    - dataset_dict: Dictionary of datasets with keys 'train' and 'valid'.
+    - batch_size: Batch size for the training dataloader (the validation one uses twice that).
+    - **kwargs: Additional keyword arguments for `SharedMemoryDataLoader`.
+
+    Returns:
+    - DataLoaders: DataLoaders object with train and valid dataloaders.
+    '''
+    train_ds, valid_ds = list(dataset_dict.values())[:2]
+    if hasattr(train_ds, 'features'):
+        kwargs.setdefault('features', list(train_ds.features))
+    return DataLoaders(SharedMemoryDataLoader(train_ds, batch_size, shuffle=True, **kwargs),
+                       SharedMemoryDataLoader(valid_ds, batch_size*2, **kwargs))
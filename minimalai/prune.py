@@ -0,0 +1,270 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/22_minimalai-prune.ipynb.
+
+# %% ../nbs/22_minimalai-prune.ipynb 3
+from __future__ import annotations
+from copy import deepcopy
+from functools import partial
+
+import torch
+import fastcore.all as fc
+import torch.nn.functional as F
+from torch import nn
+
+from .conv import *
+from .learner import *
+from .activations import *
+from .init import *
+from .inference import *
+from .quantize import evaluate_accuracy
+
+# %% auto 0
+__all__ = ['append_channel_stats', 'ChannelStatisticsCallback', 'prunable_pairs', 'channel_statistics', 'prune_channels',
+           'select_channels', 'prune_model', 'prune', 'pruning_report']
+
+# %% ../nbs/22_minimalai-prune.ipynb 5
+def append_channel_stats(hook, module, input_data, output_data):
+    '''
+    Hook function accumulating the per-channel sum, sum of squares and count of the output of `module`.
+
+    Args:
+    - hook (Hook): The hook, in which the running sums are stored as `channel_sums`.
+    - module (nn.Module): The hooked module.
+    - input_data (tuple): The inputs of the module.
+    - output_data (torch.Tensor): The output of the module, with channels in dimension 1.
+    '''
+    x = output_data.detach().double().transpose(0, 1).flatten(1)
+    sums, count = torch.stack([x.sum(1), (x * x).sum(1)]), x.shape[1]
+    if hasattr(hook, 'channel_sums'):
+        sums, count = sums + hook.channel_sums[0], count + hook.channel_sums[1]
+    hook.channel_sums = sums, count
+
+class ChannelStatisticsCallback(HooksCallback):
+    def __init__(self, modules, num_batches=None):
+        '''
+        Callback collecting the mean and standard deviation of each output channel of `modules` during validation.
+
+        Args:
+        - modules (list): The modules to hook.
+        - num_batches (int, optional): Number of validation batches to use (default: all).
+        '''
+        super().__init__(append_channel_stats, on_train=False, on_valid=True, modules=modules)
+        self.num_batches = num_batches
+
+    def before_fit(self, learner):
+        # The modules are always the given ones, even when there are none
+        self.hooks = Hooks(self.modules, partial(self._hook_function, learner))
+
+    def after_batch(self, learner):
+        if self.num_batches is not None and learner.iteration + 1 >= self.num_batches:
+            raise CancelEpochException()
+
+    @property
+    def stats(self):
+        '''
+        Dictionary mapping each hooked module to the `(mean, std)` tensors of its output channels.
+        '''
+        result = {}
+        for module, hook in zip(self.modules, self.hooks):
+            (sums, squares), count = hook.channel_sums
+            mean = sums / count
+            result[module] = mean.float(), (squares / count - mean * mean).clamp_min(0).sqrt().float()
+        return result
+
+# %% ../nbs/22_minimalai-prune.ipynb 7
+# Layers acting on each channel separately, which can be narrowed along with the convolution before them
+_per_channel = (nn.BatchNorm2d, nn.ReLU, nn.LeakyReLU, nn.SiLU, nn.GELU, nn.Tanh, nn.Sigmoid, nn.Identity, GeneralRelu)
+
+def _conv_unit(module):
+    # A convolution, or a `conv_layer`: an ungrouped convolution followed by per-channel layers
+    if isinstance(module, nn.Sequential) and len(module):
+        return _conv_unit(module[0]) and all(isinstance(l, _per_channel) for l in list(module)[1:])
+    return isinstance(module, nn.Conv2d) and module.groups == 1
+
+def _conv(unit):
+    return unit[0] if isinstance(unit, nn.Sequential) else unit
+
+def prunable_pairs(model):
+    '''
+    Find the output channels of `model` that can be removed: those of a `conv_layer` directly feeding another one in an
+    `nn.Sequential`, as between the layers of `get_model` and inside the `convs` of a `ResBlock`.
+
+    The outputs of a `ResBlock` are added to its shortcut, so they are not pruned.
+
+    Args:
+    - model (nn.Module): The model.
+
+    Returns:
+    - list: `(producer, consumer)` pairs of units (convolutions or `conv_layer`s).
+    '''
+    pairs = []
+    for seq in model.modules():
+        if isinstance(seq, nn.Sequential):
+            layers = list(seq)
+            pairs += [(a, b) for a, b in zip(layers, layers[1:]) if _conv_unit(a) and _conv_unit(b)]
+    return pairs
+
+def channel_statistics(model, data_loaders, num_batches=10, device=default_device):
+    '''
+    Collect the statistics of the prunable channels of `model` on the first batches of `data_loaders.valid_loader`.
+
+    Args:
+    - model (nn.Module): The model.
+    - data_loaders (DataLoaders): Data loaders whose validation loader yields `(inputs, targets)` batches.
+    - num_batches (int, optional): Number of batches to use (default: 10; None for all).
+    - device (str or torch.device): Device to run on (default: default_device).
+
+    Returns:
+    - dict: Mapping from each producer unit of `prunable_pairs(model)` to the `(mean, std)` of its output channels.
+    '''
+    callback = ChannelStatisticsCallback([producer for producer, _ in prunable_pairs(model)], num_batches)
+    learner = TrainLearner(model, data_loaders, F.cross_entropy, callbacks=[DeviceCallback(device), callback],
+                           optimizer_function=None)
+    learner.fit(1, train=False)
+    return callback.stats
+
+# %% ../nbs/22_minimalai-prune.ipynb 9
+def _narrow(module, name, keep, dim=0):
+    tensor = getattr(module, name)
+    if tensor is None:
+        return
+    narrowed = tensor.detach().index_select(dim, keep).clone()
+    setattr(module, name, nn.Parameter(narrowed, tensor.requires_grad) if isinstance(tensor, nn.Parameter) else narrowed)
+
+def prune_channels(producer, consumer, keep, mean=None):
+    '''
+    Remove (in place) the output channels of `producer` not in `keep`, and the matching input channels of `consumer`.
+
+    The constant part of the removed channels is folded into the bias of the consumer convolution, so channels
+    whose output does not vary (dead units) are removed without changing the result, up to the zero padding.
+
+    Args:
+    - producer (nn.Module): The convolution or `conv_layer` whose output channels are removed.
+    - consumer (nn.Module): The convolution or `conv_layer` reading them.
+    - keep (torch.Tensor): Indices of the channels to keep.
+    - mean (torch.Tensor, optional): Mean output of each channel of `producer`, for the bias compensation.
+    '''
+    conv, next_conv = _conv(producer), _conv(consumer)
+    keep = keep.to(conv.weight.device)
+    with torch.no_grad():
+        if mean is not None:
+            removed = torch.ones(conv.out_channels, dtype=torch.bool, device=keep.device)
+            removed[keep] = False
+            shift = (next_conv.weight[:, removed].sum((2, 3)) * mean.to(removed.device)[removed]).sum(1)
+            if next_conv.bias is None:
+                next_conv.bias = nn.Parameter(torch.zeros_like(shift))
+            next_conv.bias += shift.to(next_conv.bias.dtype)
+        _narrow(conv, 'weight', keep)
+        _narrow(conv, 'bias', keep)
+        conv.out_channels = len(keep)
+        for layer in (list(producer)[1:] if isinstance(producer, nn.Sequential) else []):
+            if isinstance(layer, nn.BatchNorm2d):
+                for name in ('weight', 'bias', 'running_mean', 'running_var'):
+                    _narrow(layer, name, keep)
+                layer.num_features = len(keep)
+        _narrow(next_conv, 'weight', keep, dim=1)
+        next_conv.in_channels = len(keep)
+
+def select_channels(std, dead_threshold=0.01, amount=0., min_channels=1):
+    '''
+    Choose the channels to keep from the standard deviations of their outputs.
+
+    Args:
+    - std (torch.Tensor): Standard deviation of each channel.
+    - dead_threshold (float): Channels whose deviation is below this fraction of the median one are dead (default: 0.01).
+    - amount (float): Minimum fraction of the channels removed, the least varying ones, dead or not (default: 0).
+    - min_channels (int): Minimum number of channels kept (default: 1).
+
+    Returns:
+    - torch.Tensor: Sorted indices of the channels to keep.
+    '''
+    num_channels = len(std)
+    dead = int((std <= dead_threshold * std.median()).sum())
+    num_keep = max(min(num_channels - dead, num_channels - int(amount * num_channels)), min_channels)
+    return std.argsort(descending=True)[:num_keep].sort().values
+
+# %% ../nbs/22_minimalai-prune.ipynb 11
+def _prune(model, stats, dead_threshold, amount, min_channels):
+    pruned = {}
+    for producer, consumer in prunable_pairs(model):
+        mean, std = stats[producer]
+        keep = select_channels(std, dead_threshold, amount, min_channels)
+        if len(keep) < len(std):
+            prune_channels(producer, consumer, keep, mean)
+        pruned[producer] = (len(std), len(keep))
+    return pruned
+
+def prune_model(model, data_loaders, dead_threshold=0.01, amount=0., num_batches=10, min_channels=1, device=default_device):
+    '''
+    Return a copy of `model` without its dead (and optionally, least varying) channels.
+
+    Args:
+    - model (nn.Module): The trained model, e.g. from `get_model` or made of `ResBlock`s. It is left unchanged.
+    - data_loaders (DataLoaders): Data loaders whose validation loader is used for the statistics.
+    - dead_threshold (float): Relative deviation below which a channel is dead (default: 0.01).
+    - amount (float): Minimum fraction of each layer's channels removed (default: 0).
+    - num_batches (int, optional): Number of validation batches for the statistics (default: 10).
+    - min_channels (int): Minimum number of channels kept in each layer (default: 1).
+    - device (str or torch.device): Device to run on (default: default_device).
+
+    Returns:
+    - nn.Module: The pruned model.
+    '''
+    model = deepcopy(model)
+    _prune(model, channel_statistics(model, data_loaders, num_batches, device), dead_threshold, amount, min_channels)
+    return model
+
+@fc.patch
+def prune(self: Learner, dead_threshold=0.01, amount=0., num_batches=10, min_channels=1, fine_tune_epochs=0, learning_rate=None):
+    '''
+    Prune the channels of the model of the learner in place, then optionally fine-tune it with the learner's setup.
+
+    The statistics are collected with a validation pass of `fit`, so the learner's callbacks (e.g. for the device)
+    are used, and the optimizer is recreated for the pruned parameters by the next `fit`.
+
+    Args:
+    - dead_threshold (float): Relative deviation below which a channel is dead (default: 0.01).
+    - amount (float): Minimum fraction of each layer's channels removed (default: 0).
+    - num_batches (int, optional): Number of validation batches for the statistics (default: 10).
+    - min_channels (int): Minimum number of channels kept in each layer (default: 1).
+    - fine_tune_epochs (int): Number of epochs of training after pruning (default: 0).
+    - learning_rate (float, optional): Learning rate for the fine-tuning (default: the learner's one).
+
+    Returns:
+    - dict: Mapping from each pruned unit to its `(channels before, channels after)`.
+    '''
+    callback = ChannelStatisticsCallback([producer for producer, _ in prunable_pairs(self.model)], num_batches)
+    self.fit(1, train=False, callbacks=[callback])
+    pruned = _prune(self.model, callback.stats, dead_threshold, amount, min_channels)
+    if fine_tune_epochs:
+        self.fit(fine_tune_epochs, learning_rate=learning_rate)
+    return pruned
+
+# %% ../nbs/22_minimalai-prune.ipynb 13
+def pruning_report(model, pruned, inputs, data_loader=None, num_batches=None, runs=20):
+    '''
+    Compare the size, latency and (optionally) accuracy of `model` and its `pruned` version.
+
+    Args:
+    - model (nn.Module): The original model.
+    - pruned (nn.Module): The pruned model.
+    - inputs (torch.Tensor): A batch of inputs for the latencies, on the device of the models.
+    - data_loader (DataLoader, optional): Loader for the accuracies, computed on the CPU.
+    - num_batches (int, optional): Number of batches for the accuracies (default: all).
+    - runs (int): Number of timed forward passes (default: 20).
+
+    Returns:
+    - dict: Parameter counts, median latencies (in seconds), speedup and accuracies of both models.
+    '''
+    report = {}
+    for name, m in (('original', model), ('pruned', pruned)):
+        training = m.training
+        m.eval()
+        report[f'{name}_params'] = sum(p.numel() for p in m.parameters())
+        report[f'{name}_latency'] = benchmark_latency(m, inputs, runs=runs)
+        if data_loader is not None:
+            device = next(m.parameters()).device
+            report[f'{name}_accuracy'] = evaluate_accuracy(m.cpu(), data_loader, num_batches)
+            m.to(device)
+        m.train(training)
+    report['speedup'] = report['original_latency'] / report['pruned_latency']
+    return report
@@ -0,0 +1,239 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/21_minimalai-quantize.ipynb.
+
+# %% ../nbs/21_minimalai-quantize.ipynb 3
+from __future__ import annotations
+import io
+from copy import deepcopy
+
+import torch
+import fastcore.all as fc
+import torch.nn.functional as F
+from torch import nn
+import torch.ao.nn.quantized as nnq
+import torch.ao.nn.intrinsic.quantized as nniq
+
+from .learner import *
+from .activations import *
+from .inference import *
+
+# %% auto 0
+__all__ = ['record_ranges', 'CalibrationCallback', 'calibrate', 'convert_to_int8', 'quantize_model', 'model_size',
+           'evaluate_accuracy', 'quantization_report']
+
+# %% ../nbs/21_minimalai-quantize.ipynb 5
+_quantizable = (nn.Conv2d, nn.Linear)
+# Modules that work directly on quantized tensors, so a run of int8 layers does not need to be interrupted for them
+_passthrough = (nn.ReLU, nn.Flatten, nn.AvgPool2d, nn.MaxPool2d, nn.AdaptiveAvgPool2d, nn.Dropout)
+
+def record_ranges(hook, module, input_data, output_data):
+    '''
+    Hook function keeping the running minimum and maximum of the input and output of `module`.
+
+    Args:
+    - hook (Hook): The hook, in which the ranges are stored as `input_range` and `output_range`.
+    - module (nn.Module): The hooked module.
+    - input_data (tuple): The inputs of the module.
+    - output_data (torch.Tensor): The output of the module.
+    '''
+    for name, data in (('input_range', input_data[0]), ('output_range', output_data)):
+        low, high = torch.aminmax(data.detach().float())
+        if hasattr(hook, name):
+            low, high = torch.minimum(getattr(hook, name)[0], low), torch.maximum(getattr(hook, name)[1], high)
+        setattr(hook, name, (low, high))
+
+class CalibrationCallback(HooksCallback):
+    def __init__(self, num_batches=10, module_filter=fc.risinstance(_quantizable)):
+        '''
+        Callback recording the activation ranges of the convolutions and linear layers over a few validation batches.
+
+        Args:
+        - num_batches (int): Number of validation batches to calibrate on (default: 10).
+        - module_filter (function): Selects the modules to record (default: `nn.Conv2d` and `nn.Linear`).
+        '''
+        super().__init__(record_ranges, module_filter, on_train=False, on_valid=True)
+        self.num_batches = num_batches
+
+    def before_fit(self, learner):
+        self.modules = list(fc.filter_ex(learner.model.modules(), self.module_filter))
+        super().before_fit(learner)
+
+    def after_batch(self, learner):
+        if learner.iteration + 1 >= self.num_batches:
+            raise CancelEpochException()
+
+    @property
+    def ranges(self):
+        '''
+        Dictionary mapping each recorded module to its `(input_range, output_range)`, as pairs of floats.
+        '''
+        return {module: tuple(tuple(v.item() for v in getattr(hook, name)) for name in ('input_range', 'output_range'))
+                for module, hook in zip(self.modules, self.hooks) if hasattr(hook, 'output_range')}
+
+def calibrate(model, data_loaders, num_batches=10, device='cpu'):
+    '''
+    Run `model` on the first batches of `data_loaders.valid_loader` and return the ranges of its activations.
+
+    Args:
+    - model (nn.Module): The model to calibrate, typically with its BatchNorms folded.
+    - data_loaders (DataLoaders): Data loaders whose validation loader yields `(inputs, targets)` batches.
+    - num_batches (int): Number of batches to use (default: 10).
+    - device (str or torch.device): Device to calibrate on (default: 'cpu').
+
+    Returns:
+    - dict: Mapping from each convolution and linear layer to its `(input_range, output_range)`.
+    '''
+    callback = CalibrationCallback(num_batches)
+    learner = TrainLearner(model, data_loaders, F.cross_entropy, callbacks=[DeviceCallback(device), callback],
+                           optimizer_function=None)
+    learner.fit(1, train=False)
+    return callback.ranges
+
+# %% ../nbs/21_minimalai-quantize.ipynb 8
+def _qparams(low, high, relu=False):
+    # Affine quint8 parameters covering [low, high] (and 0); x86 kernels need 7 bit activations to avoid overflows
+    low, high = (0. if relu else min(low, 0.)), max(high, 0.)
+    qmax = 127 if torch.backends.quantized.engine in ('x86', 'fbgemm') else 255
+    scale = max((high - low) / qmax, 1e-8)
+    return scale, int(min(max(round(-low / scale), 0), qmax))
+
+def _quantize_layer(layer, output_range, relu):
+    weight = layer.weight.detach().float()
+    # Symmetric per output channel weights
+    scales = weight.abs().flatten(1).amax(1).clamp_min(1e-8) / 127
+    qweight = torch.quantize_per_channel(weight, scales.double(), torch.zeros_like(scales, dtype=torch.long), 0, torch.qint8)
+    bias = None if layer.bias is None else layer.bias.detach().float()
+    if isinstance(layer, nn.Conv2d):
+        cls = nniq.ConvReLU2d if relu else nnq.Conv2d
+        qlayer = cls(layer.in_channels, layer.out_channels, layer.kernel_size, stride=layer.stride, padding=layer.padding,
+                     dilation=layer.dilation, groups=layer.groups, bias=bias is not None, padding_mode=layer.padding_mode)
+    else:
+        cls = nniq.LinearReLU if relu else nnq.Linear
+        qlayer = cls(layer.in_features, layer.out_features, bias is not None)
+    qlayer.set_weight_bias(qweight, bias)
+    qlayer.scale, qlayer.zero_point = _qparams(*output_range, relu)
+    return qlayer
+
+def _convert_sequential(layers, ranges):
+    result, quantized, i = [], False, 0
+    while i < len(layers):
+        layer = layers[i]
+        if layer in ranges:
+            input_range, output_range = ranges[layer]
+            # A ReLU right after the layer is fused into its int8 kernel
+            relu = i + 1 < len(layers) and type(layers[i + 1]) is nn.ReLU
+            if not quantized:
+                result.append(nnq.Quantize(*_qparams(*input_range), torch.quint8))
+            result.append(_quantize_layer(layer, output_range, relu))
+            quantized, i = True, i + 1 + relu
+            continue
+        if quantized and not isinstance(layer, _passthrough):
+            result.append(nnq.DeQuantize())
+            quantized = False
+        result.append(layer if quantized else _convert(layer, ranges))
+        i += 1
+    if quantized:
+        result.append(nnq.DeQuantize())
+    return nn.Sequential(*result)
+
+def _flatten(seq):
+    # Nested sequences are inlined, so runs of int8 layers can cross them (e.g. between the `conv_layer`s of `get_model`)
+    return [l for layer in seq for l in (_flatten(layer) if isinstance(layer, nn.Sequential) else [layer])]
+
+def _convert(module, ranges):
+    if isinstance(module, nn.Sequential):
+        return _convert_sequential(_flatten(module), ranges)
+    if module in ranges:
+        return _convert_sequential([module], ranges)
+    for name, child in module.named_children():
+        setattr(module, name, _convert(child, ranges))
+    return module
+
+def convert_to_int8(model, ranges):
+    '''
+    Replace the calibrated convolutions and linear layers of `model` (in place) by int8 kernels.
+
+    Consecutive int8 layers (with the ReLUs, poolings and flattens between them) exchange quantized tensors; the
+    activations are quantized before the first one and dequantized after the last one, so layers without an int8
+    kernel (e.g. `GeneralRelu`, or the sum in `ResBlock`) keep running in float.
+
+    Args:
+    - model (nn.Module): The model, on the CPU, with its BatchNorms folded.
+    - ranges (dict): Activation ranges returned by `calibrate`.
+
+    Returns:
+    - nn.Module: The quantized model.
+    '''
+    return _convert(model, ranges).eval()
+
+# %% ../nbs/21_minimalai-quantize.ipynb 10
+def quantize_model(model, data_loaders, num_batches=10):
+    '''
+    Post-training int8 quantization of `model` for CPU inference: fold the BatchNorms, calibrate, then convert.
+
+    Args:
+    - model (nn.Module): The trained model, e.g. from `get_model` or made of `ResBlock`s. It is left unchanged.
+    - data_loaders (DataLoaders): Data loaders whose validation loader is used for calibration.
+    - num_batches (int): Number of calibration batches (default: 10).
+
+    Returns:
+    - nn.Module: The quantized model, on the CPU, in evaluation mode.
+    '''
+    folded = fold_batchnorm(model).cpu()
+    return convert_to_int8(folded, calibrate(folded, data_loaders, num_batches))
+
+# %% ../nbs/21_minimalai-quantize.ipynb 12
+def model_size(model):
+    '''
+    Return the size of the serialized `state_dict` of `model`, in bytes.
+    '''
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+def evaluate_accuracy(model, data_loader, num_batches=None):
+    '''
+    Compute the classification accuracy of `model` on the CPU.
+
+    Args:
+    - model (nn.Module): The model, in evaluation mode.
+    - data_loader (DataLoader): Loader yielding `(inputs, targets)` batches.
+    - num_batches (int, optional): Number of batches to use (default: all).
+
+    Returns:
+    - float: The accuracy.
+    '''
+    correct = total = 0
+    with torch.inference_mode():
+        for i, (x, y) in enumerate(data_loader):
+            if num_batches is not None and i >= num_batches:
+                break
+            correct += (model(x.cpu()).argmax(-1) == y.cpu()).sum().item()
+            total += len(y)
+    return correct / total
+
+def quantization_report(model, quantized, data_loaders, num_batches=None, batch_size=None, runs=20):
+    '''
+    Compare the accuracy, latency and size of the fp32 `model` and its `quantized` version on the CPU.
+
+    Args:
+    - model (nn.Module): The fp32 model.
+    - quantized (nn.Module): The model returned by `quantize_model`.
+    - data_loaders (DataLoaders): Data loaders whose validation loader is used.
+    - num_batches (int, optional): Number of validation batches for the accuracies (default: all).
+    - batch_size (int, optional): Batch size for the latencies (default: the size of the first validation batch).
+    - runs (int): Number of timed forward passes (default: 20).
+
+    Returns:
+    - dict: Accuracies, median latencies (in seconds) and sizes (in bytes) of both models, with the speedup.
+    '''
+    fp32 = deepcopy(model).cpu().eval()
+    x = next(iter(data_loaders.valid_loader))[0].cpu()
+    if batch_size is not None:
+        x = x[:batch_size]
+    report = {}
+    for name, m in (('fp32', fp32), ('int8', quantized)):
+        report[f'{name}_accuracy'] = evaluate_accuracy(m, data_loaders.valid_loader, num_batches)
+        report[f'{name}_latency'] = benchmark_latency(m, x, runs=runs)
+        report[f'{name}_size'] = model_size(m)
+    report['speedup'] = report['fp32_latency'] / report['int8_latency']
+    return report
@@ -6,8 +6,6 @@ __all__ = ['act_config', 'ResBlock', 'print_shape_hook', 'summary']
 # %% ../nbs/13_minimalai-resnet.ipynb 3
 import pickle, gzip, math, os, time, shutil
 import torch
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy as np
 import fastcore.all as fc
 from collections.abc import Mapping
@@ -17,15 +15,11 @@ from functools import partial
 from copy import copy
 from contextlib import contextmanager
 
-import torchvision.transforms.functional as TF
 import torch.nn.functional as F
 from torch import tensor, nn, optim
 from torch.utils.data import DataLoader, default_collate
 from torch.nn import init
 from torch.optim import lr_scheduler
-from torcheval.metrics import MulticlassAccuracy
-from datasets import load_dataset, load_dataset_builder
-
 
 from .datasets import *
 from .conv import *
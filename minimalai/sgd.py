@@ -12,6 +12,9 @@ from .conv import *
 from .learner import *
 from .activations import *
 from .init import *
+from .lazy import *
+
+plt = lazy_import('matplotlib.pyplot')
 
 # %% ../nbs/12_minimalai-accelerate-sgd.ipynb 12
 class SGD:
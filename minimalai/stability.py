@@ -3,7 +3,7 @@
 # %% ../nbs/11_stability.ipynb 3
 from __future__ import annotations
 # import pickle,gzip,os,time,shutil
-import math,torch,matplotlib as mpl,numpy as np,matplotlib.pyplot as plt
+import math,torch,numpy as np
 import fastcore.all as fc
 from pathlib import Path
 from operator import attrgetter,itemgetter
@@ -11,8 +11,6 @@ from functools import partial
 
 from torch import tensor,nn,optim
 import torch.nn.functional as F
-import torchvision.transforms.functional as TF
-from datasets import load_dataset
 
 from .datasets import *
 from .learner import *
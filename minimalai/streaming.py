@@ -0,0 +1,272 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_minimalai-streaming.ipynb.
+
+# %% ../nbs/05_minimalai-streaming.ipynb 3
+from __future__ import annotations
+import io, random, tarfile
+from itertools import islice
+import numpy as np
+from pathlib import Path
+
+import torch
+import torch.distributed as dist
+from torch.utils.data import DataLoader, IterableDataset, default_collate, get_worker_info
+
+from .datasets import *
+from .lazy import *
+
+# torchvision is only imported once an image is decoded
+decode_image = lazy_callable('torchvision.io', 'decode_image')
+
+# %% auto 0
+__all__ = ['tar_samples', 'write_tar_shards', 'decode_sample', 'shuffle_buffer', 'StreamingDataset', 'stream_dataloaders']
+
+# %% ../nbs/05_minimalai-streaming.ipynb 5
+def tar_samples(path):
+    '''
+    Read the samples of a tar shard sequentially.
+
+    Files sharing the same name up to the first dot form one sample (e.g. `000042.png` and `000042.cls`),
+    which must be stored next to each other in the archive.
+
+    Args:
+    - path: Path of the tar shard (optionally compressed).
+
+    Yields:
+    - dict: Raw bytes of each file of the sample, keyed by extension, plus the sample name under '__key__'.
+    '''
+    sample = {}
+    # Stream mode only ever reads forward, so the shard is read with sequential I/O
+    with tarfile.open(path, 'r|*') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            directory, _, name = member.name.rpartition('/')
+            stem, _, extension = name.partition('.')
+            key = f'{directory}/{stem}' if directory else stem
+            if sample and sample['__key__'] != key:
+                yield sample
+                sample = {}
+            sample['__key__'] = key
+            sample[extension] = tar.extractfile(member).read()
+    if sample:
+        yield sample
+
+# %% ../nbs/05_minimalai-streaming.ipynb 6
+def write_tar_shards(samples, path, samples_per_shard=10_000):
+    '''
+    Write samples into tar shards named `{path}-00000.tar`, `{path}-00001.tar`, ...
+
+    Args:
+    - samples: Iterable of dicts mapping extensions (e.g. 'png', 'cls') to bytes, str, int or tensor values.
+    - path: Prefix of the shard paths.
+    - samples_per_shard: Number of samples per shard (default: 10,000).
+
+    Returns:
+    - list: Paths of the written shards.
+    '''
+    def _to_bytes(value):
+        if isinstance(value, bytes):
+            return value
+        if isinstance(value, torch.Tensor):
+            buffer = io.BytesIO()
+            torch.save(value, buffer)
+            return buffer.getvalue()
+        return str(value).encode()
+
+    paths, tar = [], None
+    for i, sample in enumerate(samples):
+        if i % samples_per_shard == 0:
+            if tar is not None:
+                tar.close()
+            paths.append(Path(f'{path}-{len(paths):05d}.tar'))
+            tar = tarfile.open(paths[-1], 'w')
+        for extension, value in sample.items():
+            data = _to_bytes(value)
+            info = tarfile.TarInfo(f'{i:09d}.{extension}')
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    if tar is not None:
+        tar.close()
+    return paths
+
+# %% ../nbs/05_minimalai-streaming.ipynb 8
+def decode_sample(sample):
+    '''
+    Decode the raw bytes of a sample according to their extension.
+
+    Images ('jpg', 'jpeg', 'png') become uint8 tensors, 'cls' becomes an int, 'txt' a str,
+    'pt' and 'npy' are loaded as tensors, and any other extension is left as bytes.
+
+    Args:
+    - sample (dict): Raw sample, as yielded by `tar_samples`.
+
+    Returns:
+    - dict: The decoded sample.
+    '''
+    decoded = {}
+    for extension, value in sample.items():
+        if extension in ('jpg', 'jpeg', 'png'):
+            value = decode_image(torch.frombuffer(bytearray(value), dtype=torch.uint8))
+        elif extension == 'cls':
+            value = int(value)
+        elif extension == 'txt':
+            value = value.decode()
+        elif extension == 'pt':
+            value = torch.load(io.BytesIO(value))
+        elif extension == 'npy':
+            value = torch.from_numpy(np.load(io.BytesIO(value)))
+        decoded[extension] = value
+    return decoded
+
+# %% ../nbs/05_minimalai-streaming.ipynb 10
+def shuffle_buffer(samples, buffer_size, rng=random):
+    '''
+    Approximately shuffle a stream of samples with an in-memory buffer of `buffer_size` samples.
+
+    Args:
+    - samples: Iterable of samples.
+    - buffer_size: Number of samples held in memory.
+    - rng: Random number generator (default: the `random` module).
+
+    Yields:
+    - The samples, in shuffled order.
+    '''
+    buffer = []
+    for sample in samples:
+        if len(buffer) < buffer_size:
+            buffer.append(sample)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = sample
+    rng.shuffle(buffer)
+    yield from buffer
+
+# %% ../nbs/05_minimalai-streaming.ipynb 12
+class StreamingDataset(IterableDataset):
+    def __init__(self, shards, keys=None, decode=decode_sample, buffer_size=1000, shuffle=True, seed=0,
+                 read_shard=tar_samples, length=None):
+        '''
+        An iterable dataset streaming samples sequentially from a list of shards.
+
+        The shards are split between processes (`torch.distributed` ranks) and `DataLoader` workers, so
+        each shard is read by exactly one worker, front to back. Decoding happens in the workers, and
+        samples are shuffled with an in-memory `shuffle_buffer`. The shuffle changes with the epoch, which
+        the `Learner` sets at the start of each epoch.
+
+        When training is distributed, every process streams `length // world_size` samples, so they all run
+        the same number of batches: the workers stop early, or read their shards again, to reach their share.
+
+        Args:
+        - shards: Paths of the shards.
+        - keys (optional): Extensions to return, as a tuple in this order (default: the whole decoded dict).
+        - decode: Function decoding a raw sample (default: `decode_sample`).
+        - buffer_size: Size of the shuffle buffer (default: 1000).
+        - shuffle: Whether to shuffle the shards and the samples (default: True).
+        - seed: Base seed of the shuffling, combined with the epoch set by `set_epoch` (default: 0).
+        - read_shard: Function yielding the raw samples of a shard (default: `tar_samples`).
+        - length (optional): Total number of samples, needed for `len` (and so for progress bars), and
+          when training is distributed.
+        '''
+        super().__init__()
+        self.shards = [str(shard) for shard in shards]
+        self.keys, self.decode, self.buffer_size, self.shuffle = keys, decode, buffer_size, shuffle
+        self.seed, self.read_shard, self.length = seed, read_shard, length
+        self.epoch = 0
+
+    def set_epoch(self, epoch):
+        '''
+        Set the epoch, so that each epoch sees a different shuffle.
+
+        Args:
+        - epoch (int): The current epoch.
+        '''
+        self.epoch = epoch
+
+    def __getstate__(self):
+        # `DataLoader` workers started with 'spawn' are not in the process group, so they get the rank of their parent
+        return {**self.__dict__, '_parent_rank': self._rank()}
+
+    def _rank(self):
+        if dist.is_available() and dist.is_initialized():
+            return dist.get_rank(), dist.get_world_size()
+        return self.__dict__.get('_parent_rank', (0, 1))
+
+    def __len__(self):
+        if self.length is None:
+            raise TypeError('StreamingDataset has no length; pass `length` to use it with progress bars')
+        # The number of samples streamed by this process
+        return self.length // self._rank()[1]
+
+    def _worker_shards(self):
+        '''
+        The shards read by the current worker of the current process, its global index, and the number of
+        samples it streams (None to read its shards once, when training is not distributed).
+        '''
+        worker_info = get_worker_info()
+        worker_id, num_workers = (worker_info.id, worker_info.num_workers) if worker_info else (0, 1)
+        rank, world_size = self._rank()
+        shards = list(self.shards)
+        if self.shuffle:
+            # Every worker draws the same permutation, then takes its own slice of it
+            random.Random(self.seed + self.epoch).shuffle(shards)
+        worker = rank * num_workers + worker_id
+        quota = None
+        if world_size > 1:
+            assert self.length is not None, 'pass `length` to stream the same number of samples in every process'
+            assert len(shards) >= world_size * num_workers, \
+                f'{len(shards)} shards cannot be split between {world_size * num_workers} workers'
+            per_rank = self.length // world_size
+            quota = per_rank // num_workers + (worker_id < per_rank % num_workers)
+        return shards[worker::world_size * num_workers], worker, quota
+
+    def _read(self, shards, quota):
+        '''
+        Yield the raw samples of `shards`, reading them again until `quota` samples are yielded (if not None).
+        '''
+        while True:
+            num_samples = 0
+            for shard in shards:
+                for sample in self.read_shard(shard):
+                    yield sample
+                    num_samples += 1
+            if quota is None or num_samples == 0:
+                return
+
+    def __iter__(self):
+        shards, worker, quota = self._worker_shards()
+        samples = self._read(shards, quota)
+        if quota is not None:
+            samples = islice(samples, quota)
+        samples = (self.decode(sample) for sample in samples)
+        if self.shuffle and self.buffer_size > 1:
+            samples = shuffle_buffer(samples, self.buffer_size, random.Random((self.seed + self.epoch) * 1_000_003 + worker))
+        for sample in samples:
+            yield tuple(sample[key] for key in self.keys) if self.keys else sample
+
+# %% ../nbs/05_minimalai-streaming.ipynb 14
+def stream_dataloaders(train_shards, valid_shards, batch_size, keys=None, collate_fn=default_collate, num_workers=4,
+                       train_length=None, valid_length=None, **kwargs):
+    '''
+    Create DataLoaders streaming the training and validation samples from shards.
+
+    For diffusion training, pass `collate_fn=lambda b: noisify(default_collate(b)[0])`, so the noise is
+    added to whole batches as they are collated in the workers.
+
+    Args:
+    - train_shards: Paths of the training shards.
+    - valid_shards: Paths of the validation shards.
+    - batch_size: Batch size for the training dataloader (the validation one uses twice that).
+    - keys (optional): Extensions returned for each sample, in order (e.g. `('png', 'cls')`).
+    - collate_fn: Function collating a list of samples into a batch (default: `default_collate`).
+    - num_workers: Number of `DataLoader` workers decoding the samples (default: 4).
+    - train_length, valid_length (optional): Number of samples in each split, needed for progress bars.
+    - **kwargs: Additional keyword arguments for `StreamingDataset`.
+
+    Returns:
+    - DataLoaders: DataLoaders object with train and valid dataloaders.
+    '''
+    train_ds = StreamingDataset(train_shards, keys=keys, length=train_length, **kwargs)
+    valid_ds = StreamingDataset(valid_shards, keys=keys, length=valid_length, **{**kwargs, 'shuffle': False})
+    return DataLoaders(DataLoader(train_ds, batch_size=batch_size, collate_fn=collate_fn, num_workers=num_workers),
+                       DataLoader(valid_ds, batch_size=batch_size*2, collate_fn=collate_fn, num_workers=num_workers))
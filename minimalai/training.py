@@ -8,8 +8,6 @@ import pickle, gzip, math, os, time, shutil
 from pathlib import Path
 import numpy as np
 
-import matplotlib as mpl, matplotlib.pyplot as plt
-
 import torch
 from torch import tensor,nn
 import torch.nn.functional as F
@@ -0,0 +1,162 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_minimalai-transfer.ipynb.
+
+# %% ../nbs/07_minimalai-transfer.ipynb 3
+from __future__ import annotations
+import threading
+from collections import defaultdict
+
+import torch
+from torch.utils._pytree import tree_map
+
+# %% auto 0
+__all__ = ['PinnedBufferPool', 'default_buffer_pool', 'to_device', 'to_host', 'wait']
+
+# %% ../nbs/07_minimalai-transfer.ipynb 5
+class PinnedBufferPool:
+    def __init__(self):
+        '''
+        A pool of page-locked (pinned) host buffers, reused per shape and dtype.
+
+        Host-to-device copies are only asynchronous from pinned memory. Staging pageable tensors through
+        these buffers avoids pinning a new allocation for every batch. Each buffer is guarded by the event
+        of the last copy reading from it, and is only reused once that event has completed.
+        '''
+        self._buffers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype):
+        '''
+        Return a pinned buffer of the given shape and dtype that no pending copy is reading from.
+
+        Args:
+        - shape (torch.Size): Shape of the buffer.
+        - dtype (torch.dtype): Data type of the buffer.
+
+        Returns:
+        - list: A `[buffer, event]` entry; set its event once a copy reading from the buffer has been queued.
+        '''
+        key = (tuple(shape), dtype)
+        with self._lock:
+            for entry in self._buffers[key]:
+                event = entry[1]
+                if event is not None and event.query():
+                    entry[1] = None
+                    return entry
+            # Entries without an event are in use until the copy reading from them is queued
+            entry = [torch.empty(shape, dtype=dtype, pin_memory=True), None]
+            self._buffers[key].append(entry)
+            return entry
+
+    def clear(self):
+        '''
+        Release the buffers that are not in use.
+        '''
+        with self._lock:
+            for key, entries in self._buffers.items():
+                self._buffers[key] = [e for e in entries if e[1] is None or not e[1].query()]
+
+    @property
+    def nbytes(self):
+        '''Total size of the pinned buffers, in bytes.'''
+        return sum(e[0].numel() * e[0].element_size() for entries in self._buffers.values() for e in entries)
+
+default_buffer_pool = PinnedBufferPool()
+
+# %% ../nbs/07_minimalai-transfer.ipynb 8
+def to_device(data, device, non_blocking=True, pool=default_buffer_pool):
+    '''
+    Move every tensor of an arbitrarily nested structure (dicts, lists, tuples, named tuples) to `device`.
+
+    Host-to-CUDA copies are issued with `non_blocking=True`: pinned tensors are copied directly, pageable
+    tensors are first staged through a pinned buffer from `pool`. Tensors already on `device` are returned
+    as they are, and containers keep their type.
+
+    Args:
+    - data: A tensor, or a nested structure of tensors (other leaves are left untouched).
+    - device: Target device.
+    - non_blocking: Whether to issue asynchronous copies (default: True).
+    - pool: Pool of pinned staging buffers (default: `default_buffer_pool`; None to disable staging).
+
+    Returns:
+    - tuple: The structure on `device`, and a CUDA event recorded after the copies (None if nothing is pending).
+      Work queued on the current stream is ordered after the copies; wait on the event before using them elsewhere.
+    '''
+    device = torch.device(device)
+    staged = []
+
+    def _move(x):
+        if not isinstance(x, torch.Tensor) or x.device == device:
+            return x
+        if not non_blocking or device.type != 'cuda':
+            return x.to(device)
+        if pool is None or x.device.type != 'cpu' or x.is_pinned():
+            return x.to(device, non_blocking=True)
+        entry = pool.acquire(x.shape, x.dtype)
+        entry[0].copy_(x)
+        staged.append(entry)
+        return entry[0].to(device, non_blocking=True)
+
+    data = tree_map(_move, data)
+    event = None
+    if non_blocking and device.type == 'cuda':
+        event = torch.cuda.Event()
+        event.record(torch.cuda.current_stream(device))
+        for entry in staged:
+            entry[1] = event
+    return data, event
+
+# %% ../nbs/07_minimalai-transfer.ipynb 11
+def to_host(data, non_blocking=True, float16=False):
+    '''
+    Copy every tensor of an arbitrarily nested structure to the CPU, detached from the autograd graph.
+
+    CUDA tensors are copied asynchronously into freshly pinned memory, so the caller only blocks when it
+    waits on the returned event, e.g. after queuing the next batch. The copies must not be read before.
+    Tensors already on the CPU are returned as they are, not copied: clone them if their memory may be reused.
+
+    Args:
+    - data: A tensor, or a nested structure of tensors (other leaves are left untouched).
+    - non_blocking: Whether to issue asynchronous copies (default: True).
+    - float16: Whether to keep float16 and bfloat16 tensors as they are; by default they are converted to float32
+      (on the device, before the copy).
+
+    Returns:
+    - tuple: The structure on the CPU, and a CUDA event to wait on before reading it (None if nothing is pending).
+    '''
+    devices = set()
+
+    def _copy(x):
+        if not isinstance(x, torch.Tensor):
+            return x
+        x = x.detach()
+        if x.dtype in (torch.float16, torch.bfloat16) and not float16:
+            x = x.float()
+        if x.device.type != 'cuda' or not non_blocking:
+            return x.cpu()
+        out = torch.empty(x.shape, dtype=x.dtype, pin_memory=True)
+        out.copy_(x, non_blocking=True)
+        devices.add(x.device)
+        return out
+
+    data = tree_map(_copy, data)
+    if not devices:
+        return data, None
+    if len(devices) > 1:
+        # An event belongs to a single device, so copies from several GPUs are waited on right away
+        for device in devices:
+            torch.cuda.synchronize(device)
+        return data, None
+    event = torch.cuda.Event()
+    event.record(torch.cuda.current_stream(devices.pop()))
+    return data, event
+
+def wait(*events):
+    '''
+    Block the host until the given events (as returned by `to_device` and `to_host`) have completed.
+
+    Args:
+    - *events: CUDA events, or None for transfers that are already complete.
+    '''
+    for event in events:
+        if event is not None:
+            event.synchronize()
@@ -0,0 +1,23 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from minimalai.augment import tta_views
+
+
+def test_tta_views_change_their_input():
+    x = torch.randn(8, 1, 28, 28)
+    views = tta_views()
+    assert torch.equal(views[0](x), x)
+    for view in views[1:]:
+        out = view(x)
+        assert out.shape == x.shape
+        assert not torch.equal(out, x)
+
+
+def test_tta_views_are_deterministic_and_leave_input_untouched():
+    x = torch.randn(8, 1, 28, 28)
+    original = x.clone()
+    for view in tta_views()[2:]:
+        assert torch.equal(view(x), view(x))
+    assert torch.equal(x, original)
@@ -0,0 +1,107 @@
+import copy
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from torch import nn
+import torch.nn.functional as F
+from torch.utils.data import DataLoader, TensorDataset
+
+from minimalai.datasets import DataLoaders
+from minimalai.learner import Callback, ProgressCallback, TrainLearner
+from minimalai.sgd import Adam, RMSProp
+from minimalai.distributed import (DistributedCallback, ShardedOptimizer, distributed_dataloaders, is_main_process,
+                                    launch)
+
+NUM_ITEMS, BATCH_SIZE, NUM_EPOCHS, WORLD_SIZE = 32, 4, 3, 2
+
+
+def _dataset():
+    g = torch.Generator().manual_seed(0)
+    x = torch.randn(NUM_ITEMS, 3, generator=g)
+    y = x @ torch.tensor([[1.], [-2.], [0.5]]) + 0.1 * torch.randn(NUM_ITEMS, 1, generator=g)
+    return TensorDataset(x, y, torch.arange(NUM_ITEMS))
+
+
+class RecordBatches(Callback):
+    def before_fit(self, learner):
+        self.batches = []
+
+    def before_batch(self, learner):
+        if learner.training:
+            self.batches.append(learner.batch[2].tolist())
+
+
+def _fit_distributed(rank, world_size, path):
+    # Different initial weights on each rank: the callback must broadcast those of rank 0
+    torch.manual_seed(rank)
+    ds = _dataset()
+    record = RecordBatches()
+    # As recommended by `is_main_process`, the progress bar only runs on rank 0. It has the same order as
+    # `DistributedCallback`, and wraps the dataloader before it
+    callbacks = [ProgressCallback()] if is_main_process() else []
+    callbacks += [DistributedCallback(), record]
+    learn = TrainLearner(nn.Linear(3, 1), distributed_dataloaders({'train': ds, 'valid': ds}, BATCH_SIZE, seed=1),
+                         F.mse_loss, learning_rate=0.1, callbacks=callbacks)
+    learn.fit(NUM_EPOCHS)
+    torch.save({'batches': record.batches, 'params': [p.detach() for p in learn.model.parameters()]},
+               path/f'{rank}.pt')
+
+
+def test_data_parallel_matches_single_process(tmp_path):
+    launch(_fit_distributed, WORLD_SIZE, tmp_path, num_threads=1)
+    results = [torch.load(tmp_path/f'{rank}.pt') for rank in range(WORLD_SIZE)]
+
+    batches_per_epoch = NUM_ITEMS // WORLD_SIZE // BATCH_SIZE
+    for epoch in range(NUM_EPOCHS):
+        epoch_batches = slice(epoch * batches_per_epoch, (epoch + 1) * batches_per_epoch)
+        seen = sorted(i for r in results for batch in r['batches'][epoch_batches] for i in batch)
+        assert seen == list(range(NUM_ITEMS)), f'epoch {epoch} does not cover every item once'
+    assert results[0]['batches'][:batches_per_epoch] != results[0]['batches'][batches_per_epoch:2 * batches_per_epoch]
+
+    for p0, p1 in zip(results[0]['params'], results[1]['params']):
+        assert torch.equal(p0, p1)
+
+    # A single process taking the same global batches (the union of the batches of every rank) takes the same steps
+    global_batches = [sum(batches, []) for batches in zip(*(r['batches'] for r in results))]
+    ds = _dataset()
+    torch.manual_seed(0)
+    learn = TrainLearner(nn.Linear(3, 1), DataLoaders(DataLoader(ds, batch_sampler=global_batches),
+                                                      DataLoader(ds, batch_size=NUM_ITEMS)),
+                         F.mse_loss, learning_rate=0.1)
+    learn.fit(1, valid=False)
+    for p, expected in zip(learn.model.parameters(), results[0]['params']):
+        torch.testing.assert_close(p.detach(), expected)
+
+
+def _state_nbytes(optimizer, params):
+    tensors = [v for p in params for v in vars(p).values() if isinstance(v, torch.Tensor)]
+    tensors += [v for state in getattr(optimizer, 'state', {}).values() for v in state.values()
+                if isinstance(v, torch.Tensor)]
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def _step_sharded(rank, world_size, optimizer_function):
+    torch.manual_seed(0)
+    # 2,145 parameters (as an odd number, the slices are padded)
+    model = nn.Sequential(nn.Linear(64, 32), nn.ReLU(), nn.Linear(32, 1))
+    reference = copy.deepcopy(model)
+    sharded = ShardedOptimizer(model.parameters(), 0.01, optimizer_function)
+    unsharded = optimizer_function(reference.parameters(), 0.01)
+    x = torch.randn(16, 64, generator=torch.Generator().manual_seed(1))
+    for _ in range(5):
+        # Every rank computes the same gradients, as if they had been averaged
+        for m, optimizer in ((model, sharded), (reference, unsharded)):
+            m(x).pow(2).mean().backward()
+            optimizer.step()
+            optimizer.zero_grad()
+    for p, expected in zip(model.parameters(), reference.parameters()):
+        torch.testing.assert_close(p, expected)
+    # The memory held on top of the model is the state of the slice: about 1/N of the unsharded state
+    full = _state_nbytes(unsharded, list(reference.parameters()))
+    assert full > 0 and sharded.state_nbytes() <= full / world_size * 1.01
+
+
+@pytest.mark.parametrize('optimizer_function', [Adam, RMSProp, torch.optim.Adam])
+def test_sharded_optimizer(optimizer_function):
+    launch(_step_sharded, WORLD_SIZE, optimizer_function, num_threads=1)
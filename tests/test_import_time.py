@@ -0,0 +1,33 @@
+import subprocess, sys
+
+import pytest
+
+pytest.importorskip('torch')
+
+from minimalai.lazy import check_import_time
+
+OPTIONAL = ('matplotlib', 'fastprogress', 'torcheval')
+
+
+def test_learner_imports_within_budget():
+    check_import_time('minimalai.learner')
+
+
+def test_learner_does_not_import_optional_dependencies():
+    code = ('import sys, minimalai.learner; '
+            f'print(sorted(m for m in sys.modules if m.split(".")[0] in {OPTIONAL!r}))')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_delegated_signatures_are_built_lazily():
+    # Requesting the signatures imports matplotlib, so this runs in a fresh interpreter too
+    pytest.importorskip('matplotlib')
+    code = ('import inspect, sys; from minimalai.datasets import show_image, subplots, show_images; '
+            'assert "matplotlib" not in sys.modules; '
+            'print(*(list(inspect.signature(f).parameters) for f in (show_image, subplots, show_images)), sep="\\n")')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    show_image, subplots, show_images = result.stdout.splitlines()
+    assert 'cmap' in show_image and 'kwargs' not in show_image
+    assert 'sharex' in subplots and 'kwargs' in subplots
+    assert 'imsize' in show_images and 'sharex' in show_images
@@ -0,0 +1,100 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from torch.utils.data import DataLoader, Dataset, TensorDataset, default_collate
+
+import minimalai.loaders
+from minimalai.loaders import DeviceDataLoaders, SharedMemoryDataLoader, autotune_dataloaders
+
+NUM_ITEMS, BATCH_SIZE = 23, 4
+
+
+class ItemDataset(Dataset):
+    # Tensor and Python number fields, as tuples or as dicts with an extra field to leave out
+    def __init__(self, as_dict=False):
+        self.as_dict = as_dict
+
+    def __len__(self):
+        return NUM_ITEMS
+
+    def __getitem__(self, i):
+        x, y = torch.arange(6.).view(2, 3) + i, i % 3
+        return {'y': y, 'x': x, 'name': str(i)} if self.as_dict else (x, y)
+
+
+def _batches(dl, stop=None):
+    # Batches only stay valid until the next one is requested, so they are copied
+    batches = []
+    for i, batch in enumerate(dl):
+        if i == stop:
+            break
+        batches.append([t.clone() for t in batch])
+    return batches
+
+
+def _assert_equal(batches, expected):
+    assert len(batches) == len(expected)
+    for batch, ref in zip(batches, expected):
+        assert len(batch) == len(ref)
+        for t, r in zip(batch, ref):
+            assert t.dtype == r.dtype
+            assert torch.equal(t, r)
+
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+@pytest.mark.parametrize('as_dict', [False, True])
+def test_batches_match_dataloader(num_workers, as_dict):
+    ds = ItemDataset(as_dict)
+    dl = SharedMemoryDataLoader(ds, BATCH_SIZE, num_workers=num_workers, features=['x', 'y'] if as_dict else None,
+                                timeout=30 if num_workers else 0)
+    expected = [[b['x'], b['y']] if as_dict else b for b in DataLoader(ds, batch_size=BATCH_SIZE)]
+    assert len(dl) == len(expected)
+    for _ in range(2):
+        _assert_equal(_batches(dl), expected)
+
+
+def test_early_stop_returns_the_slots():
+    ds = ItemDataset()
+    dl = SharedMemoryDataLoader(ds, BATCH_SIZE, num_workers=2, prefetch_factor=2, timeout=30)
+    expected = list(DataLoader(ds, batch_size=BATCH_SIZE))
+    # Every early stop leaves batches queued in the workers: without reclaiming their slots, the ring runs
+    # out of free slots and the workers block (the timeout then raises)
+    for _ in range(len(dl.ring.slots) + 1):
+        _assert_equal(_batches(dl, stop=2), expected[:2])
+    _assert_equal(_batches(dl), expected)
+    assert dl.ring.free_slots.qsize() == len(dl.ring.slots)
+
+
+def test_device_dataloaders_from_tensor_datasets():
+    x, y = torch.randn(10, 3), torch.arange(10)
+    dls = DeviceDataLoaders.from_dataset_dict({'train': TensorDataset(x, y), 'valid': TensorDataset(x, y)}, 4,
+                                              device='cpu')
+    _assert_equal(list(dls.valid_loader), [[x[:8], y[:8]], [x[8:], y[8:]]])
+    assert sorted(i for _, batch in dls.train_loader for i in batch.tolist()) == list(range(10))
+
+
+def test_device_dataloaders_reject_unknown_datasets():
+    with pytest.raises(TypeError, match='ItemDataset'):
+        DeviceDataLoaders.from_dataset_dict({'train': ItemDataset(), 'valid': ItemDataset()}, 4, device='cpu')
+
+
+def _collate_twice(items):
+    return [2 * t for t in default_collate(items)]
+
+
+def test_autotuner_cache_key(tmp_path, monkeypatch):
+    timed = []
+    monkeypatch.setattr(minimalai.loaders, 'time_dataloader', lambda dl, *args, **kwargs: timed.append(dl) or 1.)
+
+    def _tunes(dataset_dict, collate_fn=None):
+        num_timed = len(timed)
+        autotune_dataloaders(dataset_dict, 4, collate_fn, max_workers=1, device='cpu', cache_path=tmp_path/'c.json')
+        return len(timed) > num_timed
+
+    x = torch.randn(NUM_ITEMS, 2)
+    tensors = {'train': TensorDataset(x), 'valid': TensorDataset(x)}
+    assert _tunes(tensors) and not _tunes(tensors)
+    # A different collate function or dataset type with the same length are tuned separately
+    assert _tunes(tensors, _collate_twice) and not _tunes(tensors, _collate_twice)
+    assert _tunes({'train': ItemDataset(), 'valid': ItemDataset()})
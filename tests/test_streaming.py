@@ -0,0 +1,64 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from torch.utils.data import DataLoader
+
+from minimalai.datasets import DataLoaders
+from minimalai.learner import Callback, Learner
+from minimalai.distributed import launch
+from minimalai.streaming import StreamingDataset
+
+# Shards of uneven sizes: 'a:b' holds the samples a to b-1
+SHARDS = ['0:10', '10:25', '25:32', '32:50', '50:53']
+
+
+def _read_range(shard):
+    start, end = map(int, shard.split(':'))
+    for i in range(start, end):
+        yield {'x': torch.tensor(float(i))}
+
+
+def _identity(sample):
+    return sample
+
+
+def _dataset(**kwargs):
+    return StreamingDataset(SHARDS, keys=('x',), decode=_identity, read_shard=_read_range, buffer_size=8,
+                            length=53, **kwargs)
+
+
+class RecordEpochs(Callback):
+    def before_fit(self, learner):
+        self.epochs = []
+
+    def before_epoch(self, learner):
+        self.epochs.append([])
+
+    def predict(self, learner):
+        self.epochs[-1] += learner.batch[0].tolist()
+
+
+def test_learner_shuffles_each_epoch():
+    dl = DataLoader(_dataset(), batch_size=4)
+    record = RecordEpochs()
+    Learner(torch.nn.Identity(), DataLoaders(dl, dl), callbacks=[record], optimizer_function=None).fit(
+        2, valid=False)
+    first, second = record.epochs
+    assert sorted(first) == sorted(second) == list(range(53))
+    assert first != second
+
+
+def _count_batches(rank, world_size, path):
+    dl = DataLoader(_dataset(), batch_size=4, num_workers=2)
+    samples = [x for (batch,) in dl for x in batch.tolist()]
+    torch.save((len(dl.dataset), len(list(dl)), samples), path/f'{rank}.pt')
+
+
+def test_ranks_stream_the_same_number_of_samples(tmp_path):
+    # 5 shards of different sizes split between 2 processes with 2 workers each
+    launch(_count_batches, 2, tmp_path, num_threads=1)
+    results = [torch.load(tmp_path/f'{rank}.pt') for rank in range(2)]
+    assert [len(samples) for _, _, samples in results] == [26, 26]
+    assert results[0][1] == results[1][1]
+    assert all(length == 26 for length, _, _ in results)